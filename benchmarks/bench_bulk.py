@@ -0,0 +1,67 @@
+"""
+Benchmark the bulk API (``GoodReads.get_quotes_bulk()``) against a loop calling ``GoodReads.get_quotes()`` for one
+author after the other, on the stand-in server. Checks that both return the same quotes, then runs the bulk API
+on a failing server to show that failures are reported per author without stopping the batch.
+
+Usage::
+
+    python benchmarks/bench_bulk.py --authors 200 --workers 16 --latency 0.05 --parser lxml
+
+"""
+
+import argparse
+import time
+import warnings
+
+from scrapereads import GoodReads
+from scrapereads.standin.server import StandInServer
+
+warnings.simplefilter('ignore', DeprecationWarning)
+warnings.simplefilter('ignore', RuntimeWarning)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--authors', type=int, default=200, help='number of authors')
+    parser.add_argument('--workers', type=int, default=16, help='number of authors processed at the same time')
+    parser.add_argument('--top-k', type=int, default=30, help='number of quotes per author')
+    parser.add_argument('--latency', type=float, default=0.05, help='latency of the server, in seconds')
+    parser.add_argument('--parser', default='lxml', help='parser backend (bs4 or lxml)')
+    args = parser.parse_args()
+
+    author_ids = list(range(1, args.authors + 1))
+    with StandInServer(latency=args.latency) as server:
+        GoodReads(verbose=False, pool_size=args.workers, bulk_workers=args.workers, identity=False,
+                  parser=args.parser)
+        GoodReads.set_base(server.url)
+        start = time.perf_counter()
+        loop = [GoodReads.get_quotes(author_id, top_k=args.top_k) for author_id in author_ids]
+        loop_time = time.perf_counter() - start
+        print(f'{len(author_ids)} authors, one after the other   {loop_time:.2f}s')
+
+        for ordered in [True, False]:
+            start = time.perf_counter()
+            first = None
+            results = {}
+            for result in GoodReads.get_quotes_bulk(author_ids, top_k=args.top_k, ordered=ordered):
+                first = first or time.perf_counter() - start
+                assert result.error is None, result
+                results[result.key] = result.value
+            bulk_time = time.perf_counter() - start
+            assert [results[author_id] for author_id in author_ids] == loop, 'the quotes differ'
+            print(f'{len(author_ids)} authors, get_quotes_bulk(ordered={ordered!s:<5})   {bulk_time:.2f}s   '
+                  f'first after {1000 * first:.0f}ms   x{loop_time / bulk_time:.1f}')
+    print(f'parity: same quotes for {len(author_ids)} authors')
+
+    with StandInServer(latency=args.latency, error_rate=0.1) as server:
+        GoodReads(verbose=False, pool_size=args.workers, bulk_workers=args.workers, identity=False, retries=0,
+                  parser=args.parser)
+        GoodReads.set_base(server.url)
+        results = list(GoodReads.get_quotes_bulk(author_ids, top_k=args.top_k))
+        failed = [result for result in results if result.error is not None]
+        print(f'10% of failing pages: {len(results)} authors reported, {len(failed)} with an error '
+              f'(e.g. {failed[0].key}: {failed[0].error!r})' if failed else f'{len(results)} authors reported')
+
+
+if __name__ == '__main__':
+    main()
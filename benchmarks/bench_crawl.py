@@ -0,0 +1,79 @@
+"""
+Benchmark a crawl of the similar authors graph on the stand-in server, visiting ``--workers`` authors at a time
+against one after the other (``workers=1``). Then interrupts a crawl with a checkpoint halfway, resumes it,
+and checks that it visits the same authors, fetching again only the pages in flight when it was interrupted.
+Also reports the size of the Bloom filter keeping the authors seen.
+
+Usage::
+
+    python benchmarks/bench_crawl.py --authors 500 --workers 16 --latency 0.05
+
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import warnings
+
+from scrapereads import GoodReads
+from scrapereads.crawl import BloomFilter, Crawler
+from scrapereads.standin import fixtures
+from scrapereads.standin.server import StandInServer
+
+warnings.simplefilter('ignore', DeprecationWarning)
+
+
+def crawl(seeds, max_authors, workers, checkpoint=None, stop=None):
+    """Authors visited (id and depth), stopping after ``stop`` authors if provided."""
+    visits = []
+    crawler = Crawler(seeds, max_authors=max_authors, workers=workers, checkpoint=checkpoint, checkpoint_every=50)
+    pages = crawler.crawl()
+    for visit in pages:
+        visits.append((visit.author.author_id, visit.depth))
+        if stop and len(visits) >= stop:
+            pages.close()
+            break
+    return visits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--authors', type=int, default=500, help='number of authors visited')
+    parser.add_argument('--workers', type=int, default=16, help='number of authors visited at the same time')
+    parser.add_argument('--latency', type=float, default=0.05, help='latency of the server, in seconds')
+    args = parser.parse_args()
+
+    seeds = list(fixtures.Library().authors)[:2]
+    with StandInServer(latency=args.latency) as server:
+        GoodReads(verbose=False, pool_size=args.workers, parser='lxml')
+        GoodReads.set_base(server.url)
+        times = {}
+        for workers in [1, args.workers]:
+            start = time.perf_counter()
+            visits = crawl(seeds, args.authors, workers)
+            times[workers] = time.perf_counter() - start
+            print(f'{len(visits)} authors, {workers:>2} at a time   {times[workers]:.2f}s   '
+                  f'depth={max(depth for _, depth in visits)}')
+        print(f'x{times[1] / times[args.workers]:.1f}')
+
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'crawl.json')
+            server.reset_stats()
+            first = crawl(seeds, args.authors, args.workers, checkpoint=checkpoint, stop=args.authors // 2)
+            rest = crawl(seeds, args.authors, args.workers, checkpoint=checkpoint)
+            requests = server.stats.get('requests', 0)
+            size = os.path.getsize(checkpoint)
+        assert first + rest == visits, 'the resumed crawl differs'
+        # Only the pages in flight when the crawl was interrupted are fetched again
+        assert requests <= len(visits) + args.workers, f'{requests} pages fetched for {len(visits)} authors'
+        print(f'parity: interrupted after {len(first)} authors and resumed, same {len(visits)} authors, '
+              f'{requests} pages fetched   checkpoint {size / 1024:.0f} kB')
+
+    bloom = BloomFilter(capacity=1000000, error_rate=1e-4)
+    print(f'Bloom filter for 1,000,000 authors at 1e-4: {len(bloom._bits) / 1024 ** 2:.1f} MB, '
+          f'{bloom.num_hashes} hashes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark the export of quotes with ``Quote.to_json(encode='ascii')`` against the former recursive serializer,
+which transliterated every key and value with ``unidecode``.
+The quotes are built from the fixture library, with accented author names, tags and book titles as found on
+``Good Reads``. Also checks that both serializers return the same data.
+
+Usage::
+
+    python benchmarks/bench_export.py --quotes 100000
+
+"""
+
+import argparse
+import time
+
+import unidecode
+
+from scrapereads.reads import Book, Quote
+from scrapereads.standin import fixtures
+
+AUTHOR_NAMES = ['Gabriel García Márquez', 'Albert Camus', 'Fyodor Dostoyevsky', 'Søren Kierkegaard', 'Jane Austen',
+                'Friedrich Nietzsche', 'Antoine de Saint-Exupéry', 'Émile Zola', 'Haruki Murakami', 'Paulo Coelho']
+TAGS = ['love', 'life', 'inspirational', 'humor', 'philosophy', 'vérité', 'amour', 'vida', 'liebe', 'wisdom']
+
+
+def serialize_list(list_raw):
+    list_serialized = []
+    for value in list_raw:
+        if isinstance(value, list):
+            list_serialized.append(serialize_list(value))
+        elif isinstance(value, dict):
+            list_serialized.append(serialize_dict(value))
+        else:
+            list_serialized.append(unidecode.unidecode(str(value)))
+    return list_serialized
+
+
+def serialize_dict(dict_raw):
+    dict_serialized = {}
+    for (key, value) in dict_raw.items():
+        if isinstance(value, list):
+            dict_serialized[unidecode.unidecode(str(key))] = serialize_list(value)
+        elif isinstance(value, dict):
+            dict_serialized[unidecode.unidecode(str(key))] = serialize_dict(value)
+        else:
+            dict_serialized[unidecode.unidecode(str(key))] = unidecode.unidecode(str(value))
+    return dict_serialized
+
+
+def build_quotes(num_quotes):
+    """Quotes of the fixture library, repeated up to ``num_quotes`` and spread over accented authors."""
+    library = fixtures.Library()
+    rows = [quote for author_id in library.authors for quote in library.quotes(author_id)]
+    quotes = []
+    for i in range(num_quotes):
+        quote_id, text, likes, tags, book = rows[i % len(rows)]
+        author_name = AUTHOR_NAMES[i % len(AUTHOR_NAMES)]
+        tags = tags + [TAGS[i % len(TAGS)]]
+        quote = Quote(i % 1000, quote_id, text=f'“{text}” — {author_name}', author_name=author_name, tags=tags,
+                      likes=likes)
+        if book is not None:
+            quote.register_book(Book(i % 1000, book[0], book_name=f'{book[1]} – édition', author_name=author_name))
+        quotes.append(quote)
+    return quotes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quotes', type=int, default=100000, help='number of quotes exported')
+    args = parser.parse_args()
+
+    quotes = build_quotes(args.quotes)
+    start = time.perf_counter()
+    before = [serialize_dict(quote.to_json(encode=None)) for quote in quotes]
+    before_time = time.perf_counter() - start
+    start = time.perf_counter()
+    after = [quote.to_json(encode='ascii') for quote in quotes]
+    after_time = time.perf_counter() - start
+    assert after == before, 'the serializers differ'
+    print(f'parity: same data for {len(quotes)} quotes')
+    print(f'{len(quotes)} quotes   before={before_time:.2f}s ({len(quotes) / before_time:,.0f} quotes/sec)   '
+          f'after={after_time:.2f}s ({len(quotes) / after_time:,.0f} quotes/sec)   x{before_time / after_time:.1f}')
+
+
+if __name__ == '__main__':
+    main()
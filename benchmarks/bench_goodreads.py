@@ -0,0 +1,147 @@
+"""
+End-to-end benchmark of the ``GoodReads`` API, against the local ``Good Reads`` stand-in server.
+Each scenario runs in a fresh process, so that its peak memory is measured on its own.
+
+Usage::
+
+    python benchmarks/bench_goodreads.py --latency 0.02 --authors 5 --save baseline.json
+    python benchmarks/bench_goodreads.py --latency 0.02 --authors 5 --compare baseline.json
+
+"""
+
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+import warnings
+
+from scrapereads.standin.fixtures import Library, AUTHORS
+from scrapereads.standin.server import StandInServer
+
+SCENARIOS = ['search_quotes', 'search_books', 'get_author']
+
+
+def peak_rss():
+    """Peak resident memory of the current process, in bytes."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def percentile(values, q):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def run_scenario(scenario, base, author_ids, options):
+    """Run a scenario in the current process.
+
+    Returns:
+        dict: number of pages and records, elapsed seconds, latency of each page, and peak memory.
+
+    """
+    warnings.simplefilter('ignore')
+    from scrapereads import GoodReads
+    from scrapereads import connect as c
+
+    # Time every page load, including retries and the rate limiter
+    latencies = []
+    fetch = c.fetch
+
+    def timed_fetch(url, limit=True):
+        start = time.perf_counter()
+        try:
+            return fetch(url, limit=limit)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    c.fetch = timed_fetch
+    GoodReads(verbose=False, **options)
+    GoodReads.set_base(base)
+
+    records = 0
+    start = time.perf_counter()
+    for author_id in author_ids:
+        if scenario == 'search_quotes':
+            records += len(GoodReads.search_quotes(author_id, top_k=None))
+        elif scenario == 'search_books':
+            records += len(GoodReads.search_books(author_id, top_k=None))
+        elif scenario == 'get_author':
+            records += len(GoodReads.get_author(author_id)) and 1
+    elapsed = time.perf_counter() - start
+    return {'pages': len(latencies), 'records': records, 'elapsed': elapsed, 'latencies': latencies,
+            'peak_rss': peak_rss()}
+
+
+def run_isolated(scenario, base, author_ids, options):
+    """Run a scenario in a fresh process."""
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        return pool.apply(run_scenario, (scenario, base, author_ids, options))
+
+
+def summarize(runs):
+    latencies = [latency for run in runs for latency in run['latencies']]
+    elapsed = sum(run['elapsed'] for run in runs)
+    return {
+        'pages/sec': sum(run['pages'] for run in runs) / elapsed,
+        'records/sec': sum(run['records'] for run in runs) / elapsed,
+        'p50 (ms)': 1000 * percentile(latencies, 0.5),
+        'p99 (ms)': 1000 * percentile(latencies, 0.99),
+        'peak RSS (MB)': max(run['peak_rss'] for run in runs) / 1024 ** 2,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='+', default=SCENARIOS, choices=SCENARIOS, help='scenarios to run')
+    parser.add_argument('--authors', type=int, default=3, help='number of authors scraped per scenario')
+    parser.add_argument('--quotes', type=int, default=300, help='number of quotes per author')
+    parser.add_argument('--books', type=int, default=60, help='number of books per author')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per scenario')
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds the server waits before answering')
+    parser.add_argument('--jitter', type=float, default=0.5, help='fraction of the latency drawn at random')
+    parser.add_argument('--error-rate', type=float, default=0, help='fraction of requests answered with a 503')
+    parser.add_argument('--pool-size', type=int, default=10, help='connections per host')
+    parser.add_argument('--prefetch', type=int, default=4, help='pages fetched in advance')
+    parser.add_argument('--parser', default='bs4', help='parser backend (bs4 or lxml)')
+    parser.add_argument('--workers', type=int, default=0, help='parser processes (0 parses in the fetching threads)')
+    parser.add_argument('--save', help='save the results to a JSON file')
+    parser.add_argument('--compare', help='compare the results with a JSON file saved with --save')
+    args = parser.parse_args()
+
+    library = Library(num_quotes=args.quotes, num_books=args.books)
+    author_ids = [author_id for author_id, _ in AUTHORS[:args.authors]]
+    options = {'pool_size': args.pool_size, 'prefetch': args.prefetch, 'backoff': 0.01, 'parser': args.parser,
+               'workers': args.workers}
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+
+    results = {}
+    with StandInServer(library=library, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate) as server:
+        for scenario in args.scenarios:
+            runs = [run_isolated(scenario, server.url, author_ids, options) for _ in range(args.repeat)]
+            results[scenario] = summarize(runs)
+
+    for scenario, result in results.items():
+        print(scenario)
+        for key, value in result.items():
+            line = f'    {key:<15}{value:>10.1f}'
+            if scenario in baseline:
+                old = baseline[scenario][key]
+                line += f'    (baseline {old:.1f}, {100 * (value - old) / old if old else 0:+.1f}%)'
+            print(line)
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(results, file, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark a long-running client answering the same API calls again and again (``search_quotes()``,
+``search_books()``, ``get_quotes()``) against the stand-in server, with and without the identity map of the client.
+Counts the requests received by the server and checks that both clients return the same data.
+
+Usage::
+
+    python benchmarks/bench_identity.py --rounds 5 --authors 5 --latency 0.02
+
+"""
+
+import argparse
+import time
+import warnings
+
+from scrapereads import GoodReads
+from scrapereads.standin import fixtures
+from scrapereads.standin.server import StandInServer
+
+warnings.simplefilter('ignore', DeprecationWarning)
+
+
+def serve(client, author_ids, rounds):
+    """Answer the same calls ``rounds`` times, as a service would."""
+    results = []
+    for _ in range(rounds):
+        for author_id in author_ids:
+            quotes = client.search_quotes(author_id, top_k=30)
+            books = client.search_books(author_id, top_k=5)
+            results.append(([quote.quote_id for quote in quotes], [book.book_id for book in books],
+                            client.get_quotes(author_id, top_k=10)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=5, help='number of times the same calls are made')
+    parser.add_argument('--authors', type=int, default=5, help='number of authors requested')
+    parser.add_argument('--latency', type=float, default=0.02, help='latency of the server, in seconds')
+    args = parser.parse_args()
+
+    author_ids = list(fixtures.Library().authors)[:args.authors]
+    outputs = {}
+    with StandInServer(latency=args.latency) as server:
+        for identity in [False, True]:
+            client = GoodReads(verbose=False, identity=identity)
+            client.set_base(server.url)
+            server.reset_stats()
+            start = time.perf_counter()
+            outputs[identity] = serve(client, author_ids, args.rounds)
+            elapsed = time.perf_counter() - start
+            print(f'identity map {"on " if identity else "off"}   requests={server.stats.get("requests", 0):>5}   '
+                  f'time={elapsed:.2f}s   {client.get_identity_stats()}')
+    assert outputs[False] == outputs[True], 'the clients differ'
+    print(f'parity: same data for {args.rounds} rounds of {len(author_ids)} authors')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark how building the quotes of an author (``Author._parse_quotes()``) and looking up its books and quotes
+(``search_book()``, ``search_quote()``) scale with the number of quotes and books, against the former linear scans.
+Also checks that both return the same books and quotes.
+
+Usage::
+
+    python benchmarks/bench_index.py --sizes 1000 4000 16000
+
+"""
+
+import argparse
+import random
+import time
+
+import scrapereads.reads as greads
+
+
+def parse_quotes_linear(author, records):
+    """Former ``Author._parse_quotes()``, scanning the books of the author for each quote."""
+    quotes = []
+    for record in records:
+        quote = greads.Quote(author.author_id, record['quote_id'], text=record['text'], author_name=author.author_name,
+                             tags=record['tags'], likes=record['likes'])
+        book_id = record['book_id']
+        if book_id:
+            book_exist = True if book_id in [book.book_id for book in author._books] else False
+            if book_exist:
+                book = search_linear(author._books, book_id, 'book_id')
+            else:
+                book = greads.Book(author.author_id, book_id, book_name=record['book_name'],
+                                   author_name=author.author_name)
+                author.add_book(book)
+            book.add_quote(quote)
+        quotes.append(quote)
+    return quotes
+
+
+def search_linear(items, value, attr):
+    """Former ``search_book()`` and ``search_quote()``."""
+    for item in items:
+        if str(value) == str(getattr(item, attr)):
+            return item
+
+
+def make_records(num_quotes, seed=0):
+    """Quote records of an author, a quarter of them from one of ``num_quotes / 4`` books."""
+    rng = random.Random(seed)
+    num_books = max(1, num_quotes // 4)
+    records = []
+    for i in range(num_quotes):
+        book_id = str(rng.randrange(num_books)) if rng.random() < 0.8 else None
+        records.append({'quote_id': str(i), 'text': f'Quote {i}', 'likes': i, 'tags': ['life'], 'book_id': book_id,
+                        'book_name': f'Book {book_id}'})
+    return records
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 4000, 16000], help='numbers of quotes')
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        records = make_records(size)
+        old_author = greads.Author(1, author_name='Jane Doe')
+        new_author = greads.Author(1, author_name='Jane Doe')
+        old_quotes, old_parse = timed(parse_quotes_linear, old_author, records)
+        new_quotes, new_parse = timed(new_author._parse_quotes, records)
+        for quote in old_quotes:
+            old_author.add_quote(quote)
+        for quote in new_quotes:
+            new_author.add_quote(quote)
+        assert [(q.quote_id, q.get_book() and q.get_book().book_id) for q in old_quotes] == \
+               [(q.quote_id, q.get_book() and q.get_book().book_id) for q in new_quotes]
+        assert [b.book_id for b in old_author._books] == [b.book_id for b in new_author._books]
+
+        book_ids = [book.book_id for book in new_author._books]
+        quote_ids = [quote.quote_id for quote in new_quotes]
+        old_found, old_search = timed(lambda: [search_linear(old_author._books, book_id, 'book_id')
+                                               for book_id in book_ids] +
+                                              [search_linear(old_author._quotes, quote_id, 'quote_id')
+                                               for quote_id in quote_ids])
+        new_found, new_search = timed(lambda: [new_author.search_book(book_id) for book_id in book_ids] +
+                                              [new_author.search_quote(quote_id) for quote_id in quote_ids])
+        assert [item.book_id if isinstance(item, greads.Book) else item.quote_id for item in old_found] == \
+               [item.book_id if isinstance(item, greads.Book) else item.quote_id for item in new_found]
+        print(f'{size:>6} quotes, {len(book_ids):>5} books   '
+              f'parse before={1000 * old_parse:>8.1f}ms after={1000 * new_parse:>6.1f}ms   '
+              f'lookups before={1000 * old_search:>8.1f}ms after={1000 * new_search:>6.1f}ms')
+    print('parity: same books and quotes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark building authors from their ids, now that their names are read lazily from their pages:
+building ``Author`` handles connects to nothing, and ``resolve_author_names()`` fetches the pages of many authors
+concurrently, against the former constructor connecting to each page in turn.
+Also checks that both return the same names and hrefs.
+
+Usage::
+
+    python benchmarks/bench_lazy.py --handles 10000 --authors 200 --latency 0.05
+
+"""
+
+import argparse
+import time
+import warnings
+
+import scrapereads.reads as greads
+from scrapereads import GoodReads
+from scrapereads.meta import resolve_author_names
+from scrapereads.standin.server import StandInServer
+
+warnings.simplefilter('ignore', DeprecationWarning)
+
+
+def build_eager(author_ids):
+    """Former ``Author(author_id)``, connecting to the author page in the constructor."""
+    authors = []
+    for author_id in author_ids:
+        author = greads.Author(author_id)
+        author.author_name
+        authors.append(author)
+    return authors
+
+
+def build_batch(author_ids):
+    return resolve_author_names(greads.Author(author_id) for author_id in author_ids)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--handles', type=int, default=10000, help='number of author handles built')
+    parser.add_argument('--authors', type=int, default=200, help='number of authors whose name is read')
+    parser.add_argument('--latency', type=float, default=0.05, help='latency of the server, in seconds')
+    args = parser.parse_args()
+
+    with StandInServer(latency=args.latency) as server:
+        GoodReads(verbose=False, pool_size=32, identity=False)
+        GoodReads.set_base(server.url)
+        handles, elapsed = timed(lambda: [greads.Author(author_id) for author_id in range(args.handles)])
+        print(f'{len(handles):,} author handles   {1000 * elapsed:.1f}ms   requests={server.stats.get("requests", 0)}')
+
+        author_ids = list(range(1, args.authors + 1))
+        server.reset_stats()
+        eager, eager_time = timed(build_eager, author_ids)
+        print(f'{len(author_ids)} names, one page after the other   {eager_time:.2f}s   '
+              f'requests={server.stats.get("requests", 0)}')
+        server.reset_stats()
+        batch, batch_time = timed(build_batch, author_ids)
+        print(f'{len(author_ids)} names, resolve_author_names()     {batch_time:.2f}s   '
+              f'requests={server.stats.get("requests", 0)}   x{eager_time / batch_time:.1f}')
+    assert [(a.author_name, a.href) for a in eager] == [(a.author_name, a.href) for a in batch], 'the names differ'
+    print(f'parity: same names and hrefs for {len(author_ids)} authors')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Measure the memory held by quotes: bytes per ``Quote`` for a million quotes kept in memory,
+built like ``Author.quotes()`` builds them from the records of quote pages (one ``Author`` for 1,000 quotes).
+Also measures the memory kept by an ``Author`` built from its page, before and after ``get_info()``.
+
+Usage::
+
+    python benchmarks/bench_memory.py --quotes 1000000
+
+"""
+
+import argparse
+import gc
+import tracemalloc
+import warnings
+
+import scrapereads.reads as greads
+from scrapereads import GoodReads
+from scrapereads.standin import fixtures
+from scrapereads.standin.server import StandInServer
+
+warnings.simplefilter('ignore', DeprecationWarning)
+
+
+def build_quotes(num_quotes):
+    """Quotes of the fixture library, with a distinct text each, linked to their author."""
+    library = fixtures.Library()
+    rows = [quote for author_id in library.authors for quote in library.quotes(author_id)]
+    author_names = list(library.authors.values())
+    authors = {}
+    quotes = []
+    for i in range(num_quotes):
+        quote_id, text, likes, tags, book = rows[i % len(rows)]
+        author_id = i // 1000
+        if author_id not in authors:
+            authors[author_id] = greads.Author(author_id, author_name=author_names[author_id % len(author_names)])
+        author = authors[author_id]
+        # Copy the strings, as if they were parsed from a page
+        quote = greads.Quote(author_id, str(quote_id + i), text=f'{text} {i}', author_name=author.author_name,
+                             tags=[''.join(tag) for tag in tags], likes=likes)
+        quote.register_author(author)
+        quotes.append(quote)
+    return quotes
+
+
+def build_author(author_id, info=False):
+    """Author whose name is read from its page, with its information if ``info`` is ``True``."""
+    author = greads.Author(author_id)
+    if info:
+        author.get_info()
+    return author
+
+
+def measure(build, *args):
+    """Memory allocated by ``build(*args)`` and still held by its result, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    result = build(*args)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quotes', type=int, default=1000000, help='number of quotes held in memory')
+    args = parser.parse_args()
+
+    quotes, size = measure(build_quotes, args.quotes)
+    texts = sum(len(quote.text.encode('utf-8')) for quote in quotes) / len(quotes)
+    print(f'{len(quotes):,} quotes   {size / 1024 ** 2:,.1f} MB   {size / len(quotes):,.0f} bytes per quote '
+          f'(of which ~{texts:.0f} bytes of text)')
+    del quotes
+
+    with StandInServer() as server:
+        GoodReads(verbose=False)
+        GoodReads.set_base(server.url)
+        author_id = next(iter(fixtures.Library().authors))
+        for info in [False, True]:
+            _, size = measure(build_author, author_id, info)
+            print(f'author built from its page{" after get_info()" if info else ""}   {size / 1024:,.0f} kB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark the parsing of list pages: whole tree against the ``SoupStrainer`` of the items only.
+Reports the parse time and the memory held by the tree, per page, and checks that the same records are extracted.
+
+Usage::
+
+    python benchmarks/bench_parse.py --repeat 50
+
+"""
+
+import argparse
+import time
+import tracemalloc
+import warnings
+
+import bs4
+
+from scrapereads import scrape
+from scrapereads.standin import fixtures
+
+warnings.simplefilter('ignore', DeprecationWarning)
+
+
+def parse_time(body, only, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        bs4.BeautifulSoup(body, 'lxml', parse_only=only)
+    return (time.perf_counter() - start) / repeat
+
+
+def tree_memory(body, only):
+    tracemalloc.start()
+    soup = bs4.BeautifulSoup(body, 'lxml', parse_only=only)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del soup
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=50, help='number of parses per page')
+    args = parser.parse_args()
+
+    library = fixtures.Library(num_quotes=300, num_books=60)
+    pages = [
+        ('author quotes', fixtures.author_quotes_page(library, 3389, npage=2), scrape.scrape_quotes_page,
+         scrape.QUOTES_STRAINER),
+        ('author books', fixtures.author_books_page(library, 3389, npage=2), scrape.scrape_author_books_page,
+         scrape.AUTHOR_BOOKS_STRAINER),
+    ]
+    for name, page, extract, only in pages:
+        body = page.encode('utf-8')
+        full = extract(bs4.BeautifulSoup(body, 'lxml'))
+        strained = extract(bs4.BeautifulSoup(body, 'lxml', parse_only=only))
+        assert full['items'] == strained['items'], f'{name}: the strainer changed the records'
+
+        full_time, strained_time = parse_time(body, None, args.repeat), parse_time(body, only, args.repeat)
+        full_memory, strained_memory = tree_memory(body, None), tree_memory(body, only)
+        print(f'{name} ({len(body) / 1024:.0f} KB, {len(full["items"])} items)')
+        print(f'    parse time (ms)   full={1000 * full_time:>8.2f}   strained={1000 * strained_time:>8.2f}   '
+              f'{100 * (1 - strained_time / full_time):.0f}% less')
+        print(f'    tree memory (KB)  full={full_memory / 1024:>8.0f}   strained={strained_memory / 1024:>8.0f}   '
+              f'{100 * (1 - strained_memory / full_memory):.0f}% less')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Compare the speed of the parser backends on the fixture pages.
+Their parity with BeautifulSoup is checked in ``tests/test_parsers.py``.
+
+Usage::
+
+    python benchmarks/bench_parsers.py --repeat 20
+
+"""
+
+import argparse
+import time
+import warnings
+
+from scrapereads import scrape
+from scrapereads.parsers import PARSERS, get_parser
+from scrapereads.standin import fixtures
+
+warnings.simplefilter('ignore', DeprecationWarning)
+
+def fixture_pages(library):
+    """List pages of the fixture library, as ``(name, body, extract)``."""
+    pages = []
+    for author_id in library.authors:
+        for npage in range(1, library.num_quotes // fixtures.QUOTES_PER_PAGE + 2):
+            body = fixtures.author_quotes_page(library, author_id, npage=npage)
+            pages.append((f'quotes {author_id} p{npage}', body, scrape.scrape_quotes_page))
+        for npage in range(1, library.num_books // fixtures.BOOKS_PER_PAGE + 2):
+            body = fixtures.author_books_page(library, author_id, npage=npage)
+            pages.append((f'books {author_id} p{npage}', body, scrape.scrape_author_books_page))
+        book_id = library.books(author_id)[0][0]
+        for npage in range(1, 3):
+            body = fixtures.book_quotes_page(library, book_id, npage=npage)
+            pages.append((f'book quotes {book_id} p{npage}', body, scrape.scrape_quotes_page))
+    return [(name, body.encode('utf-8'), extract) for name, body, extract in pages]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--authors', type=int, default=10, help='number of fixture authors')
+    parser.add_argument('--repeat', type=int, default=5, help='number of extractions per page')
+    args = parser.parse_args()
+
+    library = fixtures.Library(authors=fixtures.AUTHORS[:args.authors])
+    pages = fixture_pages(library)
+    parsers = [get_parser(name) for name in PARSERS]
+    num_records = sum(len(get_parser('bs4').extract(extract, body)['items']) for _, body, extract in pages)
+    print(f'{len(pages)} pages ({num_records} records)')
+
+    for parser in parsers:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for _, body, extract in pages:
+                parser.extract(extract, body)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        print(f'{parser.name:<6} pages/sec={len(pages) / elapsed:>8.1f}   records/sec={num_records / elapsed:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark the single-pass quote extractor (``scrape.get_quote_record``) against the former per-field lookups
+(``get_quote_text``, ``get_quote_likes`` twice, ``scrape_quote_tags`` and ``get_quote_book``) on a 30-quote page.
+Also checks that both return the same records.
+
+Usage::
+
+    python benchmarks/bench_quote_record.py --repeat 200
+
+"""
+
+import argparse
+import time
+import warnings
+
+import bs4
+
+from scrapereads import scrape
+from scrapereads.utils import process_quote_text
+from scrapereads.standin import fixtures
+from bench_parsers import EDGE_QUOTES
+
+warnings.simplefilter('ignore', DeprecationWarning)
+
+
+def get_quote_record_per_field(quote_div):
+    """Former extractor, searching the quote element again for each field."""
+    quote_text = process_quote_text(scrape.get_quote_text(quote_div))
+    quote_likes = eval(scrape.get_quote_likes(quote_div).text.replace('likes', '').strip())
+    quote_href = scrape.get_quote_likes(quote_div).get('href')
+    quote_id = quote_href.split('-')[0].split('.')[0]
+    quote_tags = []
+    for tag in scrape.scrape_quote_tags(quote_div):
+        quote_tags.append(tag.text.strip())
+    book_id = book_name = None
+    book_title = scrape.get_quote_book(quote_div)
+    if book_title:
+        book_href = book_title.get('href')
+        book_id = book_href.split('/')[-1].split('-')[0].split('.')[0]
+        book_name = book_title.text.strip()
+    return {
+        'quote_id': quote_id,
+        'text': quote_text,
+        'likes': quote_likes,
+        'tags': quote_tags,
+        'book_id': book_id,
+        'book_name': book_name,
+    }
+
+
+def run(extract, quote_divs, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for quote_div in quote_divs:
+            extract(quote_div)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200, help='number of extractions of the page')
+    args = parser.parse_args()
+
+    library = fixtures.Library()
+    pages = [fixtures.author_quotes_page(library, author_id, npage=npage)
+             for author_id in library.authors for npage in range(1, 11)] + [EDGE_QUOTES]
+    for page in pages:
+        for quote_div in scrape.scrape_quotes(bs4.BeautifulSoup(page, 'lxml')):
+            assert scrape.get_quote_record(quote_div) == get_quote_record_per_field(quote_div)
+
+    soup = bs4.BeautifulSoup(fixtures.author_quotes_page(library, 3389, npage=1), 'lxml')
+    quote_divs = list(scrape.scrape_quotes(soup))
+    before = run(get_quote_record_per_field, quote_divs, args.repeat)
+    after = run(scrape.get_quote_record, quote_divs, args.repeat)
+    print(f'parity: same records on {len(pages)} pages')
+    print(f'{len(quote_divs)}-quote page   per-field={1000 * before:.2f}ms   single-pass={1000 * after:.2f}ms   '
+          f'x{before / after:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark the pooled keep-alive session against one ``urllib.request.urlopen`` per page.
+A local stand-in server counts the connections it accepts, i.e. the handshakes paid by the client.
+
+Usage::
+
+    python benchmarks/bench_session.py --pages 200
+
+"""
+
+import argparse
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scrapereads.session import Session
+
+PAGE = b'<html><body>' + b'<div class="quote">Lorem ipsum</div>' * 30 + b'</body></html>'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StandInHandler.lock:
+            StandInHandler.connections += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(fetch, urls):
+    StandInHandler.connections = 0
+    start = time.perf_counter()
+    for url in urls:
+        fetch(url)
+    elapsed = time.perf_counter() - start
+    return StandInHandler.connections, len(urls) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=200, help='number of pages to fetch')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    urls = [f'http://{host}:{port}/author/quotes/3389?page={npage}' for npage in range(1, args.pages + 1)]
+
+    def fetch_urlopen(url):
+        return urllib.request.urlopen(urllib.request.Request(url)).read()
+
+    session = Session(pool_size=1)
+
+    def fetch_session(url):
+        return session.request(url).data
+
+    for name, fetch in [('urlopen', fetch_urlopen), ('session', fetch_session)]:
+        handshakes, pages_per_sec = run(fetch, urls)
+        print(f'{name:<10} pages={len(urls):<6} handshakes={handshakes:<6} pages/sec={pages_per_sec:.1f}')
+
+    session.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark the streaming mode (``GoodReads.set_stream()``) against the local ``Good Reads`` stand-in server,
+which sends its pages in delayed chunks like a slow connection.
+Measures the time to the first quote and book of an author, and to the whole first page.
+The parity of both modes is checked in ``tests/test_stream.py``.
+
+Usage::
+
+    python benchmarks/bench_stream.py --chunk-size 4096 --chunk-delay 0.02
+
+"""
+
+import argparse
+import time
+import warnings
+
+from scrapereads import GoodReads
+from scrapereads.standin.fixtures import Library, AUTHORS
+from scrapereads.standin.server import StandInServer
+
+warnings.simplefilter('ignore', DeprecationWarning)
+
+
+def first_page(author_id, kind, per_page):
+    """Time to the first item and to the last item of the first page."""
+    author = GoodReads.search_author(author_id)
+    search = author.quotes if kind == 'quotes' else author.books
+    items = search(cache=False, top_k=per_page)
+    start = time.perf_counter()
+    first = None
+    for _ in items:
+        first = first or time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--authors', type=int, default=3, help='number of authors')
+    parser.add_argument('--chunk-size', type=int, default=4096, help='bytes sent by the server at once')
+    parser.add_argument('--chunk-delay', type=float, default=0.02, help='seconds between two chunks')
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds the server waits before answering')
+    args = parser.parse_args()
+
+    author_ids = [author_id for author_id, _ in AUTHORS[:args.authors]]
+    with StandInServer(library=Library(), latency=args.latency, compress=False, chunk_size=args.chunk_size,
+                       chunk_delay=args.chunk_delay) as server:
+        GoodReads(verbose=False)
+        GoodReads.set_base(server.url)
+        for kind, per_page in [('quotes', 30), ('books', 30)]:
+            results = {}
+            for stream in [False, True]:
+                GoodReads.set_stream(stream)
+                results[stream] = [first_page(author_id, kind, per_page) for author_id in author_ids]
+            for stream, runs in results.items():
+                first = sum(run[0] for run in runs) / len(runs)
+                last = sum(run[1] for run in runs) / len(runs)
+                print(f'{kind:<7} stream={str(stream):<6} first item={1000 * first:>7.1f}ms   '
+                      f'first page={1000 * last:>7.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
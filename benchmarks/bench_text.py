@@ -0,0 +1,76 @@
+"""
+Compare the speed of the text normalization of ``scrapereads.utils`` with the former implementation
+(one ``str.replace`` pass per entry of ``CHARS``, ``HTML`` and ``ROMAN``), on the quotes of the fixture library,
+and on quotes holding roman numbers. Their parity is checked in ``tests/test_text.py``.
+
+Usage::
+
+    python benchmarks/bench_text.py --repeat 20
+
+"""
+
+import argparse
+import time
+
+from scrapereads import utils
+from scrapereads.standin import fixtures
+
+def name_to_goodreads(name):
+    name = utils.to_ascii(name.title())
+    for char in utils.CHARS:
+        name = name.replace(*char)
+    return name
+
+
+def clean_num(quote):
+    for char in utils.ROMAN:
+        quote = quote.replace(*char)
+    return quote
+
+
+def process_quote_text(quote_text):
+    quote_text = quote_text.replace('―', '').replace('\n\n', '\n')
+    quote_text = quote_text[:-1] if quote_text[-1] == '\n' else quote_text
+    for char in utils.HTML:
+        quote_text = quote_text.replace(*char)
+    return quote_text
+
+
+def clean_quote_text(quote_text):
+    return process_quote_text(process_quote_text(quote_text))
+
+
+def run(function, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            function(text)
+    return (time.perf_counter() - start) / repeat / len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=10, help='number of runs on the fixture quotes')
+    args = parser.parse_args()
+
+    library = fixtures.Library()
+    quotes = [f'      “{quote[1]}”\n  \n  ―\n  ' for author_id in library.authors
+              for quote in library.quotes(author_id)]
+    numbers = [f'{quote[:40]} II {quote[40:80]}\nIV {quote[80:]}' for quote in quotes]
+    names = [name for _, name in fixtures.AUTHORS] + [book[1] for book in library.books(next(iter(library.authors)))]
+    for name, old, new, texts in [('name_to_goodreads', name_to_goodreads, utils.name_to_goodreads, names),
+                                  ('clean_num', clean_num, utils.clean_num, quotes),
+                                  ('clean_num (roman)', clean_num, utils.clean_num, numbers),
+                                  ('clean_quote_text', clean_quote_text, utils.clean_quote_text, quotes)]:
+        before = run(old, texts, args.repeat)
+        after = run(new, texts, args.repeat)
+        print(f'{name:<18} before={1e6 * before:>6.2f}us   after={1e6 * after:>6.2f}us   x{before / after:.1f}')
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        utils.clean_quote_texts(quotes)
+    batch = (time.perf_counter() - start) / args.repeat / len(quotes)
+    print(f'{"clean_quote_texts":<18} per quote={1e6 * batch:>6.2f}us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,2 @@
+from .reads import AsyncAuthor, AsyncBook
+from .api import AsyncGoodReads
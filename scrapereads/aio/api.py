@@ -0,0 +1,248 @@
+"""
+Asynchronous API to connect and extract data from ``Good Reads`` servers.
+"""
+
+import functools
+
+from scrapereads import api
+from scrapereads.api import GoodReads, _client_method, _unique
+from .connect import run_bulk, set_concurrency
+from .reads import AsyncAuthor, resolve_author_names
+
+
+def _get_author(author_id, identity=None):
+    # Authors are shared with the synchronous API, through the identity map of the client.
+    # Their name is read from their page when it is needed (see ``AsyncAuthor.resolve_name()``)
+    return AsyncAuthor(api._get_author(author_id, identity))
+
+
+class AsyncGoodReads(GoodReads):
+    """Asynchronous API for `Good Reads` scrapping.
+
+        It wraps ``AsyncAuthor`` and ``AsyncBook`` classes, and returns the same objects and data as ``GoodReads``.
+
+        Examples::
+            >>> goodreads = AsyncGoodReads(concurrency=100)
+            >>> quotes = await asyncio.gather(*[goodreads.search_quotes(author_id) for author_id in author_ids])
+
+        """
+
+    def __init__(self, verbose=False, sleep=0, user=None, pool_size=64, prefetch=4, rate=None, burst=1,
+                 cache=None, cache_ttl=None, cache_size=None, timeout=30, retries=3, backoff=0.5, parser='bs4',
+                 workers=0, lang_seed=None, identity=False, identity_size=10000, bulk_workers=8,
+                 breaker_threshold=0.5, breaker_cooldown=30, concurrency=64):
+        super().__init__(verbose=verbose, sleep=sleep, user=user, pool_size=pool_size, prefetch=prefetch, rate=rate,
+                         burst=burst, cache=cache, cache_ttl=cache_ttl, cache_size=cache_size, timeout=timeout,
+                         retries=retries, backoff=backoff, parser=parser, workers=workers, lang_seed=lang_seed,
+                         identity=identity, identity_size=identity_size, bulk_workers=bulk_workers,
+                         breaker_threshold=breaker_threshold, breaker_cooldown=breaker_cooldown)
+        self.set_concurrency(concurrency)
+
+    @staticmethod
+    def set_concurrency(concurrency):
+        """Number of pages that can be fetched at the same time.
+
+        Args:
+            concurrency (int): maximum number of connections in flight.
+
+        """
+        set_concurrency(concurrency)
+
+    @_client_method
+    async def search_author(self, author_id):
+        """Search an author from `Good Reads` server.
+
+        Args:
+            author_id (string): name of the author to get.
+
+        Returns:
+            AsyncAuthor
+
+        """
+        author = _get_author(author_id, self.identity)
+        await author.resolve_name()
+        return author
+
+    @_client_method
+    async def search_authors(self, author_ids):
+        """Search several authors from `Good Reads` server, reading their names from their pages concurrently.
+
+        Args:
+            author_ids (list): ids of the authors to get.
+
+        Returns:
+            list(AsyncAuthor)
+
+        """
+        authors = [_get_author(author_id, self.identity) for author_id in author_ids]
+        await resolve_author_names([author.obj for author in authors])
+        return authors
+
+    @_client_method
+    async def search_book(self, author_id, book_id):
+        """Search an book from `Good Reads` server.
+
+        Args:
+            author_id (string): name of the author who made the book.
+            book_id (string): name of the book.
+
+        Returns:
+            AsyncBook
+
+        """
+        author = _get_author(author_id, self.identity)
+        return await author.search_book(book_id)
+
+    @_client_method
+    async def search_books(self, author_id, top_k=10):
+        """Search books in from an author.
+
+        Args:
+            author_id (string): name of the author to get.
+            top_k (int): number of books to retrieve.
+
+        Returns:
+            list(AsyncBook)
+
+        """
+        author = _get_author(author_id, self.identity)
+        return await author.get_books(top_k=top_k)
+
+    @_client_method
+    async def search_quotes(self, author_id, top_k=50):
+        """Search quotes from `Good Reads` server.
+
+        Args:
+            author_id (string): name of the author who made the quote.
+            top_k (int): number of quotes to retrieve.
+
+        Returns:
+            list(Quote)
+
+        """
+        author = _get_author(author_id, self.identity)
+        return await author.get_quotes(top_k=top_k)
+
+    @_client_method
+    async def get_author(self, author_id, encode=None):
+        """Get an author in a JSON format.
+
+        Args:
+            author_id (string): name of the author.
+            encode (string): encode to ASCII format or not.
+
+        Returns:
+            dict
+
+        """
+        author = _get_author(author_id, self.identity)
+        return await author.to_json(encode=encode)
+
+    @_client_method
+    async def get_quotes(self, author_id, top_k=10):
+        """Get all quotes in a JSON format from an author.
+
+        Args:
+            author_id (string): name of the author to get.
+            top_k (int): number of quotes to retrieve.
+
+        Returns:
+            list(dict)
+
+        """
+        author = _get_author(author_id, self.identity)
+        quotes = []
+        i = 0
+        candidates = author.quotes(top_k=top_k)
+        try:
+            async for quote in candidates:
+                quotes.append(quote.to_json())
+                if top_k and i + 1 >= top_k:
+                    return quotes
+                i += 1
+        finally:
+            # Release the lock of the author at once, when the quotes are not all read
+            await candidates.aclose()
+        return quotes
+
+    @_client_method
+    async def get_books(self, author_id, top_k=10):
+        """Get all books in a JSON format from an author.
+
+        Args:
+            author_id (string): name of the author to get.
+            top_k (int): number of books to retrieve.
+
+        Returns:
+            list(dict)
+
+        """
+        author = _get_author(author_id, self.identity)
+        books = []
+        i = 0
+        candidates = author.books(top_k=top_k)
+        try:
+            async for book in candidates:
+                books.append(await book.to_json())
+                if top_k and i + 1 >= top_k:
+                    return books
+                i += 1
+        finally:
+            # Release the lock of the author at once, when the books are not all read
+            await candidates.aclose()
+        return books
+
+    @_client_method
+    async def get_authors(self, author_ids, encode=None, ordered=True):
+        """Get many authors in a JSON format, ``bulk_workers`` at a time.
+        An author that fails is reported with its error, and does not stop the others.
+
+        Args:
+            author_ids (iterable): ids of the authors. Repeated ids are processed once.
+            encode (string): encode to ASCII format or not.
+            ordered (bool): if ``True``, authors are yielded in the order of ``author_ids``, else as soon as they
+                are ready.
+
+        Returns:
+            async yield BulkResult
+
+        """
+        task = functools.partial(self.get_author, encode=encode)
+        async for result in run_bulk(task, _unique(author_ids), ordered=ordered):
+            yield result
+
+    @_client_method
+    async def get_quotes_bulk(self, author_ids, top_k=10, ordered=True):
+        """Get the quotes of many authors in a JSON format, ``bulk_workers`` at a time.
+
+        Args:
+            author_ids (iterable): ids of the authors. Repeated ids are processed once.
+            top_k (int): number of quotes to retrieve per author.
+            ordered (bool): if ``True``, authors are yielded in the order of ``author_ids``, else as soon as they
+                are ready.
+
+        Returns:
+            async yield BulkResult
+
+        """
+        task = functools.partial(self.get_quotes, top_k=top_k)
+        async for result in run_bulk(task, _unique(author_ids), ordered=ordered):
+            yield result
+
+    @_client_method
+    async def get_books_bulk(self, author_ids, top_k=10, ordered=True):
+        """Get the books of many authors in a JSON format, ``bulk_workers`` at a time.
+
+        Args:
+            author_ids (iterable): ids of the authors. Repeated ids are processed once.
+            top_k (int): number of books to retrieve per author.
+            ordered (bool): if ``True``, authors are yielded in the order of ``author_ids``, else as soon as they
+                are ready.
+
+        Returns:
+            async yield BulkResult
+
+        """
+        task = functools.partial(self.get_books, top_k=top_k)
+        async for result in run_bulk(task, _unique(author_ids), ordered=ordered):
+            yield result
@@ -0,0 +1,127 @@
+"""
+Asynchronous engine to connect to ``Good Reads`` servers.
+Pages are fetched through the pooled keep-alive session in a bounded pool of worker threads,
+so that the event loop is never blocked by the network (or by the HTML parsing).
+"""
+
+import asyncio
+import functools
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from scrapereads import connect as sync
+
+# Global variables
+CONCURRENCY = 64
+EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def set_concurrency(value):
+    global CONCURRENCY
+    CONCURRENCY = value
+    # The next connection will open a new executor with the updated size
+    close_executor()
+
+
+def get_executor():
+    """Get the pool of workers used to connect to pages.
+
+    Returns:
+        concurrent.futures.ThreadPoolExecutor
+
+    """
+    global EXECUTOR
+    with _EXECUTOR_LOCK:
+        if EXECUTOR is None:
+            EXECUTOR = ThreadPoolExecutor(max_workers=CONCURRENCY, thread_name_prefix='scrapereads')
+        return EXECUTOR
+
+
+def close_executor():
+    """Shut down the pool of workers, waiting for pending connections."""
+    global EXECUTOR
+    with _EXECUTOR_LOCK:
+        if EXECUTOR is not None:
+            EXECUTOR.shutdown(wait=True)
+            EXECUTOR = None
+
+
+async def _load(url, load):
+    loop = asyncio.get_running_loop()
+    # Wait for the circuit breaker and the rate limiter in the event loop, so that no worker is held while waiting
+    if not await loop.run_in_executor(get_executor(), sync.is_cached, url):
+        await sync.BREAKER.wait_async(url)
+        await sync.LIMITER.acquire_async(url)
+    return await loop.run_in_executor(get_executor(), functools.partial(load, url, limit=False))
+
+
+async def connect(url, only=None):
+    """Connect to an URL without blocking the event loop.
+
+    Args:
+        url (string): url path.
+        only (bs4.SoupStrainer, optional): if provided, only the matching parts of the page are parsed.
+
+    Returns:
+        soup
+
+    """
+    return await _load(url, functools.partial(sync.connect, only=only))
+
+
+async def connect_records(url, extract, only=None):
+    """Connect to an URL and extract records from the page, without blocking the event loop.
+
+    Args:
+        url (string): url path.
+        extract (callable): function extracting JSON serializable records from a soup.
+        only (bs4.SoupStrainer, optional): if provided, only the matching parts of the page are parsed.
+
+    Returns:
+        object: records returned by ``extract``.
+
+    """
+    return await _load(url, functools.partial(sync.connect_records, extract=extract, only=only))
+
+
+async def _run_task(task, key):
+    try:
+        return sync.BulkResult(key, await task(key), None)
+    except Exception as error:
+        return sync.BulkResult(key, None, error)
+
+
+async def run_bulk(task, keys, ordered=True):
+    """Await a coroutine function on many keys (e.g. author ids), ``BULK_WORKERS`` calls at a time.
+    Closing the generator cancels the calls still running.
+
+    Args:
+        task (callable): coroutine function taking a key.
+        keys (iterable): keys to call the function on.
+        ordered (bool): if ``True``, results are yielded in the order of ``keys``, else as soon as they are ready.
+
+    Returns:
+        async yield BulkResult: key, value returned by ``task`` (or ``None``), and exception raised by ``task``
+        (or ``None``).
+
+    """
+    keys = iter(keys)
+    tasks = deque(asyncio.ensure_future(_run_task(task, key)) for key in itertools.islice(keys, sync.BULK_WORKERS))
+    try:
+        while tasks:
+            if ordered:
+                done = [tasks.popleft()]
+                await done[0]
+            else:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                tasks = deque(future for future in tasks if future not in done)
+            for key in itertools.islice(keys, len(done)):
+                tasks.append(asyncio.ensure_future(_run_task(task, key)))
+            for future in done:
+                yield future.result()
+    finally:
+        for future in tasks:
+            future.cancel()
@@ -0,0 +1,433 @@
+"""
+Asynchronous counterparts of ``Author`` and ``Book``.
+They wrap the synchronous objects, so the scraped data (and the cache) is shared with the synchronous API.
+"""
+
+import asyncio
+import math
+import weakref
+
+from scrapereads.utils import *
+from scrapereads import scrape, meta
+from scrapereads.reads import Author
+from scrapereads import connect as sync
+from scrapereads import lang as langs
+from scrapereads.connect import get_base
+from .connect import connect, connect_records, get_executor
+
+
+# Locks of the authors and books scraped by coroutines, by event loop (see ``meta._get_lock()``).
+# Coroutines cannot wait on the locks of the threads without blocking the event loop: the asynchronous API locks
+# the objects from the other coroutines only
+_LOCKS = weakref.WeakKeyDictionary()
+
+
+def _get_lock(obj):
+    locks = _LOCKS.setdefault(asyncio.get_running_loop(), weakref.WeakKeyDictionary())
+    lock = locks.get(obj)
+    if lock is None:
+        lock = locks[obj] = asyncio.Lock()
+    return lock
+
+
+async def _iter_detected(quotes):
+    # Detect the languages in batches (see ``lang.iter_detected()``), without blocking the event loop
+    loop = asyncio.get_running_loop()
+    size = langs.BATCH_SIZE * max(1, sync.WORKERS)
+    batch = []
+    try:
+        async for quote in quotes:
+            batch.append(quote)
+            if len(batch) >= size:
+                for quote in await loop.run_in_executor(get_executor(), langs.detect_quotes, batch):
+                    yield quote
+                batch = []
+        for quote in await loop.run_in_executor(get_executor(), langs.detect_quotes, batch):
+            yield quote
+    finally:
+        await quotes.aclose()
+
+
+class AsyncMeta:
+    """Wraps a `Good Reads` object, and forwards its attributes (``author_name``, ``url`` etc.).
+
+    * :attr:`obj`: wrapped ``Author`` or ``Book``.
+
+    """
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    async def connect(self, href=None):
+        """Connect to a `Good Reads` page, without blocking the event loop.
+
+        Args:
+            href (string, optional): if provided, connect to the page reference, else connect to the main page.
+
+        Returns:
+            bs4.element.Tag
+
+        """
+        url = self.obj.base + (href or self.obj.href)
+        return await connect(url)
+
+    async def _search_pages(self, href, extract, parse, add, top_k=None, only=None):
+        # Navigate through the pages, fetching all of them at once when the first page tells how many there are.
+        # The first page is parsed in full to read the pagination widget, only the items of the next ones are parsed
+        obj = self.obj
+        page = await connect_records(obj.base + href, extract)
+        items = parse(page['items']) if page else []
+        max_pages = math.ceil(top_k / len(items)) if top_k and items else None
+        num_pages = page['num_pages'] if page else None
+        if num_pages:
+            num_pages = min(num_pages, max_pages or num_pages)
+            urls = [obj.base + href + obj._next_page(npage=npage) for npage in range(2, num_pages + 1)]
+            tasks = [asyncio.ensure_future(connect_records(url, extract, only=only)) for url in urls]
+        npage = 2
+        try:
+            while items:
+                for item in items:
+                    add(item)
+                    yield item
+                if num_pages:
+                    if npage > num_pages:
+                        break
+                    page = await tasks[npage - 2]
+                elif max_pages and npage > max_pages:
+                    break
+                else:
+                    page = await connect_records(obj.base + href + obj._next_page(npage=npage), extract, only=only)
+                npage += 1
+                # A page that failed to load is skipped when the number of pages is known
+                while page is None and num_pages and npage <= num_pages:
+                    page = await tasks[npage - 2]
+                    npage += 1
+                items = parse(page['items']) if page else []
+        finally:
+            if num_pages:
+                for task in tasks:
+                    task.cancel()
+
+    def __getattr__(self, name):
+        return getattr(self.obj, name)
+
+    def __repr__(self):
+        return repr(self.obj)
+
+
+async def resolve_author_names(authors, only_missing=True):
+    """Read the names of several authors from their pages, fetched concurrently without blocking the event loop.
+
+    Args:
+        authors (iterable): authors, books or quotes.
+        only_missing (bool): if ``True``, names already known are not read again.
+
+    Returns:
+        list: the same authors, books or quotes.
+
+    """
+    authors = list(authors)
+    groups = meta._group_authors(authors, only_missing=only_missing)
+    author_names = await asyncio.gather(*[connect_records(f'{group[0].base}/author/show/{author_id}',
+                                                          scrape.scrape_author_name, only=scrape.AUTHOR_NAME_STRAINER)
+                                          for author_id, group in groups.items()])
+    meta._set_author_names(groups, author_names)
+    return authors
+
+
+class AsyncAuthor(AsyncMeta):
+    """Asynchronous author, with ``async for`` versions of ``Author.quotes()`` and ``Author.books()``.
+
+    Examples::
+        >>> author = await AsyncAuthor.create(3389)
+        >>> async for quote in author.quotes():
+        ...     print(quote)
+
+    """
+
+    @classmethod
+    async def create(cls, author_id, author_name=None):
+        """Construct the author, connecting asynchronously to its page if the name is not provided.
+
+        Args:
+            author_id (string): id of the author.
+            author_name (string, optional): name of the author.
+
+        Returns:
+            AsyncAuthor
+
+        """
+        soup = None
+        if not author_name:
+            soup = await connect(f'{get_base()}/author/show/{author_id}')
+            if soup is None:
+                raise ConnectionError(f'Could not connect to the page of the author {author_id} to get its name.')
+            author_name = scrape.get_author_name(soup)
+        author = Author(author_id, author_name=author_name)
+        author._soup = soup
+        return cls(author)
+
+    async def resolve_name(self):
+        """Read the name of the author from its page if it is not known yet, without blocking the event loop.
+
+        Returns:
+            string
+
+        """
+        if self.obj._author_name is None:
+            await resolve_author_names([self.obj])
+        return self.obj._author_name
+
+    async def get_info(self):
+        """Get author information (genres, influences, description etc.)
+
+        Returns:
+            dict
+
+        """
+        if not self.obj._info:
+            soup = self.obj._soup or await self.connect()
+            if soup is None:
+                return {}
+            # Parse the page without blocking the event loop
+            loop = asyncio.get_running_loop()
+            self.obj._info = await loop.run_in_executor(get_executor(), scrape.get_author_info, soup)
+            if self.obj._author_name is None:
+                self.obj._resolve_author_name(scrape.get_author_name(soup))
+            self.obj._soup = None
+        return self.obj._info
+
+    async def quotes(self, cache=True, top_k=None):
+        """Yield all quotes from an author address.
+
+        Args:
+            cache (bool): if ``True``, will look for cache items only (and won't scrape online).
+            top_k (int, optional): number of quotes needed, so that only the required pages are scraped.
+
+        Returns:
+            async yield Quote
+
+        """
+        author = self.obj
+        if not (cache and author._has_quotes(top_k)):
+            async with _get_lock(author):
+                # The quotes may have been scraped by another coroutine in the meantime
+                if not (cache and author._has_quotes(top_k)):
+                    author._clear_quotes()
+                    await self.resolve_name()
+                    href = f'/author/quotes/{author.author_id}.{name_to_goodreads(author.author_name)}'
+                    pages = self._search_pages(href, scrape.scrape_quotes_page, author._parse_quotes,
+                                               author._add_listed_quote, top_k=top_k, only=scrape.QUOTES_STRAINER)
+                    async for quote in pages:
+                        yield quote
+                    author._all_quotes = not top_k or author._listed_quotes < top_k
+                    return
+        for quote in author._quotes:
+            yield quote
+
+    async def get_quotes(self, lang=None, top_k=None, cache=True):
+        """Get all quotes from an author address.
+
+        Args:
+            lang (string): language to pick up quotes.
+            top_k (int): number of quotes to retrieve (ordered by popularity).
+            cache (bool): if ``True``, will look for cache items only (and won't scrape online).
+
+        Returns:
+            list(Quote)
+
+        """
+        author = self.obj
+        quotes = []
+        i = 0
+        candidates = self.quotes(cache=cache, top_k=top_k)
+        if lang:
+            candidates = _iter_detected(candidates)
+        try:
+            async for quote in candidates:
+                if not lang or quote.lang == lang:
+                    quote.register_author(author)
+                    quotes.append(quote)
+                    if top_k and i + 1 >= top_k:
+                        break
+                i += 1
+        finally:
+            # Release the lock of the author at once, when the quotes are not all read
+            await candidates.aclose()
+        return quotes
+
+    async def books(self, cache=True, top_k=None):
+        """Yield all books from an author address.
+
+        Args:
+            cache (bool): if ``True``, will look for cache items only (and won't scrape online).
+            top_k (int, optional): number of books needed, so that only the required pages are scraped.
+
+        Returns:
+            async yield AsyncBook
+
+        """
+        author = self.obj
+        if not (cache and author._has_books(top_k)):
+            async with _get_lock(author):
+                # The books may have been scraped by another coroutine in the meantime
+                if not (cache and author._has_books(top_k)):
+                    author._clear_books()
+                    await self.resolve_name()
+                    href = f'/author/list/{author.author_id}.{name_to_goodreads(author.author_name)}'
+                    pages = self._search_pages(href, scrape.scrape_author_books_page, author._parse_books,
+                                               author._add_listed_book, top_k=top_k, only=scrape.AUTHOR_BOOKS_STRAINER)
+                    async for book in pages:
+                        yield AsyncBook(book)
+                    author._all_books = not top_k or author._listed_books < top_k
+                    return
+        for book in author._books:
+            yield AsyncBook(book)
+
+    async def get_books(self, top_k=None, cache=True):
+        """Get all books from an author address.
+
+        Args:
+            top_k (int): number of books to return.
+            cache (bool): if ``True``, will look for cache items only (and won't scrape online).
+
+        Returns:
+            list(AsyncBook)
+
+        """
+        author = self.obj
+        books = []
+        i = 0
+        candidates = self.books(cache=cache, top_k=top_k)
+        try:
+            async for book in candidates:
+                book.register_author(author)
+                books.append(book)
+                if top_k and i + 1 >= top_k:
+                    break
+                i += 1
+        finally:
+            # Release the lock of the author at once, when the books are not all read
+            await candidates.aclose()
+        return books
+
+    async def search_book(self, book_id, attr='book_id', cache=True):
+        """Search a book from the books saved in the author's cache.
+        Saved books are found from their id or name in constant time. Otherwise, books are scraped until found.
+
+        Args:
+            book_id (string): book id (or name) to look for.
+            attr (string, optional): attribute to search the book from. Options are ``'book_id'`` and ``'book_name'``
+            cache (bool): if ``True``, will look for cache items only (and won't scrape online).
+
+        Returns:
+            AsyncBook
+
+        """
+        author = self.obj
+        if cache and author._books and attr in author._book_index.attrs:
+            book = author._book_index.find(attr, book_id)
+            if book is None:
+                return None
+            book.register_author(author)
+            return AsyncBook(book)
+        candidates = self.books(cache=cache)
+        try:
+            async for book in candidates:
+                if str(book_id) == str(getattr(book, attr)):
+                    book.register_author(author)
+                    return book
+        finally:
+            await candidates.aclose()
+
+    async def to_json(self, encode=None):
+        """Encode the author to a JSON format.
+
+        Args:
+            encode (string): encode to ASCII format or not.
+
+        Returns:
+            dict
+
+        """
+        await self.get_info()
+        await self.resolve_name()
+        return self.obj.to_json(encode=encode)
+
+
+class AsyncBook(AsyncMeta):
+    """Asynchronous book, with an ``async for`` version of ``Book.quotes()``.
+
+    """
+
+    async def quotes(self, cache=True, top_k=None):
+        """Yield all quotes from a book address.
+
+        Args:
+            cache (bool): if ``True``, will look for cache items only (and won't scrape online).
+            top_k (int, optional): number of quotes needed, so that only the required pages are scraped.
+
+        Returns:
+            async yield Quote
+
+        """
+        book = self.obj
+        if not (cache and book._has_quotes(top_k)):
+            async with _get_lock(book):
+                # The quotes may have been scraped by another coroutine in the meantime
+                if not (cache and book._has_quotes(top_k)):
+                    book._clear_quotes()
+                    soup = await self.connect()
+                    href_a = scrape.get_book_quote_page(soup) if soup is not None else None
+                    if href_a:
+                        href = href_a.get('href')
+                        pages = self._search_pages(href, scrape.scrape_quotes_page, book._parse_quotes,
+                                                   book._add_listed_quote, top_k=top_k, only=scrape.QUOTES_STRAINER)
+                        async for quote in pages:
+                            yield quote
+                    book._all_quotes = not top_k or book._listed_quotes < top_k
+                    return
+        for quote in book._quotes:
+            yield quote
+
+    async def get_quotes(self, lang=None, top_k=None, cache=True):
+        """Get all quotes from a book address.
+
+        Args:
+            lang (string): language to pick up quotes.
+            top_k (int): number of quotes to retrieve (ordered by popularity).
+            cache (bool): if ``True``, will look for cache items only (and won't scrape online).
+
+        Returns:
+            list(Quote)
+
+        """
+        book = self.obj
+        quotes = []
+        i = 0
+        candidates = self.quotes(cache=cache, top_k=top_k)
+        if lang:
+            candidates = _iter_detected(candidates)
+        try:
+            async for quote in candidates:
+                if not lang or quote.lang == lang:
+                    quote.register_book(book)
+                    quotes.append(quote)
+                    if top_k and i + 1 >= top_k:
+                        break
+                i += 1
+        finally:
+            # Release the lock of the book at once, when the quotes are not all read
+            await candidates.aclose()
+        return quotes
+
+    async def to_json(self, encode='ascii'):
+        """Encode the book to a JSON format.
+
+        Returns:
+            dict
+
+        """
+        await self.get_quotes()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), self.obj.to_json, encode)
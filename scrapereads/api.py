@@ -2,8 +2,49 @@
 Simple API to connect and extract data from ``Good Reads`` servers.
 """
 
+import functools
+
 from .connect import *
+from . import lang
+from .identity import IdentityMap
+from .crawl import Crawler
+from .meta import resolve_author_names
 from .reads import Author, Book, Quote
+from .reads.author import get_shared_author
+
+
+def _get_author(author_id, identity=None):
+    """Get an author from the identity map of a client, or build it.
+
+    Args:
+        author_id (string): id of the author.
+        identity (IdentityMap, optional): map of the client.
+
+    Returns:
+        Author
+
+    """
+    return get_shared_author(identity, author_id)
+
+
+class _client_method:
+    # Method of the API called on a client or on the class, which gets the client or the class as first argument,
+    # so that the calls use the identity map of the client (or of the class, see ``GoodReads.set_identity_map()``)
+    def __init__(self, func):
+        self.__func__ = func
+        functools.update_wrapper(self, func)
+
+    def __get__(self, obj, cls=None):
+        return functools.update_wrapper(functools.partial(self.__func__, cls if obj is None else obj), self.__func__)
+
+
+def _unique(keys):
+    # An author repeated in a bulk request is processed once (concurrent calls on a shared author wait for its lock)
+    seen = set()
+    for key in keys:
+        if str(key) not in seen:
+            seen.add(str(key))
+            yield key
 
 
 class GoodReads:
@@ -13,11 +54,43 @@ class GoodReads:
 
         """
 
-    def __init__(self, verbose=False, sleep=0, user=None):
+    # Identity map of the client (see ``set_identity_map()``). Calls made on the class do not use any map by default
+    identity = None
+
+    def __init__(self, verbose=False, sleep=0, user=None, pool_size=10, prefetch=4, rate=None, burst=1,
+                 cache=None, cache_ttl=None, cache_size=None, timeout=30, retries=3, backoff=0.5, parser='bs4',
+                 workers=0, stream=False, lang_seed=None, identity=False, identity_size=10000,
+                 bulk_workers=8, breaker_threshold=0.5, breaker_cooldown=30):
         super().__init__()
         self.set_user(user)
         self.set_verbose(verbose)
-        self.set_sleep(sleep)
+        # A rate overrides the sleep, so the limiter is only replaced once
+        if rate:
+            self.set_rate_limit(rate, burst=burst)
+        else:
+            self.set_sleep(sleep)
+        self.set_cache(cache, ttl=cache_ttl, max_size=cache_size)
+        self.set_pool_size(pool_size)
+        self.set_prefetch(prefetch)
+        self.set_timeout(timeout)
+        self.set_retries(retries, backoff=backoff)
+        self.set_circuit_breaker(breaker_threshold, cooldown=breaker_cooldown)
+        self.set_parser(parser)
+        self.set_workers(workers)
+        self.set_stream(stream)
+        self.set_lang_seed(lang_seed)
+        self.set_identity_map(identity, max_size=identity_size)
+        self.set_bulk_workers(bulk_workers)
+
+    @staticmethod
+    def set_base(base):
+        """Change the address of the ``Good Reads`` server, e.g. to scrape a local mirror or a stand-in server.
+
+        Args:
+            base (string): address of the server, like ``https://www.goodreads.com``.
+
+        """
+        set_base(base)
 
     @staticmethod
     def set_user(user):
@@ -42,6 +115,7 @@ class GoodReads:
     @staticmethod
     def set_sleep(sleep):
         """Time before connecting again to a new page.
+        This is a shortcut for a rate limit of ``1 / sleep`` connections per second.
 
         Args:
             sleep (float): seconds to wait.
@@ -50,7 +124,204 @@ class GoodReads:
         set_sleep(sleep)
 
     @staticmethod
-    def search_author(author_id):
+    def set_rate_limit(rate, burst=1):
+        """Number of connections allowed per second on a host, shared by all threads and coroutines.
+
+        Args:
+            rate (float): connections per second. Set it to ``None`` to turn the limit off.
+            burst (int): number of connections that can start at once after an idle period.
+
+        """
+        set_rate_limit(rate, burst=burst)
+
+    @staticmethod
+    def set_cache(path, ttl=None, max_size=None):
+        """Save the pages on disk, so that they are not downloaded again.
+
+        Args:
+            path (string or bool): path of the cache directory (or ``True`` to use ``~/.cache/scrapereads``).
+                Set it to ``None`` to turn the cache off.
+            ttl (float): seconds a page stays in the cache. If ``None``, pages never expire.
+            max_size (int): maximum size of the cache, in bytes. Least recently used pages are removed first.
+
+        """
+        set_cache(path, ttl=ttl, max_size=max_size)
+
+    @staticmethod
+    def get_cache_stats():
+        """Get the number of cache hits, misses, pages revalidated with ``304 Not Modified``,
+        pages whose records were re-used without parsing, and bytes not downloaded thanks to the cache.
+
+        Returns:
+            dict
+
+        """
+        return get_cache_stats()
+
+    @staticmethod
+    def set_pool_size(pool_size):
+        """Number of keep-alive connections pooled for each host.
+
+        Args:
+            pool_size (int): maximum number of connections opened per host.
+
+        """
+        set_pool_size(pool_size)
+
+    @staticmethod
+    def set_compression(compress):
+        """Ask the servers for compressed pages (``gzip``, ``deflate``, and ``br`` if ``brotli`` is installed).
+
+        Args:
+            compress (bool): if ``False``, pages are downloaded uncompressed.
+
+        """
+        set_compression(compress)
+
+    @staticmethod
+    def get_transfer_stats():
+        """Get the number of bytes received over the wire, and once decoded.
+
+        Returns:
+            dict
+
+        """
+        return get_transfer_stats()
+
+    @staticmethod
+    def set_prefetch(prefetch):
+        """Number of pages fetched ahead of time, while browsing paginated quotes and books.
+
+        Args:
+            prefetch (int): number of next pages to fetch in advance. Set it to ``0`` to fetch pages one at a time.
+
+        """
+        set_prefetch(prefetch)
+
+    @staticmethod
+    def set_timeout(timeout):
+        """Time to wait for a server before giving up on a connection.
+
+        Args:
+            timeout (float): seconds to wait for the connection, and then between two received packets.
+                Set it to ``None`` to wait forever.
+
+        """
+        set_timeout(timeout)
+
+    @staticmethod
+    def set_retries(retries, backoff=0.5, max_backoff=60, jitter=0.5):
+        """Number of times a page is requested again after a transient failure (timeout, ``429``, ``503`` etc.).
+        The time between two attempts doubles each time, unless the server asks for more with ``Retry-After``.
+
+        Args:
+            retries (int): number of attempts after the first one. Set it to ``0`` to never retry.
+            backoff (float): seconds to wait before the first retry.
+            max_backoff (float): maximum number of seconds to wait between two attempts.
+            jitter (float): fraction of the wait drawn at random, so that threads do not retry all at once.
+
+        """
+        set_retries(retries, backoff=backoff, max_backoff=max_backoff, jitter=jitter)
+
+    @staticmethod
+    def set_circuit_breaker(threshold=0.5, window=20, cooldown=30):
+        """Pause all connections to a host when too many of them fail.
+
+        Args:
+            threshold (float): fraction of failed requests pausing the connections.
+                Set it to ``None`` to turn the circuit breaker off.
+            window (int): number of recent requests the failure rate is computed on.
+            cooldown (float): seconds to wait before connecting to the host again.
+
+        """
+        set_circuit_breaker(threshold=threshold, window=window, cooldown=cooldown)
+
+    @staticmethod
+    def set_parser(parser):
+        """Change the parser used to extract quotes and books from the pages.
+
+        Args:
+            parser (string): ``'bs4'`` (BeautifulSoup), or ``'lxml'`` (compiled XPath selectors, faster).
+                Both return the same data.
+
+        """
+        set_parser(parser)
+
+    @staticmethod
+    def set_workers(workers):
+        """Number of processes parsing the pages, while threads keep fetching the next ones.
+        Parsing is CPU-bound: with ``0`` workers, pages are parsed in the fetching threads, one at a time (GIL).
+        Workers are spawned, so scripts using them must be guarded with ``if __name__ == '__main__':``.
+
+        Args:
+            workers (int): number of parser processes, e.g. ``os.cpu_count()``. Set it to ``0`` to turn them off.
+
+        """
+        set_workers(workers)
+
+    @staticmethod
+    def set_stream(stream):
+        """Parse the first page of the quote and book lists while it is downloaded, so that its first items are
+        returned before the whole page is received. Pages are streamed with ``lxml``, whatever the parser.
+
+        Args:
+            stream (bool): if ``True``, stream the first page of the lists.
+
+        """
+        set_stream(stream)
+
+    @staticmethod
+    def set_lang_seed(seed):
+        """Make the language detection of ``get_quotes(lang=...)`` reproducible.
+
+        Args:
+            seed (int): seed of the detections. Set it to ``None`` for random detections.
+
+        """
+        lang.set_seed(seed)
+
+    @_client_method
+    def set_identity_map(self, enabled=True, max_size=10000):
+        """Remember the authors, books and quotes built by the client, so that repeated calls with the same ids
+        return the same objects, with what they already scraped, instead of connecting again.
+        Each client has its own map, and a new map forgets the objects remembered so far. Set on the class,
+        the map is used by the calls made on the class.
+        The objects are not refreshed: a call returns what was scraped by the first one, until the object is
+        forgotten (see ``max_size``). Use a client without a map to always get fresh data.
+
+        Args:
+            enabled (bool): if ``False``, each call builds new objects.
+            max_size (int): maximum number of authors, books and quotes remembered (of each kind).
+                The least recently used are forgotten first. If ``None``, all objects are remembered,
+                and a long-running process keeps all the pages it scraped in memory.
+
+        """
+        self.identity = IdentityMap(max_size=max_size) if enabled else None
+
+    @_client_method
+    def get_identity_stats(self):
+        """Get the number of authors, books and quotes re-used from the identity map of the client, built,
+        and forgotten.
+
+        Returns:
+            dict
+
+        """
+        return dict(self.identity.stats) if self.identity is not None else {}
+
+    @staticmethod
+    def set_bulk_workers(workers):
+        """Number of authors processed at the same time by ``get_authors()``, ``get_quotes_bulk()`` and
+        ``get_books_bulk()``. Their pages are fetched by the pool of connections (see ``set_pool_size()``).
+
+        Args:
+            workers (int): number of threads.
+
+        """
+        set_bulk_workers(workers)
+
+    @_client_method
+    def search_author(self, author_id):
         """Search an author from `Good Reads` server.
 
         Args:
@@ -60,11 +331,24 @@ class GoodReads:
             Author
 
         """
-        author = Author(author_id)
+        author = _get_author(author_id, self.identity)
         return author
 
-    @staticmethod
-    def search_book(author_id, book_id):
+    @_client_method
+    def search_authors(self, author_ids):
+        """Search several authors from `Good Reads` server, reading their names from their pages concurrently.
+
+        Args:
+            author_ids (list): ids of the authors to get.
+
+        Returns:
+            list(Author)
+
+        """
+        return resolve_author_names([_get_author(author_id, self.identity) for author_id in author_ids])
+
+    @_client_method
+    def search_book(self, author_id, book_id):
         """Search an book from `Good Reads` server.
 
         Args:
@@ -75,11 +359,11 @@ class GoodReads:
             Book
 
         """
-        author = Author(author_id)
+        author = _get_author(author_id, self.identity)
         return author.search_book(book_id)
 
-    @staticmethod
-    def search_books(author_id, top_k=10):
+    @_client_method
+    def search_books(self, author_id, top_k=10):
         """Search books in from an author.
 
         Args:
@@ -90,11 +374,11 @@ class GoodReads:
             list(Book)
 
         """
-        author = Author(author_id)
+        author = _get_author(author_id, self.identity)
         return author.get_books(top_k=top_k)
 
-    @staticmethod
-    def search_quotes(author_id, top_k=50):
+    @_client_method
+    def search_quotes(self, author_id, top_k=50):
         """Search quotes from `Good Reads` server.
 
         Args:
@@ -105,15 +389,15 @@ class GoodReads:
             Quote
 
         """
-        author = Author(author_id)
+        author = _get_author(author_id, self.identity)
         return author.get_quotes(top_k=top_k)
 
     @staticmethod
     def search_query(query):
         raise NotImplementedError
 
-    @staticmethod
-    def get_author(author_id, encode=None):
+    @_client_method
+    def get_author(self, author_id, encode=None):
         """Get an author in a JSON format.
 
         Args:
@@ -124,11 +408,11 @@ class GoodReads:
             dict
 
         """
-        author = Author(author_id)
+        author = _get_author(author_id, self.identity)
         return author.to_json(encode=encode)
 
-    @staticmethod
-    def get_quotes(author_id, top_k=10):
+    @_client_method
+    def get_quotes(self, author_id, top_k=10):
         """Get all quotes in a JSON format from an author.
 
         Args:
@@ -139,16 +423,16 @@ class GoodReads:
             list(dict)
 
         """
-        author = Author(author_id)
+        author = _get_author(author_id, self.identity)
         quotes = []
-        for i, quote in enumerate(author.quotes()):
+        for i, quote in enumerate(author.quotes(top_k=top_k)):
             quotes.append(quote.to_json())
             if top_k and i + 1 >= top_k:
                 return quotes
         return quotes
 
-    @staticmethod
-    def get_books(author_id, top_k=10):
+    @_client_method
+    def get_books(self, author_id, top_k=10):
         """Get all books in a JSON format from an author.
 
         Args:
@@ -159,10 +443,87 @@ class GoodReads:
             list(dict)
 
         """
-        author = Author(author_id)
+        author = _get_author(author_id, self.identity)
         books = []
-        for i, book in enumerate(author.books()):
+        for i, book in enumerate(author.books(top_k=top_k)):
             books.append(book.to_json())
             if top_k and i + 1 >= top_k:
                 return books
         return books
+
+    @_client_method
+    def get_authors(self, author_ids, encode=None, ordered=True):
+        """Get many authors in a JSON format, processed concurrently (see ``set_bulk_workers()``).
+        An author that fails is reported with its error, and does not stop the others.
+
+        Args:
+            author_ids (iterable): ids of the authors. Repeated ids are processed once.
+            encode (string): encode to ASCII format or not.
+            ordered (bool): if ``True``, authors are yielded in the order of ``author_ids``, else as soon as they
+                are ready.
+
+        Returns:
+            yield BulkResult: author id (``key``), author in a JSON format (``value``), and the exception raised
+            (``error``), if any.
+
+        """
+        return run_bulk(functools.partial(self.get_author, encode=encode), _unique(author_ids), ordered=ordered)
+
+    @_client_method
+    def get_quotes_bulk(self, author_ids, top_k=10, ordered=True):
+        """Get the quotes of many authors in a JSON format, processed concurrently (see ``set_bulk_workers()``).
+
+        Args:
+            author_ids (iterable): ids of the authors. Repeated ids are processed once.
+            top_k (int): number of quotes to retrieve per author.
+            ordered (bool): if ``True``, authors are yielded in the order of ``author_ids``, else as soon as they
+                are ready.
+
+        Returns:
+            yield BulkResult: author id (``key``), list of quotes in a JSON format (``value``), and the exception
+            raised (``error``), if any.
+
+        """
+        return run_bulk(functools.partial(self.get_quotes, top_k=top_k), _unique(author_ids), ordered=ordered)
+
+    @_client_method
+    def get_books_bulk(self, author_ids, top_k=10, ordered=True):
+        """Get the books of many authors in a JSON format, processed concurrently (see ``set_bulk_workers()``).
+
+        Args:
+            author_ids (iterable): ids of the authors. Repeated ids are processed once.
+            top_k (int): number of books to retrieve per author.
+            ordered (bool): if ``True``, authors are yielded in the order of ``author_ids``, else as soon as they
+                are ready.
+
+        Returns:
+            yield BulkResult: author id (``key``), list of books in a JSON format (``value``), and the exception
+            raised (``error``), if any.
+
+        """
+        return run_bulk(functools.partial(self.get_books, top_k=top_k), _unique(author_ids), ordered=ordered)
+
+    @_client_method
+    def crawl_authors(self, seeds, max_depth=None, max_authors=None, priority=None, workers=None, checkpoint=None,
+                      checkpoint_every=100):
+        """Discover authors by walking the graph of similar authors, breadth-first or by priority.
+        Each author is visited once. With a checkpoint, the crawl is saved regularly and resumed from the file
+        if it exists.
+
+        Args:
+            seeds (list): authors (or their ids) to start from.
+            max_depth (int): maximum number of links from the seed authors.
+            max_authors (int): maximum number of authors visited.
+            priority (callable): function ``priority(author_id, depth, rank)`` ordering the authors to visit,
+                the lowest first. If ``None``, authors are visited breadth-first.
+            workers (int): number of authors visited at the same time. Default to the size of the connection pool.
+            checkpoint (string): path of the file saving the crawl.
+            checkpoint_every (int): number of authors visited between two saves.
+
+        Returns:
+            yield Visit: author visited, its depth, and its similar authors.
+
+        """
+        crawler = Crawler(seeds, max_depth=max_depth, max_authors=max_authors, priority=priority, workers=workers,
+                          checkpoint=checkpoint, checkpoint_every=checkpoint_every, identity=self.identity)
+        return crawler.crawl()
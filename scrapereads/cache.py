@@ -0,0 +1,254 @@
+"""
+Persistent on-disk cache of ``Good Reads`` pages, so that crawls can be re-run without connecting again.
+Pages are stored compressed in a SQLite database, with a time-to-live and a maximum size (least recently used
+pages are evicted first).
+Expired pages are kept with their validators (``ETag`` / ``Last-Modified``), so they can be revalidated.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'scrapereads')
+
+COLUMNS = [
+    ('url', 'TEXT PRIMARY KEY'),
+    ('body', 'BLOB'),
+    ('size', 'INTEGER'),
+    ('created', 'REAL'),
+    ('accessed', 'REAL'),
+    ('etag', 'TEXT'),
+    ('last_modified', 'TEXT'),
+    ('kind', 'TEXT'),
+    ('records', 'BLOB'),
+]
+
+CacheEntry = namedtuple('CacheEntry', ['body', 'etag', 'last_modified', 'fresh'])
+
+
+def cache_path(path=None):
+    """Get the path of the database of a cache.
+
+    Args:
+        path (string, optional): path of the database, or of its directory. Default to ``CACHE_DIR``.
+
+    Returns:
+        string
+
+    """
+    path = path or CACHE_DIR
+    if os.path.isdir(path) or not os.path.splitext(path)[1]:
+        path = os.path.join(path, 'pages.db')
+    return path
+
+
+class DiskCache:
+    """Cache of page bodies keyed by URL.
+
+    * :attr:`path`: path of the SQLite database.
+
+    * :attr:`ttl`: seconds a page stays fresh. ``None`` keeps pages forever.
+
+    * :attr:`max_size`: maximum size (in bytes, compressed) of all the pages and their records.
+      ``None`` does not limit the size.
+
+    * :attr:`stats`: number of cache hits, misses, pages revalidated (``304 Not Modified``), records re-used
+      without parsing the page again, and bytes not downloaded thanks to the cache.
+
+    Examples::
+        >>> cache = DiskCache('goodreads.db', ttl=24 * 3600, max_size=256 * 1024 ** 2)
+        >>> cache.set('https://www.goodreads.com/author/show/3389', b'<html>...</html>')
+        >>> cache.get('https://www.goodreads.com/author/show/3389')
+            b'<html>...</html>'
+
+    """
+
+    def __init__(self, path=None, ttl=None, max_size=None, level=6):
+        path = cache_path(path)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        self.level = level
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'records': 0, 'bytes_saved': 0}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS pages ('
+                         + ', '.join(f'{name} {kind}' for name, kind in COLUMNS) + ')')
+        # Caches created by older versions miss some columns
+        existing = [row[1] for row in self._db.execute('PRAGMA table_info(pages)')]
+        for name, kind in COLUMNS:
+            if name not in existing:
+                self._db.execute(f'ALTER TABLE pages ADD COLUMN {name} {kind}')
+        self._db.execute('CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed)')
+        self._size = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+
+    @property
+    def size(self):
+        """Size (in bytes, compressed) of all the cached pages."""
+        return self._size
+
+    def _is_fresh(self, created):
+        return self.ttl is None or time.time() - created < self.ttl
+
+    def count(self, key, value=1):
+        with self._lock:
+            self.stats[key] += value
+
+    def lookup(self, url):
+        """Get a page from the cache, even if it expired.
+
+        Args:
+            url (string): url of the page.
+
+        Returns:
+            CacheEntry: body, validators and freshness of the page, or ``None`` if the page is not cached.
+
+        """
+        with self._lock:
+            row = self._db.execute('SELECT body, created, etag, last_modified FROM pages WHERE url = ?',
+                                   (url,)).fetchone()
+            if row is None or not self._is_fresh(row[1]):
+                self.stats['misses'] += 1
+            else:
+                self._db.execute('UPDATE pages SET accessed = ? WHERE url = ?', (time.time(), url))
+                self.stats['hits'] += 1
+        if row is None:
+            return None
+        body = zlib.decompress(row[0])
+        fresh = self._is_fresh(row[1])
+        if fresh:
+            self.count('bytes_saved', len(body))
+        return CacheEntry(body, row[2], row[3], fresh)
+
+    def get(self, url):
+        """Get a fresh page from the cache.
+
+        Args:
+            url (string): url of the page.
+
+        Returns:
+            bytes: body of the page, or ``None`` if the page is not cached or expired.
+
+        """
+        entry = self.lookup(url)
+        if entry is None or not entry.fresh:
+            return None
+        return entry.body
+
+    def set(self, url, body, etag=None, last_modified=None):
+        """Save a page in the cache, evicting the least recently used pages if the cache is full.
+        Records previously extracted from the page are dropped.
+
+        Args:
+            url (string): url of the page.
+            body (bytes): body of the page.
+            etag (string, optional): ``ETag`` header of the page.
+            last_modified (string, optional): ``Last-Modified`` header of the page.
+
+        """
+        data = zlib.compress(body, self.level)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute('SELECT size FROM pages WHERE url = ?', (url,)).fetchone()
+            self._db.execute('INSERT OR REPLACE INTO pages (url, body, size, created, accessed, etag, last_modified) '
+                             'VALUES (?, ?, ?, ?, ?, ?, ?)', (url, data, len(data), now, now, etag, last_modified))
+            self._size += len(data) - (row[0] if row else 0)
+            self._evict()
+
+    def revalidate(self, url, size=0):
+        """Mark an expired page as fresh again, after the server answered ``304 Not Modified``.
+
+        Args:
+            url (string): url of the page.
+            size (int, optional): size of the body that did not need to be downloaded.
+
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute('UPDATE pages SET created = ?, accessed = ? WHERE url = ?', (now, now, url))
+            self.stats['not_modified'] += 1
+            self.stats['bytes_saved'] += size
+
+    def get_records(self, url, kind):
+        """Get the records extracted from a cached page, so that the page is not parsed again.
+
+        Args:
+            url (string): url of the page.
+            kind (string): name of the extractor used on the page.
+
+        Returns:
+            object: records, or ``None`` if they were not saved (or if the page changed since).
+
+        """
+        with self._lock:
+            row = self._db.execute('SELECT records FROM pages WHERE url = ? AND kind = ?', (url, kind)).fetchone()
+            if row is None or row[0] is None:
+                return None
+            self.stats['records'] += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def set_records(self, url, kind, records):
+        """Save the records extracted from a cached page.
+
+        Args:
+            url (string): url of the page.
+            kind (string): name of the extractor used on the page.
+            records (object): JSON serializable records.
+
+        """
+        data = zlib.compress(json.dumps(records).encode('utf-8'), self.level)
+        with self._lock:
+            row = self._db.execute('SELECT LENGTH(records) FROM pages WHERE url = ?', (url,)).fetchone()
+            if row is None:
+                return None
+            size = len(data) - (row[0] or 0)
+            self._db.execute('UPDATE pages SET kind = ?, records = ?, size = size + ? WHERE url = ?',
+                             (kind, data, size, url))
+            self._size += size
+            self._evict()
+
+    def _evict(self):
+        if self.max_size is None or self._size <= self.max_size:
+            return None
+        cursor = self._db.execute('SELECT url, size FROM pages ORDER BY accessed')
+        evicted = []
+        for url, size in cursor:
+            if self._size <= self.max_size:
+                break
+            evicted.append((url,))
+            self._size -= size
+        cursor.close()
+        self._db.executemany('DELETE FROM pages WHERE url = ?', evicted)
+
+    def __contains__(self, url):
+        with self._lock:
+            row = self._db.execute('SELECT created FROM pages WHERE url = ?', (url,)).fetchone()
+        return row is not None and self._is_fresh(row[0])
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+
+    def clear(self):
+        """Remove all pages from the cache."""
+        with self._lock:
+            self._db.execute('DELETE FROM pages')
+            self._size = 0
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {key: 0 for key in self.stats}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __repr__(self):
+        rep = f'DiskCache(path={self.path!r}, ttl={self.ttl}, max_size={self.max_size})'
+        return rep
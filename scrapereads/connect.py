@@ -5,18 +5,75 @@ A scrapper is used to connect to a website and extract data.
 # import libraries
 import warnings
 import bs4
-import urllib.request
+import functools
+import itertools
+import multiprocessing
+import queue
+import threading
 import time
+import urllib3
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, ProcessPoolExecutor, wait
+
+from .session import Session
+from .ratelimit import RateLimiter
+from .cache import DiskCache, cache_path
+from .retry import Backoff, CircuitBreaker, RETRY_STATUSES, parse_retry_after
+from . import parsers
+from .parsers import SoupParser, get_parser
 
 # Global variables
+BASE = 'https://www.goodreads.com'
 SLEEP = 0
 VERBOSE = True
 USER = 'Mozilla/5.0 (Windows; U; Windows NT 5.1; en-US; rv:1.9.0.7) Gecko/2009021910 Firefox/3.0.7'
+POOL_SIZE = 10
+PREFETCH = 4
+COMPRESS = True
+SESSION = None
+EXECUTOR = None
+LIMITER = RateLimiter()
+CACHE = None
+TIMEOUT = 30
+BACKOFF = Backoff()
+BREAKER = CircuitBreaker()
+PARSER = SoupParser()
+WORKERS = 0
+WORKER_POOL = None
+STREAM = False
+BULK_WORKERS = 8
+BULK_EXECUTOR = None
+_SESSION_LOCK = threading.Lock()
+
+
+def set_base(value):
+    global BASE
+    BASE = value.rstrip('/')
+
+
+def get_base():
+    """Get the address of the ``Good Reads`` server, e.g. ``https://www.goodreads.com``.
+
+    Returns:
+        string
+
+    """
+    return BASE
 
 
 def set_sleep(value):
     global SLEEP
     SLEEP = value
+    # One connection every ``SLEEP`` seconds, per host
+    set_rate_limit(1 / value if value else None, burst=1)
+
+
+def set_rate_limit(rate, burst=1):
+    global LIMITER
+    # Unchanged, the limiter keeps the tokens taken by the workers
+    if (rate, burst) == (LIMITER.rate, LIMITER.burst):
+        return
+    LIMITER = RateLimiter(rate=rate, burst=burst)
 
 
 def set_verbose(value):
@@ -30,37 +87,580 @@ def set_user(user):
         USER = user
 
 
-def connect(url):
-    """Connect to an URL.
+def set_cache(path=None, ttl=None, max_size=None):
+    global CACHE
+    # A falsy path turns the cache off, ``True`` uses the default cache directory
+    path = None if path is True else path or False
+    if CACHE is not None and path is not False and (CACHE.path, CACHE.ttl, CACHE.max_size) == \
+            (cache_path(path), ttl, max_size):
+        # Unchanged, the cache keeps its connection and stats
+        return
+    if CACHE is not None:
+        CACHE.close()
+    CACHE = DiskCache(path=path, ttl=ttl, max_size=max_size) if path is not False else None
+
+
+def set_timeout(value):
+    global TIMEOUT
+    TIMEOUT = value
+
+
+def set_retries(retries, backoff=0.5, max_backoff=60, jitter=0.5):
+    global BACKOFF
+    BACKOFF = Backoff(retries=retries, backoff=backoff, max_backoff=max_backoff, jitter=jitter)
+
+
+def set_circuit_breaker(threshold=0.5, window=20, cooldown=30):
+    global BREAKER
+    BREAKER = CircuitBreaker(threshold=threshold, window=window, cooldown=cooldown)
+
+
+def set_parser(name):
+    global PARSER
+    if name == PARSER.name:
+        return
+    PARSER = get_parser(name)
+
+
+def set_workers(value):
+    global WORKERS
+    if value == WORKERS:
+        return
+    WORKERS = value
+    # The next page will be parsed by a new pool with the updated size
+    close_workers()
+
+
+def set_bulk_workers(value):
+    global BULK_WORKERS, BULK_EXECUTOR
+    if value == BULK_WORKERS:
+        return
+    BULK_WORKERS = value
+    # The next bulk call will start a new pool with the updated size, while the calls queued on the old one drain
+    with _SESSION_LOCK:
+        executor = BULK_EXECUTOR
+        BULK_EXECUTOR = None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def set_stream(value):
+    global STREAM
+    STREAM = value
+
+
+def get_cache_stats():
+    """Get the number of cache hits, misses, revalidated pages and bytes saved.
+
+    Returns:
+        dict
+
+    """
+    return dict(CACHE.stats) if CACHE is not None else {}
+
+
+def set_pool_size(value):
+    global POOL_SIZE
+    if value == POOL_SIZE:
+        return
+    POOL_SIZE = value
+    # The next connection will open a new pool with the updated size
+    close_session()
+
+
+def set_compression(value):
+    global COMPRESS
+    if value == COMPRESS:
+        return
+    COMPRESS = value
+    # The next connection will open a new session with the updated headers
+    close_session()
+
+
+def get_transfer_stats():
+    """Get the number of bytes received over the wire (``compressed``) and once decoded (``uncompressed``),
+    since the session was opened.
+
+    Returns:
+        dict
+
+    """
+    session = SESSION
+    return dict(session.stats) if session is not None else {'compressed': 0, 'uncompressed': 0}
+
+
+def set_prefetch(value):
+    global PREFETCH
+    PREFETCH = value
+
+
+def get_session():
+    """Get the shared keep-alive session, used by all connections.
+
+    Returns:
+        Session
+
+    """
+    global SESSION
+    with _SESSION_LOCK:
+        if SESSION is None:
+            SESSION = Session(pool_size=POOL_SIZE, compress=COMPRESS)
+        return SESSION
+
+
+def close_session():
+    """Close the pooled connections of the shared session, and retire the threads fetching pages ahead of time.
+    The next connection opens a new session and new threads. Pages already queued by other threads (e.g. a
+    ``connect_pages()`` being iterated) are still fetched, and connections in use are closed once released.
+    """
+    global SESSION, EXECUTOR
+    with _SESSION_LOCK:
+        session, executor = SESSION, EXECUTOR
+        SESSION = None
+        EXECUTOR = None
+    if session is not None:
+        session.close()
+    if executor is not None:
+        # Let the queued fetches drain, the threads stop once they are done
+        executor.shutdown(wait=False)
+
+
+def get_executor():
+    """Get the pool of threads used to fetch pages ahead of time.
+
+    Returns:
+        concurrent.futures.ThreadPoolExecutor
+
+    """
+    global EXECUTOR
+    with _SESSION_LOCK:
+        if EXECUTOR is None:
+            # More threads than pooled connections would only wait for a free connection
+            EXECUTOR = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix='scrapereads')
+        return EXECUTOR
+
+
+def get_bulk_executor():
+    """Get the pool of threads running the calls of a bulk request (see ``run_bulk()``).
+    It is separate from the pool fetching the pages, which the calls use themselves.
+
+    Returns:
+        concurrent.futures.ThreadPoolExecutor
+
+    """
+    global BULK_EXECUTOR
+    with _SESSION_LOCK:
+        if BULK_EXECUTOR is None:
+            BULK_EXECUTOR = ThreadPoolExecutor(max_workers=BULK_WORKERS, thread_name_prefix='scrapereads-bulk')
+        return BULK_EXECUTOR
+
+
+def get_worker_pool():
+    """Get the pool of processes parsing the pages, so that parsing is not serialized by the GIL.
+
+    Returns:
+        concurrent.futures.ProcessPoolExecutor: pool of ``WORKERS`` processes, or ``None`` if ``WORKERS`` is ``0``
+        (pages are then parsed in the thread that fetched them).
+
+    """
+    global WORKER_POOL
+    with _SESSION_LOCK:
+        if WORKER_POOL is None and WORKERS:
+            # Spawn the workers instead of forking, as the fetching threads may hold locks
+            WORKER_POOL = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context('spawn'))
+        return WORKER_POOL
+
+
+def close_workers():
+    """Shut down the parser processes."""
+    global WORKER_POOL
+    with _SESSION_LOCK:
+        if WORKER_POOL is not None:
+            WORKER_POOL.shutdown(wait=True)
+            WORKER_POOL = None
+
+
+def extract_records(extract, body, only=None):
+    """Extract records from the body of a page, in a parser process if ``WORKERS`` is set.
+    Only the body and the records (plain data) are sent between processes.
+
+    Args:
+        extract (callable): function extracting JSON serializable records from a soup.
+        body (bytes): content of the page.
+        only (bs4.SoupStrainer, optional): if provided, only the matching parts of the page are parsed.
+
+    Returns:
+        object: records returned by ``extract``.
+
+    """
+    pool = get_worker_pool()
+    if pool is None:
+        return PARSER.extract(extract, body, only=only)
+    return pool.submit(PARSER.extract, extract, body, only).result()
+
+
+def is_cached(url):
+    """Check if a fresh version of a page is saved in the cache.
+
+    Args:
+        url (string): url path.
+
+    Returns:
+        bool
+
+    """
+    return CACHE is not None and url in CACHE
+
+
+def _records_kind(extract):
+    # Key of the records extracted from a page, in the cache
+    return f'{extract.__module__}.{extract.__name__}'
+
+
+def _feed_chunks(chunks, feed):
+    for chunk in chunks:
+        feed.feed(chunk)
+        yield chunk
+
+
+def fetch(url, limit=True, feed=None):
+    """Get the content of a page, from the cache if it is saved, else from the server.
+    If the cached page expired, it is revalidated with the server (and not downloaded again if it did not change).
+    Transient failures (timeouts, ``429``, ``503`` etc.) are retried with an exponential backoff.
+    The circuit breaker records a single outcome per page, once it is loaded or all its attempts failed.
 
     Args:
         url (string): url path
-        sleep (float): number of seconds to sleep before connection.
-        verbose (bool): print the url if ``True``.
+        limit (bool, optional): if ``True``, wait for the rate limiter of the host before connecting.
+        feed (object, optional): if provided, the chunks of the page are passed to ``feed.feed(chunk)`` while they
+            are downloaded. ``feed.reset()`` is called before each download, as a download can be tried again.
+            Pages loaded from the cache are not fed.
 
     Returns:
-        soup
+        bytes: body of the page, or ``None`` if the page could not be loaded.
 
     """
-    # Slow down the script to bypass bot detections
-    time.sleep(SLEEP)
+    entry = None
+    if CACHE is not None:
+        entry = CACHE.lookup(url)
+        if entry is not None and entry.fresh:
+            if VERBOSE:
+                print(f"Loaded {url} from the cache")
+            return entry.body
 
     # Prevent ERROR: 403 - Forbidden
     # user_agent = 'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)'
     # user_agent = 'Mozilla/5.0'
     headers = {'User-Agent': USER}
+    # Ask the server to send the page only if it changed
+    if entry is not None and entry.etag:
+        headers['If-None-Match'] = entry.etag
+    if entry is not None and entry.last_modified:
+        headers['If-Modified-Since'] = entry.last_modified
 
-    try:
-        req = urllib.request.Request(url, headers=headers)
-        page = urllib.request.urlopen(req)
-        soup = bs4.BeautifulSoup(page, 'lxml')
+    attempt = 0
+    while True:
+        # Wait while the host is failing, then slow down the script to bypass bot detections
+        BREAKER.wait(url)
+        if limit or attempt:
+            LIMITER.acquire(url)
+        retry_after = None
+        try:
+            session = get_session()
+            page = session.request(url, headers=headers, timeout=TIMEOUT, stream=True)
+            # Decode the page while it is downloaded
+            chunks = session.iter_content(page)
+            if feed is not None and page.status == 200:
+                feed.reset()
+                chunks = _feed_chunks(chunks, feed)
+            body = b''.join(chunks)
+        except urllib3.exceptions.HTTPError as error:
+            # Timeouts and dropped connections are wrapped in a ``MaxRetryError``, as retries are handled here
+            error = getattr(error, 'reason', None) or error
+            reason = f'{type(error).__name__}: {error}'
+        else:
+            if page.status not in RETRY_STATUSES:
+                break
+            reason = f'HTTP Error {page.status}: {page.reason}'
+            retry_after = parse_retry_after(page.headers.get('Retry-After'))
+
+        # Transient failure: try again later, unless all the attempts failed
+        if attempt >= BACKOFF.retries:
+            BREAKER.record(url, success=False)
+            warn_msg = f'\n{reason}. Failed to connect to {url} after {attempt + 1} attempt(s). `None` was returned.'
+            warnings.warn(warn_msg, RuntimeWarning)
+            return None
+        delay = BACKOFF.delay(attempt, retry_after=retry_after)
+        if retry_after:
+            # The server asked to slow down: pause all the workers, not only this one
+            BREAKER.pause(url, retry_after)
+        if VERBOSE:
+            print(f"{reason}. Connecting again to {url} in {delay:.2f}s")
+        time.sleep(delay)
+        attempt += 1
+
+    BREAKER.record(url, success=True)
+    if page.status == 304 and entry is not None:
+        body = entry.body
+        CACHE.revalidate(url, size=len(body))
+        if VERBOSE:
+            print(f"Revalidated {url} from the cache")
+
+    elif page.status < 400:
+        if CACHE is not None:
+            CACHE.set(url, body, etag=page.headers.get('ETag'), last_modified=page.headers.get('Last-Modified'))
         if VERBOSE:
             print(f"Successfully connected to {url}")
 
-    except urllib.error.HTTPError as e:
-        warn_msg = f'\n{e}. Failed to connect to {url}.\n' \
+    else:
+        warn_msg = f'\nHTTP Error {page.status}: {page.reason}. Failed to connect to {url}.\n' \
                    f'Please verify the spelling or make sure that this page exists. `None` was returned.'
         warnings.warn(warn_msg, RuntimeWarning)
-        soup = None
+        body = None
+
+    return body
+
+
+def connect(url, limit=True, only=None):
+    """Connect to an URL.
+
+    Args:
+        url (string): url path
+        limit (bool, optional): if ``True``, wait for the rate limiter of the host before connecting.
+        only (bs4.SoupStrainer, optional): if provided, only the matching parts of the page are parsed,
+            which is faster and lighter than building the whole tree.
+
+    Returns:
+        soup
+
+    """
+    body = fetch(url, limit=limit)
+    if body is None:
+        return None
+    return bs4.BeautifulSoup(body, 'lxml', parse_only=only)
+
+
+def connect_records(url, extract, limit=True, only=None):
+    """Connect to an URL and extract records from the page.
+    If the page is cached and did not change, the records extracted the last time are re-used without parsing.
+
+    Args:
+        url (string): url path.
+        extract (callable): function extracting JSON serializable records from a soup.
+        limit (bool, optional): if ``True``, wait for the rate limiter of the host before connecting.
+        only (bs4.SoupStrainer, optional): if provided, only the matching parts of the page are parsed.
+
+    Returns:
+        object: records returned by ``extract``.
+
+    """
+    body = fetch(url, limit=limit)
+    if body is None:
+        return None
+    kind = _records_kind(extract)
+    if CACHE is not None:
+        records = CACHE.get_records(url, kind)
+        if records is not None:
+            return records
+    records = extract_records(extract, body, only=only)
+    if CACHE is not None:
+        CACHE.set_records(url, kind, records)
+    return records
+
+
+class PageStream:
+    """Items of a list page, yielded while the page is downloaded.
+    The page is downloaded in a thread of the executor, and its chunks are fed to an incremental parser
+    (see ``xpath.ItemStream``): each item is yielded as soon as its closing tag is received.
+    If streaming is disabled (see ``set_stream()``), if the extractor has no incremental version, or if the page is
+    cached, the page is loaded with ``connect_records()`` and its items are yielded at once.
+
+    * :attr:`url`: url path of the page.
 
-    return soup
+    * :attr:`records`: records of the whole page (as returned by ``connect_records()``), once all the items were
+        yielded. ``None`` if the page could not be loaded.
+
+    """
+
+    def __init__(self, url, extract, limit=True, only=None):
+        self.url = url
+        self.extract = extract
+        self.limit = limit
+        self.only = only
+        self.records = None
+        self._stream = None
+        self._future = None
+        stream = parsers.get_stream(extract)
+        if STREAM and stream is not None and not is_cached(url):
+            self._stream = stream()
+            self._queue = queue.Queue()
+            self._emitted = 0
+            self._received = 0
+            self._future = get_executor().submit(self._download)
+
+    def _put(self, records):
+        for record in records:
+            self._queue.put(record)
+        self._emitted += len(records)
+
+    def reset(self):
+        self._received = 0
+        if self._stream is not None:
+            self._stream.reset()
+
+    def feed(self, chunk):
+        self._received += len(chunk)
+        if self._stream is None:
+            return
+        try:
+            self._put(self._stream.feed(chunk))
+        except parsers.xpath.UnsupportedMarkup:
+            # Extract the rest of the page once it is downloaded
+            self._stream = None
+
+    def _download(self):
+        try:
+            body = fetch(self.url, limit=self.limit, feed=self)
+            if body is None:
+                return None
+            records = None
+            if self._received and self._stream is not None:
+                try:
+                    self._put(self._stream.close())
+                    records = self._stream.page
+                except parsers.xpath.UnsupportedMarkup:
+                    pass
+            if records is None and not self._received and CACHE is not None:
+                # The page did not change since it was cached
+                records = CACHE.get_records(self.url, _records_kind(self.extract))
+            if records is None:
+                records = extract_records(self.extract, body, only=self.only)
+            self._put(records['items'][self._emitted:])
+            if CACHE is not None:
+                CACHE.set_records(self.url, _records_kind(self.extract), records)
+            return records
+        finally:
+            self._queue.put(self)
+
+    def __iter__(self):
+        if self._future is None:
+            self.records = connect_records(self.url, self.extract, limit=self.limit, only=self.only)
+            if self.records is not None:
+                yield from self.records['items']
+            return None
+        while True:
+            record = self._queue.get()
+            # The stream puts itself in the queue once the page is done
+            if record is self:
+                break
+            yield record
+        self.records = self._future.result()
+
+    def __repr__(self):
+        rep = f'{self.__class__.__name__}(url={self.url!r}, streaming={self._future is not None})'
+        return rep
+
+
+def connect_stream(url, extract, limit=True, only=None):
+    """Connect to an URL, and yield the items of the page while it is downloaded (see ``PageStream``).
+
+    Args:
+        url (string): url path.
+        extract (callable): function extracting the records and the number of pages from a page.
+        limit (bool, optional): if ``True``, wait for the rate limiter of the host before connecting.
+        only (bs4.SoupStrainer, optional): if provided, only the matching parts of the page are parsed
+            when the page is not streamed.
+
+    Returns:
+        PageStream
+
+    """
+    return PageStream(url, extract, limit=limit, only=only)
+
+
+def connect_pages(urls, extract=None, prefetch=None, only=None):
+    """Connect to successive URLs, fetching the next ``PREFETCH`` pages while the current one is processed.
+    Pages are yielded in the same order as ``urls``.
+    Closing the generator (e.g. after an empty page) cancels the fetches that are still pending.
+
+    Args:
+        urls (iterable): url paths, possibly infinite.
+        extract (callable, optional): if provided, records are extracted from the pages (see ``connect_records()``).
+        prefetch (int, optional): number of pages to fetch in advance. Default to ``PREFETCH``.
+        only (bs4.SoupStrainer, optional): if provided, only the matching parts of the pages are parsed.
+
+    Returns:
+        yield soup, or records if ``extract`` is provided
+
+    """
+    prefetch = PREFETCH if prefetch is None else prefetch
+    load = functools.partial(connect_records, extract=extract, only=only) if extract \
+        else functools.partial(connect, only=only)
+    urls = iter(urls)
+    if prefetch < 1:
+        yield from map(load, urls)
+        return
+
+    futures = deque()
+    try:
+        # Submit to the current executor, as it is replaced when the session is closed
+        for url in urls:
+            futures.append(get_executor().submit(load, url))
+            if len(futures) > prefetch:
+                break
+        while futures:
+            page = futures.popleft().result()
+            # Keep the look-ahead window full
+            url = next(urls, None)
+            if url is not None:
+                futures.append(get_executor().submit(load, url))
+            yield page
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+BulkResult = namedtuple('BulkResult', ['key', 'value', 'error'])
+
+
+def _run_task(task, key):
+    # Failures are reported with their key, so that the other calls go on
+    try:
+        return BulkResult(key, task(key), None)
+    except Exception as error:
+        return BulkResult(key, None, error)
+
+
+def run_bulk(task, keys, ordered=True):
+    """Call a function on many keys (e.g. author ids), ``BULK_WORKERS`` calls at a time.
+    Keys are read lazily, and only a few more calls than workers are queued, so ``keys`` can be a long iterator.
+    Closing the generator cancels the calls that did not start.
+
+    Args:
+        task (callable): function taking a key.
+        keys (iterable): keys to call the function on.
+        ordered (bool): if ``True``, results are yielded in the order of ``keys``, else as soon as they are ready.
+
+    Returns:
+        yield BulkResult: key, value returned by ``task`` (or ``None``), and exception raised by ``task``
+        (or ``None``).
+
+    """
+    window = 2 * BULK_WORKERS
+    keys = iter(keys)
+    futures = deque(get_bulk_executor().submit(_run_task, task, key) for key in itertools.islice(keys, window))
+    try:
+        while futures:
+            if ordered:
+                done = [futures.popleft()]
+            else:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                futures = deque(future for future in futures if future not in done)
+            # Keep the window of queued calls full
+            for key in itertools.islice(keys, len(done)):
+                futures.append(get_bulk_executor().submit(_run_task, task, key))
+            for future in done:
+                yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
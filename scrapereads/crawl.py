@@ -0,0 +1,296 @@
+"""
+Crawl the graph of similar authors, starting from a few authors, to discover new ones.
+Authors are visited breadth-first or in the order of a priority, a few at a time, and each author is visited once:
+the authors already seen are kept in a Bloom filter, which takes a few bytes per author.
+The crawl can be saved to disk and resumed later, without visiting the authors again.
+"""
+
+import base64
+import hashlib
+import heapq
+import json
+import math
+import os
+import zlib
+from collections import deque, namedtuple
+
+from . import connect, scrape
+from .decode import decode_id
+from .reads import Author
+from .reads.author import get_shared_author
+
+Visit = namedtuple('Visit', ['author', 'depth', 'similar'])
+
+
+class BloomFilter:
+    """Set of keys in a fixed number of bits. A key that was added is always found, but a key that was not added
+    may be found too, with a probability of :attr:`error_rate` once :attr:`capacity` keys are added.
+
+    * :attr:`capacity`: number of keys expected.
+
+    * :attr:`error_rate`: probability of false positives at capacity.
+
+    * :attr:`num_bits`: size of the filter, in bits.
+
+    * :attr:`num_hashes`: number of bits set for each key.
+
+    Examples::
+        >>> seen = BloomFilter(capacity=1000000, error_rate=1e-4)
+        >>> seen.add(3389)
+            True
+        >>> 3389 in seen
+            True
+
+    """
+
+    def __init__(self, capacity=1000000, error_rate=1e-4):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key):
+        # Double hashing: the bits of a key are spread by two independent halves of one digest
+        digest = hashlib.blake2b(str(key).encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * step) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        """Add a key.
+
+        Args:
+            key (object): key, compared as a string.
+
+        Returns:
+            bool: ``True`` if the key was not in the filter (up to false positives).
+
+        """
+        added = False
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] & (1 << bit):
+                self._bits[byte] |= 1 << bit
+                added = True
+        self.count += added
+        return added
+
+    def __contains__(self, key):
+        return all(self._bits[position // 8] & (1 << (position % 8)) for position in self._positions(key))
+
+    def __len__(self):
+        return self.count
+
+    def to_json(self):
+        """Encode the filter to a JSON format, with its bits compressed.
+
+        Returns:
+            dict
+
+        """
+        return {
+            'capacity': self.capacity,
+            'error_rate': self.error_rate,
+            'count': self.count,
+            'bits': base64.b64encode(zlib.compress(bytes(self._bits))).decode('ascii'),
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        """Construct the filter from its JSON format (see ``to_json()``).
+
+        Args:
+            data (dict): encoded filter.
+
+        Returns:
+            BloomFilter
+
+        """
+        bloom = cls(capacity=data['capacity'], error_rate=data['error_rate'])
+        bloom.count = data['count']
+        bloom._bits = bytearray(zlib.decompress(base64.b64decode(data['bits'])))
+        return bloom
+
+    def __repr__(self):
+        rep = f'BloomFilter(capacity={self.capacity}, error_rate={self.error_rate}, count={self.count})'
+        return rep
+
+
+def _author_page(author):
+    # Page name of an author (``'3389.Stephen_King'``), or its id alone if its name is not known yet
+    if isinstance(author, Author):
+        return author.href.split('/')[-1]
+    return str(author)
+
+
+def _page_author(page, identity=None):
+    if '.' in page:
+        return Author.from_url(page, identity=identity)
+    return get_shared_author(identity, decode_id(page))
+
+
+class Crawler:
+    """Walk of the graph of similar authors (see ``Author.get_similar_authors()``).
+    Authors are visited breadth-first, or from the lowest :attr:`priority` first, :attr:`workers` at a time.
+
+    * :attr:`max_depth`: maximum number of links from the seed authors. ``None`` does not limit the depth.
+
+    * :attr:`max_authors`: maximum number of authors visited, including the ones visited before a resume.
+      ``None`` does not limit the crawl.
+
+    * :attr:`priority`: function ``priority(author_id, depth, rank)`` ordering the authors to visit,
+      ``rank`` being the position of the author among the similar authors of the one linking to it.
+      ``None`` visits the authors breadth-first.
+
+    * :attr:`workers`: number of authors visited at the same time. Default to the size of the connection pool.
+      A page is requested as soon as one is received, so that a slow page does not hold back the others.
+
+    * :attr:`checkpoint`: path of the file where the crawl is saved, and resumed from if it exists.
+
+    * :attr:`checkpoint_every`: number of authors visited between two saves.
+
+    * :attr:`identity`: identity map of the client, returning the authors it already built. ``None`` builds new
+      authors.
+
+    * :attr:`stats`: number of authors visited, and of authors whose page could not be loaded.
+
+    Examples::
+        >>> crawler = Crawler([3389], max_depth=2, checkpoint='crawl.json')
+        >>> for visit in crawler.crawl():
+        ...     print(visit.depth, visit.author, len(visit.similar))
+
+    """
+
+    def __init__(self, seeds, max_depth=None, max_authors=None, priority=None, workers=None, checkpoint=None,
+                 checkpoint_every=100, capacity=1000000, error_rate=1e-4, identity=None):
+        self.max_depth = max_depth
+        self.max_authors = max_authors
+        self.priority = priority
+        self.workers = workers
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.identity = identity
+        self.stats = {'visited': 0, 'failed': 0}
+        # Authors to visit, as ``[priority, order of discovery, depth, page name]``
+        self._frontier = []
+        # Authors whose page is requested but not visited yet, in the order of the requests
+        self._inflight = deque()
+        self._order = 0
+        self._saved = 0
+        if checkpoint and os.path.exists(checkpoint):
+            self.load(checkpoint)
+        else:
+            self._seen = BloomFilter(capacity=capacity, error_rate=error_rate)
+            for rank, seed in enumerate(seeds):
+                page = _author_page(seed)
+                if self._seen.add(decode_id(page)):
+                    self._push(page, 0, rank)
+
+    def _push(self, page, depth, rank):
+        priority = depth if self.priority is None else self.priority(decode_id(page), depth, rank)
+        heapq.heappush(self._frontier, [priority, self._order, depth, page])
+        self._order += 1
+
+    def __len__(self):
+        return len(self._frontier) + len(self._inflight)
+
+    def _visit(self, entry, urls):
+        # Enqueue the similar authors not seen yet, in the order of the page
+        _, _, depth, page = entry
+        self.stats['visited'] += 1
+        if urls is None:
+            self.stats['failed'] += 1
+            urls = []
+        similar = []
+        for rank, url in enumerate(urls):
+            author_page = url.split('/')[-1]
+            similar.append(Author.from_url(author_page, identity=self.identity))
+            if self.max_depth is not None and depth + 1 > self.max_depth:
+                continue
+            if self._seen.add(decode_id(author_page)):
+                self._push(author_page, depth + 1, rank)
+        return Visit(_page_author(page, identity=self.identity), depth, similar)
+
+    def _urls(self):
+        # Pages of the authors to visit, taken from the frontier as they are requested. Stops when the frontier is
+        # empty, until the authors in flight add their similar authors to it
+        while self._frontier:
+            if self.max_authors is not None and self.stats['visited'] + len(self._inflight) >= self.max_authors:
+                return
+            entry = heapq.heappop(self._frontier)
+            self._inflight.append(entry)
+            yield f'{connect.get_base()}/author/similar/{entry[3]}'
+
+    def crawl(self):
+        """Visit the authors, until the frontier is empty or :attr:`max_authors` are visited.
+        The pages of :attr:`workers` authors are fetched at once, and the crawl is saved every
+        :attr:`checkpoint_every` authors, and when the generator is closed.
+
+        Returns:
+            yield Visit: author visited, its depth, and its similar authors (seen before or not).
+
+        """
+        pages = None
+        try:
+            while self._frontier:
+                if self.max_authors is not None and self.stats['visited'] >= self.max_authors:
+                    break
+                workers = self.workers or connect.POOL_SIZE
+                # Rolling window: the next page is requested as soon as one is received
+                pages = connect.connect_pages(self._urls(), extract=scrape.scrape_similar_authors,
+                                              prefetch=max(0, workers - 1), only=scrape.SIMILAR_AUTHORS_STRAINER)
+                for urls in pages:
+                    visit = self._visit(self._inflight.popleft(), urls)
+                    yield visit
+                    if self.checkpoint and self.stats['visited'] - self._saved >= self.checkpoint_every:
+                        self.save(self.checkpoint)
+        finally:
+            if pages is not None:
+                pages.close()
+            # Authors requested but not visited are visited again on the next crawl
+            while self._inflight:
+                heapq.heappush(self._frontier, self._inflight.pop())
+            if self.checkpoint:
+                self.save(self.checkpoint)
+
+    def save(self, path):
+        """Save the crawl (frontier, authors seen, and stats) in a JSON file.
+        The file is replaced at once, so that a crawl killed while saving keeps its previous save.
+
+        Args:
+            path (string): path of the file.
+
+        """
+        data = {
+            'stats': self.stats,
+            'order': self._order,
+            # Authors in flight are visited again when the crawl is resumed
+            'frontier': self._frontier + list(self._inflight),
+            'seen': self._seen.to_json(),
+        }
+        with open(path + '.tmp', 'w') as f:
+            json.dump(data, f)
+        os.replace(path + '.tmp', path)
+        self._saved = self.stats['visited']
+
+    def load(self, path):
+        """Resume a crawl saved with ``save()``.
+
+        Args:
+            path (string): path of the file.
+
+        """
+        with open(path) as f:
+            data = json.load(f)
+        self.stats = data['stats']
+        self._order = data['order']
+        self._frontier = data['frontier']
+        heapq.heapify(self._frontier)
+        self._seen = BloomFilter.from_json(data['seen'])
+        self._saved = self.stats['visited']
+
+    def __repr__(self):
+        rep = f'Crawler(frontier={len(self._frontier)}, seen={len(self._seen)}, visited={self.stats["visited"]})'
+        return rep
@@ -0,0 +1,96 @@
+"""
+Decode the numeric fields of ``Good Reads`` pages (likes, ratings, years and ids) into numbers.
+Each field is read with a single precompiled regular expression, instead of evaluating the scraped text.
+"""
+
+import re
+
+
+# "1,234 likes"
+LIKES = re.compile(r'(\d[\d,]*)\s*likes?')
+# "really liked it 4.55 avg rating — 2,414 ratings"
+RATINGS = re.compile(r'(\d+(?:\.\d+)?)\s*avg rating\D*(\d[\d,]*)\s*ratings?')
+# "— published 1999", or "published -500" for ancient books
+YEAR = re.compile(r'(-?\d+)\s*$')
+# "1234.Name", "1234-name" or "1234"
+ID = re.compile(r'\d+')
+
+
+def decode_int(text):
+    """Decode an integer written with thousands separators.
+
+    Args:
+        text (string): number, like ``'2,414'``.
+
+    Returns:
+        int
+
+    """
+    return int(text.replace(',', ''))
+
+
+def decode_likes(text):
+    """Decode the number of likes of a quote.
+
+    Args:
+        text (string): likes of a quote, like ``'1,234 likes'``.
+
+    Returns:
+        int: number of likes, or ``None`` if the text does not show likes.
+
+    Examples::
+        >>> decode_likes('1234 likes')
+            1234
+
+    """
+    match = LIKES.search(text)
+    return decode_int(match.group(1)) if match else None
+
+
+def decode_ratings(text):
+    """Decode the average rating and the number of ratings of a book.
+
+    Args:
+        text (string): ratings of a book, like ``'4.55 avg rating — 2,414 ratings'``.
+
+    Returns:
+        tuple: average rating (float) and number of ratings (int), or ``(None, None)`` if the text does not show
+            ratings.
+
+    Examples::
+        >>> decode_ratings('4.55 avg rating — 2,414 ratings')
+            (4.55, 2414)
+
+    """
+    match = RATINGS.search(text)
+    if not match:
+        return None, None
+    return float(match.group(1)), decode_int(match.group(2))
+
+
+def decode_year(text):
+    """Decode the year of publication of a book.
+
+    Args:
+        text (string): publication details, ending with the year, like ``'published 1958'``.
+
+    Returns:
+        int: year of publication, or ``None`` if the text does not end with a year.
+
+    """
+    match = YEAR.search(text)
+    return int(match.group(1)) if match else None
+
+
+def decode_id(text):
+    """Decode the id at the start of a ``Good Reads`` page name.
+
+    Args:
+        text (string): page name, like ``'1234.Stephen_King'``.
+
+    Returns:
+        int: id of the page, or ``None`` if the name does not start with an id.
+
+    """
+    match = ID.match(text)
+    return int(match.group()) if match else None
@@ -0,0 +1,155 @@
+"""
+Identity map of the authors, books and quotes built by a client, so that each of them is scraped once.
+A long-running service calling the API again and again gets the same objects back, with the quotes and books
+they already scraped, instead of connecting to ``Good Reads`` again.
+The objects are not refreshed: they return what they scraped first until they are forgotten (see ``max_size``),
+or until they are asked to scrape again (``cache=False``).
+"""
+
+import threading
+from collections import OrderedDict
+
+KINDS = ('author', 'book', 'quote')
+
+
+class IdentityMap:
+    """Authors, books and quotes by id, the least recently used first.
+
+    * :attr:`max_size`: maximum number of objects of each kind. The least recently used are forgotten first
+      (objects still referenced elsewhere, e.g. the quotes of a remembered author, are kept alive by them).
+      ``None`` does not limit the size.
+
+    * :attr:`stats`: number of objects found in the map (hits), built (misses) and forgotten (evictions).
+
+    Examples::
+        >>> identity = IdentityMap(max_size=1000)
+        >>> author = identity.get_or_create('author', 3389, lambda: Author(3389))
+        >>> identity.get_or_create('author', '3389', lambda: Author(3389)) is author
+            True
+
+    """
+
+    def __init__(self, max_size=None):
+        self.max_size = max_size
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._objects = {kind: OrderedDict() for kind in KINDS}
+        self._lock = threading.Lock()
+
+    def get(self, kind, key):
+        """Get an object from its id.
+
+        Args:
+            kind (string): ``'author'``, ``'book'`` or ``'quote'``.
+            key (string): id of the object (ids are compared as strings).
+
+        Returns:
+            object: the object, or ``None`` if it is not in the map.
+
+        """
+        key = str(key)
+        objects = self._objects[kind]
+        with self._lock:
+            obj = objects.get(key)
+            if obj is None:
+                self.stats['misses'] += 1
+            else:
+                objects.move_to_end(key)
+                self.stats['hits'] += 1
+            return obj
+
+    def setdefault(self, kind, key, obj):
+        """Remember an object, unless an object with the same id is already remembered.
+
+        Args:
+            kind (string): ``'author'``, ``'book'`` or ``'quote'``.
+            key (string): id of the object.
+            obj (object): author, book or quote.
+
+        Returns:
+            object: the object remembered with this id.
+
+        """
+        key = str(key)
+        objects = self._objects[kind]
+        with self._lock:
+            existing = objects.get(key)
+            if existing is not None:
+                return existing
+            objects[key] = obj
+            if self.max_size is not None:
+                while len(objects) > self.max_size:
+                    objects.popitem(last=False)
+                    self.stats['evictions'] += 1
+            return obj
+
+    def get_or_create(self, kind, key, create):
+        """Get an object from its id, or build and remember it.
+        The object is built outside the lock (it may connect to its page): if two threads build the same object
+        at once, the first one remembered is returned to both.
+
+        Args:
+            kind (string): ``'author'``, ``'book'`` or ``'quote'``.
+            key (string): id of the object.
+            create (callable): function without arguments building the object.
+
+        Returns:
+            object
+
+        """
+        obj = self.get(kind, key)
+        if obj is None:
+            obj = self.setdefault(kind, key, create())
+        return obj
+
+    def remove(self, kind, key):
+        """Forget an object, so that it is built (and scraped) again the next time.
+
+        Args:
+            kind (string): ``'author'``, ``'book'`` or ``'quote'``.
+            key (string): id of the object.
+
+        """
+        with self._lock:
+            self._objects[kind].pop(str(key), None)
+
+    def clear(self):
+        """Forget all objects."""
+        with self._lock:
+            for objects in self._objects.values():
+                objects.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {key: 0 for key in self.stats}
+
+    def __contains__(self, item):
+        kind, key = item
+        with self._lock:
+            return str(key) in self._objects[kind]
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(objects) for objects in self._objects.values())
+
+    def __repr__(self):
+        sizes = ', '.join(f'{kind}s={len(objects)}' for kind, objects in self._objects.items())
+        rep = f'IdentityMap(max_size={self.max_size}, {sizes})'
+        return rep
+
+
+def get_shared(identity, kind, key, create):
+    """Get an author, book or quote from an identity map, or build it (and remember it if there is a map).
+
+    Args:
+        identity (IdentityMap): map of the client, or ``None`` to always build a new object.
+        kind (string): ``'author'``, ``'book'`` or ``'quote'``.
+        key (string): id of the object.
+        create (callable): function without arguments building the object.
+
+    Returns:
+        object
+
+    """
+    if identity is None:
+        return create()
+    return identity.get_or_create(kind, key, create)
@@ -0,0 +1,148 @@
+"""
+Detect the language of quotes with ``langdetect``, in batches.
+Results are cached by text, so a quote found on both its author and book pages, or requested again, is only
+detected once. Batches run in the parser processes when they are enabled (see ``connect.set_workers()``).
+"""
+
+import threading
+from collections import OrderedDict
+
+from langdetect.detector_factory import DetectorFactory, PROFILES_DIRECTORY
+from langdetect.lang_detect_exception import LangDetectException
+
+from . import connect
+
+
+SEED = None
+BATCH_SIZE = 30
+CACHE_SIZE = 2 ** 16
+# Language of the texts detected so far, the least recently used first
+_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+# Factory of the detectors, with the language profiles loaded once per process
+_FACTORY = None
+_FACTORY_LOCK = threading.Lock()
+
+
+def set_seed(seed):
+    """Make the detection reproducible, as ``langdetect`` is randomized.
+    The languages detected with the previous seed are forgotten.
+
+    Args:
+        seed (int): seed of each detection. Set it to ``None`` to use the seed of ``langdetect.DetectorFactory``
+            (random detections by default).
+
+    """
+    global SEED
+    SEED = seed
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+def set_batch_size(value):
+    global BATCH_SIZE
+    BATCH_SIZE = value
+
+
+def _get_factory():
+    global _FACTORY
+    with _FACTORY_LOCK:
+        if _FACTORY is None:
+            factory = DetectorFactory()
+            factory.load_profile(PROFILES_DIRECTORY)
+            _FACTORY = factory
+    return _FACTORY
+
+
+def _detect(text, seed=None):
+    # Same as ``langdetect.detect()``, with the seed set on the detector: the global ``DetectorFactory.seed``
+    # is shared by all threads, and may be set by the user
+    detector = _get_factory().create()
+    if seed is not None:
+        detector.seed = seed
+    detector.append(text)
+    return detector.detect()
+
+
+def _detect_batch(texts, seed=None):
+    # Runs in the parser processes too, where the seed is not set
+    langs = []
+    for text in texts:
+        try:
+            langs.append(_detect(text, seed=seed))
+        except LangDetectException:
+            # No letters to detect (e.g. an empty text)
+            langs.append(None)
+    return langs
+
+
+def detect_languages(texts):
+    """Detect the language of several texts.
+    Texts already detected are read from the cache, and the others are detected in batches of ``BATCH_SIZE``.
+
+    Args:
+        texts (list): texts to detect.
+
+    Returns:
+        list: ISO 639-1 code of each language (like ``'en'``), or ``None`` if it could not be detected.
+
+    """
+    langs = {}
+    with _CACHE_LOCK:
+        for text in texts:
+            if text in _CACHE:
+                _CACHE.move_to_end(text)
+                langs[text] = _CACHE[text]
+    missing = list(dict.fromkeys(text for text in texts if text not in langs))
+    if missing:
+        batches = [missing[i:i + BATCH_SIZE] for i in range(0, len(missing), BATCH_SIZE)]
+        pool = connect.get_worker_pool()
+        if pool is None or len(batches) == 1:
+            results = [_detect_batch(batch, SEED) for batch in batches]
+        else:
+            results = pool.map(_detect_batch, batches, [SEED] * len(batches))
+        detected = dict(zip(missing, (lang for batch in results for lang in batch)))
+        langs.update(detected)
+        with _CACHE_LOCK:
+            _CACHE.update(detected)
+            while len(_CACHE) > CACHE_SIZE:
+                _CACHE.popitem(last=False)
+    return [langs[text] for text in texts]
+
+
+def detect_quotes(quotes):
+    """Detect the language of quotes, and store it in their :attr:`lang` attribute.
+    Quotes whose language is already known are not detected again.
+
+    Args:
+        quotes (list): quotes to detect.
+
+    Returns:
+        list: the same quotes.
+
+    """
+    unknown = [quote for quote in quotes if quote.lang is None]
+    for quote, lang in zip(unknown, detect_languages([quote.text for quote in unknown])):
+        quote.lang = lang
+    return quotes
+
+
+def iter_detected(quotes):
+    """Detect the language of quotes while they are yielded, one batch at a time.
+    With parser processes, as many batches as processes are detected at once.
+
+    Args:
+        quotes (iterable): quotes to detect.
+
+    Returns:
+        yield Quote: quotes, with their :attr:`lang` set.
+
+    """
+    size = BATCH_SIZE * max(1, connect.WORKERS)
+    batch = []
+    for quote in quotes:
+        batch.append(quote)
+        if len(batch) >= size:
+            yield from detect_quotes(batch)
+            batch = []
+    yield from detect_quotes(batch)
@@ -3,14 +3,88 @@ Baseline class for `Good Reads` objects.
 This class handles connection to `Good Reads` server.
 """
 
+import functools
+import math
 import string
+import sys
+import threading
 from abc import ABC, abstractmethod
+from itertools import count
 
-from .connect import connect
+from .connect import connect, connect_pages, connect_records, connect_stream, get_base
 from .utils import *
 from scrapereads import scrape
 
 
+class ItemIndex:
+    """Index of quotes or books by some of their attributes, so that they can be found without a scan.
+    Attributes are compared as strings, and the first item added wins (like a scan of the items in order).
+
+    * :attr:`attrs`: indexed attributes (e.g. ``('book_id', 'book_name')``).
+
+    """
+
+    __slots__ = ('attrs', '_keys')
+
+    def __init__(self, *attrs):
+        self.attrs = attrs
+        self._keys = {attr: {} for attr in attrs}
+
+    def add(self, item):
+        """Index an item.
+
+        Args:
+            item (object): quote or book.
+
+        """
+        for attr, keys in self._keys.items():
+            keys.setdefault(str(getattr(item, attr)), item)
+
+    def find(self, attr, value):
+        """Find an item from one of its attributes.
+
+        Args:
+            attr (string): indexed attribute.
+            value (object): value of the attribute.
+
+        Returns:
+            object: the first item added with this value, or ``None``.
+
+        """
+        return self._keys[attr].get(str(value))
+
+    def clear(self):
+        """Remove all items."""
+        for keys in self._keys.values():
+            keys.clear()
+
+    def __repr__(self):
+        rep = f'ItemIndex(attrs={self.attrs}, items={len(self._keys[self.attrs[0]]) if self.attrs else 0})'
+        return rep
+
+
+# Guards the creation of the locks of the authors and books
+_LOCK = threading.Lock()
+
+
+def _get_lock(obj):
+    """Get the lock of an author or book, held while its quotes or books are scraped, as the object may be shared
+    by several calls (see ``identity.get_shared()``). The lock is built when it is first needed.
+
+    Args:
+        obj (Author or Book): object to lock.
+
+    Returns:
+        threading.RLock
+
+    """
+    if obj._lock is None:
+        with _LOCK:
+            if obj._lock is None:
+                obj._lock = threading.RLock()
+    return obj._lock
+
+
 class GoodReadsMeta(ABC):
     """Defines the base of all `Good Reads` objects, that scrape and extract online data.
 
@@ -22,8 +96,11 @@ class GoodReadsMeta(ABC):
 
     """
 
+    # Objects are created by the thousands: no per-instance ``__dict__`` (but they can still be weakly referenced)
+    __slots__ = ('base', 'href', '_soup', '__weakref__')
+
     def __init__(self):
-        self.base = f'https://www.goodreads.com'
+        self.base = get_base()
         self.href = '/'
         self._soup = None
 
@@ -54,6 +131,67 @@ class GoodReadsMeta(ABC):
         url = self.base + (href or self.href)
         return connect(url)
 
+    def _search_pages(self, href, extract, parse, top_k=None, only=None):
+        """Navigate through a paginated `Good Reads` list.
+        If the first page shows how many pages there are, all remaining pages are fetched at once.
+        Otherwise, next pages are fetched ahead of time until a page is empty.
+
+        Args:
+            href (string): page reference of the first page.
+            extract (callable): function extracting the records and the number of pages from a page.
+            parse (callable): function building a list of items from the records of a page.
+            top_k (int, optional): number of items needed. Only the pages containing them are fetched.
+            only (bs4.SoupStrainer, optional): part of the next pages containing the items, so that the rest of
+                the page is not parsed. The first page is always parsed in full, to read the pagination widget.
+
+        Returns:
+            yield list
+
+        """
+        # Items of the first page are yielded while it is downloaded, when streaming is enabled
+        stream = connect_stream(self.base + href, extract)
+        num_items = 0
+        for record in stream:
+            items = parse([record])
+            num_items += len(items)
+            yield items
+        page = stream.records
+        if not num_items:
+            return None
+        # The first page tells how many items are listed per page
+        max_pages = math.ceil(top_k / num_items) if top_k else None
+        num_pages = page['num_pages']
+        prefetch = None
+        if num_pages:
+            npages = range(2, min(num_pages, max_pages or num_pages) + 1)
+            prefetch = len(npages)
+        elif max_pages:
+            npages = range(2, max_pages + 1)
+        else:
+            npages = count(2)
+
+        urls = (self.base + href + self._next_page(npage=npage) for npage in npages)
+        pages = connect_pages(urls, extract=extract, prefetch=prefetch, only=only)
+        try:
+            for page in pages:
+                # A page that failed to load is skipped when the number of pages is known
+                if page is None and num_pages:
+                    continue
+                items = parse(page['items']) if page else []
+                # Stop when no items are found, and drop the pages fetched in advance
+                if not items:
+                    break
+                yield items
+        finally:
+            pages.close()
+
+
+@functools.lru_cache(maxsize=4096)
+def _author_strings(author_id, author_name):
+    # Name and href of an author, shared by all its quotes and books instead of being built again for each one
+    author_name = sys.intern(author_name.replace('_', ' ').title())
+    return author_name, f'/author/show/{author_id}.{name_to_goodreads(author_name)}'
+
 
 class AuthorMeta(GoodReadsMeta):
     """Defines an abstract author, from the page info from ``https://www.goodreads.com/``.
@@ -70,17 +208,39 @@ class AuthorMeta(GoodReadsMeta):
 
     """
 
+    __slots__ = ('author_id', '_author_name')
+
     def __init__(self, author_id, author_name=None):
         super().__init__()
-        # Connect to the author page to find out its name
-        href = f'/author/show/{author_id}'
-        if not author_name:
-            self._soup = self.connect(href=href)
-            author_name = scrape.get_author_name(self._soup)
-        # Save attribute
         self.author_id = author_id
-        self.author_name = author_name.replace('_', ' ').title()
-        self.href = f'/author/show/{author_id}.{name_to_goodreads(self.author_name)}'
+        if author_name:
+            self._author_name, self.href = _author_strings(author_id, author_name)
+        else:
+            # The name is read from the author page when it is first needed (see ``resolve_author_names()``)
+            self._author_name = None
+            self.href = f'/author/show/{author_id}'
+
+    @property
+    def author_name(self):
+        if self._author_name is None:
+            # Only the name is parsed from the page, which is not kept (see ``resolve_author_names()``)
+            author_name = connect_records(f'{self.base}/author/show/{self.author_id}', scrape.scrape_author_name,
+                                          only=scrape.AUTHOR_NAME_STRAINER)
+            if author_name is None:
+                raise ConnectionError(f'Could not connect to the page of the author {self.author_id} to get its name.')
+            self._resolve_author_name(author_name)
+        return self._author_name
+
+    @author_name.setter
+    def author_name(self, value):
+        self._author_name = value
+
+    def _resolve_author_name(self, author_name):
+        author_name, href = _author_strings(self.author_id, author_name)
+        self._author_name = author_name
+        # Books and quotes have their own page, only the author page is named after the author
+        if self.href == f'/author/show/{self.author_id}':
+            self.href = href
 
     # TODO: finish and add nested JSON option
     @abstractmethod
@@ -91,16 +251,61 @@ class AuthorMeta(GoodReadsMeta):
             dict
 
         """
+        info = self.get_info()
         data = {
             'author': self.author_name,
-            **self.get_info()
+            **info
         }
         return data
 
     def __repr__(self):
-        rep = f'Author: {self.author_name}'
+        # Do not connect to the author page just to display it
+        rep = f'Author: {self._display_name()}'
         return rep
 
+    def _display_name(self):
+        # Name of the author if it is known, else its id, without connecting to its page
+        return self._author_name if self._author_name is not None else self.author_id
+
+
+def _group_authors(authors, only_missing=True):
+    # Authors (or their books and quotes) whose name is needed, by id, so that each page is fetched once
+    groups = {}
+    for author in authors:
+        if author._author_name is None or not only_missing:
+            groups.setdefault(str(author.author_id), []).append(author)
+    return groups
+
+
+def _set_author_names(groups, author_names):
+    for (author_id, authors), author_name in zip(groups.items(), author_names):
+        if author_name is None:
+            raise ConnectionError(f'Could not connect to the page of the author {author_id} to get its name.')
+        for author in authors:
+            author._resolve_author_name(author_name)
+
+
+def resolve_author_names(authors, only_missing=True):
+    """Read the names of several authors from their pages, fetched concurrently.
+    Only the name is parsed from each page, and nothing else is kept.
+
+    Args:
+        authors (iterable): authors, books or quotes.
+        only_missing (bool): if ``True``, names already known are not read again.
+
+    Returns:
+        list: the same authors, books or quotes.
+
+    """
+    authors = list(authors)
+    groups = _group_authors(authors, only_missing=only_missing)
+    urls = [f'{group[0].base}/author/show/{author_id}' for author_id, group in groups.items()]
+    # All the pages are queued at once, the number of connections is bounded by the pool of threads
+    author_names = connect_pages(urls, extract=scrape.scrape_author_name, prefetch=len(urls),
+                                 only=scrape.AUTHOR_NAME_STRAINER)
+    _set_author_names(groups, author_names)
+    return authors
+
 
 class BookMeta(AuthorMeta):
     """Abstract Book class, used as baseline.
@@ -125,6 +330,8 @@ class BookMeta(AuthorMeta):
 
     """
 
+    __slots__ = ('book_id', 'book_name', 'edition', 'year', '_author')
+
     def __init__(self, author_id, book_id, book_name=None, author_name=None, edition=None, year=None):
         super().__init__(author_id, author_name=author_name)
         self.book_id = book_id or 0
@@ -167,7 +374,7 @@ class BookMeta(AuthorMeta):
     def __repr__(self):
         rep_ed = f', {self.edition}' if self.edition else ''
         rep_year = f' ({self.year})' if self.year else ''
-        rep = f'{self.author_name}: "{self.book_name}"{rep_ed}{rep_year}'
+        rep = f'{self._display_name()}: "{self.book_name}"{rep_ed}{rep_year}'
         return rep
 
 
@@ -184,15 +391,21 @@ class QuoteMeta(AuthorMeta):
 
     * :attr:`quote`: text.
 
+    * :attr:`lang`: language of the text, once detected (see ``scrapereads.lang``).
+
     """
 
+    __slots__ = ('quote_id', 'quote_name', 'text', 'tags', 'likes', 'lang', '_book', '_author')
+
     def __init__(self, author_id, quote_id, quote_name=None, text=None, author_name=None, tags=None, likes=None):
         super().__init__(author_id, author_name=author_name)
         self.quote_id = quote_id
         self.quote_name = quote_name
         self.text = text or ''
-        self.tags = tags or []
+        # A few tags are shared by all the quotes
+        self.tags = [sys.intern(tag) for tag in tags] if tags else []
         self.likes = likes
+        self.lang = None
         self._book = None
         self._author = None
 
@@ -255,5 +468,5 @@ class QuoteMeta(AuthorMeta):
         rep_tags = f", Tags: {', '.join(self.tags)}" if len(self.tags) > 0 else ''
         rep_likes = f'Likes: {self.likes}'
         rep_info = f'\n  {rep_likes}{rep_tags}'
-        rep = f'“{self.text}”\n― {self.author_name}{rep_book}{rep_year}{rep_info}'
+        rep = f'“{self.text}”\n― {self._display_name()}{rep_book}{rep_year}{rep_info}'
         return rep
@@ -0,0 +1,127 @@
+"""
+Parser backends used to extract records from ``Good Reads`` pages.
+The default backend builds a BeautifulSoup tree. The ``lxml`` backend runs compiled XPath selectors on a raw
+``lxml`` tree (see ``scrapereads.xpath``), which is several times faster, and returns identical records.
+"""
+
+import bs4
+
+from scrapereads import scrape
+
+try:
+    from scrapereads import xpath
+except ImportError:
+    xpath = None
+
+
+class Parser:
+    """Parser backend, extracting records from the body of a page.
+
+    * :attr:`name`: name of the backend, as used in ``set_parser()``.
+
+    """
+
+    name = None
+
+    def soup(self, body, only=None):
+        """Parse a page with BeautifulSoup.
+
+        Args:
+            body (bytes): content of the page.
+            only (bs4.SoupStrainer, optional): if provided, only the matching parts of the page are parsed.
+
+        Returns:
+            bs4.BeautifulSoup
+
+        """
+        return bs4.BeautifulSoup(body, 'lxml', parse_only=only)
+
+    def extract(self, extract, body, only=None):
+        """Extract records from a page.
+
+        Args:
+            extract (callable): extractor from ``scrapereads.scrape``, taking a soup.
+            body (bytes): content of the page.
+            only (bs4.SoupStrainer, optional): if provided, only the matching parts of the page are parsed.
+
+        Returns:
+            object: records returned by ``extract``.
+
+        """
+        return extract(self.soup(body, only=only))
+
+    def __repr__(self):
+        rep = f'{self.__class__.__name__}(name={self.name!r})'
+        return rep
+
+
+class SoupParser(Parser):
+    """BeautifulSoup backend, working with all extractors."""
+
+    name = 'bs4'
+
+
+class LxmlParser(Parser):
+    """``lxml`` backend, using compiled XPath selectors for the paginated lists (quotes and books).
+    Other extractors, and pages with an unexpected markup, fall back to BeautifulSoup.
+
+    """
+
+    name = 'lxml'
+
+    def __init__(self):
+        if xpath is None:
+            raise ImportError('The `lxml` parser requires the `lxml` package. Install it with `pip install lxml`.')
+        self.extractors = {
+            scrape.scrape_quotes_page: xpath.scrape_quotes_page,
+            scrape.scrape_author_books_page: xpath.scrape_author_books_page,
+        }
+
+    def extract(self, extract, body, only=None):
+        fast_extract = self.extractors.get(extract)
+        if fast_extract is not None:
+            try:
+                return fast_extract(xpath.parse(body))
+            except xpath.UnsupportedMarkup:
+                pass
+        return super().extract(extract, body, only=only)
+
+
+PARSERS = {
+    SoupParser.name: SoupParser,
+    LxmlParser.name: LxmlParser,
+}
+
+
+def get_parser(name):
+    """Get a parser backend from its name.
+
+    Args:
+        name (string): name of the backend. Options are ``'bs4'`` and ``'lxml'``.
+
+    Returns:
+        Parser
+
+    """
+    if name not in PARSERS:
+        raise ValueError(f'Unknown parser {name!r}. Options are {", ".join(map(repr, PARSERS))}.')
+    return PARSERS[name]()
+
+
+def get_stream(extract):
+    """Get the incremental version of an extractor, extracting the items of a page while it is downloaded.
+
+    Args:
+        extract (callable): extractor from ``scrapereads.scrape``.
+
+    Returns:
+        callable: factory of ``xpath.ItemStream``, or ``None`` if the extractor has no incremental version.
+
+    """
+    if xpath is None:
+        return None
+    streams = {
+        scrape.scrape_quotes_page: xpath.stream_quotes_page,
+        scrape.scrape_author_books_page: xpath.stream_author_books_page,
+    }
+    return streams.get(extract)
@@ -0,0 +1,121 @@
+"""
+Token-bucket rate limiter, shared by all the threads and coroutines connecting to ``Good Reads``.
+"""
+
+import asyncio
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """Thread-safe and asyncio-safe token bucket.
+
+    Tokens are added continuously at :attr:`rate` per second, up to :attr:`burst`.
+    Each connection takes one token. When the bucket is empty, callers reserve a future token and wait for it,
+    so concurrent callers are served in order at exactly :attr:`rate` connections per second.
+
+    * :attr:`rate`: number of connections allowed per second.
+
+    * :attr:`burst`: number of connections that can start at once after an idle period.
+
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token, possibly in advance.
+
+        Returns:
+            float: seconds to wait before the token is available.
+
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Wait (blocking) until a token is available."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """Wait (without blocking the event loop) until a token is available."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def __repr__(self):
+        rep = f'TokenBucket(rate={self.rate}, burst={self.burst})'
+        return rep
+
+
+class RateLimiter:
+    """Rate limiter keeping one token bucket per host.
+
+    * :attr:`rate`: number of connections allowed per second and per host. ``None`` disables the limiter.
+
+    * :attr:`burst`: number of connections that can start at once on a host.
+
+    Examples::
+        >>> limiter = RateLimiter(rate=2, burst=4)
+        >>> limiter.acquire('https://www.goodreads.com/author/show/3389')
+
+    """
+
+    def __init__(self, rate=None, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        """Get the token bucket of the host of an url.
+
+        Args:
+            url (string): url path.
+
+        Returns:
+            TokenBucket
+
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, burst=self.burst)
+            return self._buckets[host]
+
+    def acquire(self, url):
+        """Wait (blocking) until a connection to the host of ``url`` is allowed.
+
+        Args:
+            url (string): url path.
+
+        """
+        if self.rate:
+            self.bucket(url).acquire()
+
+    async def acquire_async(self, url):
+        """Wait (without blocking the event loop) until a connection to the host of ``url`` is allowed.
+
+        Args:
+            url (string): url path.
+
+        """
+        if self.rate:
+            await self.bucket(url).acquire_async()
+
+    def __repr__(self):
+        rep = f'RateLimiter(rate={self.rate}, burst={self.burst})'
+        return rep
@@ -4,14 +4,41 @@ Connect to https://www.goodreads.com/ to extract quotes and books from famous au
 """
 
 import warnings
-import langdetect
 
 from scrapereads.utils import *
 from scrapereads import scrape
-from scrapereads.meta import AuthorMeta
+from scrapereads.connect import connect_records
+from scrapereads.identity import get_shared
+from scrapereads.lang import iter_detected
+from scrapereads.decode import decode_id, decode_ratings
+from scrapereads.meta import AuthorMeta, ItemIndex, _get_lock
 import scrapereads.reads as greads
 
 
+def get_shared_author(identity, author_id, author_name=None):
+    """Get an author from the identity map of a client, or build it (see ``identity.get_shared()``).
+    The books and quotes of the author are shared through the same map.
+
+    Args:
+        identity (IdentityMap): map of the client, or ``None`` to build a new author.
+        author_id (string): id of the author.
+        author_name (string, optional): name of the author.
+
+    Returns:
+        Author
+
+    """
+    def create():
+        author = Author(author_id, author_name=author_name)
+        author._identity = identity
+        return author
+    author = get_shared(identity, 'author', author_id, create)
+    if author_name and author._author_name is None:
+        # The author was built from its id alone: its name does not need to be read from its page anymore
+        author._resolve_author_name(author_name)
+    return author
+
+
 class Author(AuthorMeta):
     """
     Defines an author, from the page info from ``https://www.goodreads.com/``.
@@ -24,26 +51,43 @@ class Author(AuthorMeta):
 
     """
 
+    __slots__ = ('_quotes', '_books', '_info', '_quote_index', '_book_index', '_listed_quotes', '_listed_books',
+                 '_all_quotes', '_all_books', '_identity', '_lock')
+
     def __init__(self, author_id, author_name=None):
         super().__init__(author_id, author_name=author_name)
         self._quotes = []
         self._books = []
         self._info = None
+        # Saved quotes and books, by id and name
+        self._quote_index = ItemIndex('quote_id', 'quote_name')
+        self._book_index = ItemIndex('book_id', 'book_name')
+        # Number of quotes and books added from the quote and book pages of the author (other books come from
+        # its quotes), and whether these pages were scraped to the end
+        self._listed_quotes = 0
+        self._listed_books = 0
+        self._all_quotes = False
+        self._all_books = False
+        # Identity map of the client which built the author, shared with its books and quotes
+        self._identity = None
+        self._lock = None
 
     @classmethod
-    def from_url(cls, url):
+    def from_url(cls, url, identity=None):
         """Construct the class from an url.
 
         Args:
             url (string): url.
+            identity (IdentityMap, optional): identity map of the client, returning the author if it was already
+                built.
 
         Returns:
             Author
 
         """
-        author_id = eval(url.split('/')[-1].split('.')[0])
+        author_id = decode_id(url.split('/')[-1])
         author_name = url.split('/')[-1].split('.')[1]
-        return Author(author_id, author_name=author_name)
+        return get_shared_author(identity, author_id, author_name=author_name)
 
     def get_info(self):
         """Get author information (genres, influences, description etc.)
@@ -54,7 +98,13 @@ class Author(AuthorMeta):
         """
         if not self._info:
             soup = self._soup or self.connect()
+            if soup is None:
+                return {}
             self._info = scrape.get_author_info(soup)
+            if self._author_name is None:
+                self._resolve_author_name(scrape.get_author_name(soup))
+            # The page is not needed anymore
+            self._soup = None
         return self._info
 
     def add_quote(self, quote):
@@ -68,6 +118,23 @@ class Author(AuthorMeta):
         quote.author_id = self.author_id
         quote.register_author(self)
         self._quotes.append(quote)
+        self._quote_index.add(quote)
+
+    def _clear_quotes(self):
+        self._quotes = []
+        self._quote_index.clear()
+        self._listed_quotes = 0
+        self._all_quotes = False
+
+    def _add_listed_quote(self, quote):
+        # Add a quote from the quote page of the author
+        self.add_quote(quote)
+        self._listed_quotes += 1
+
+    def _has_quotes(self, top_k=None):
+        # Whether the quotes already scraped hold the ``top_k`` first ones (all of them if ``top_k`` is not set).
+        # An empty list is scraped again, as its page may have failed to load
+        return self._listed_quotes > 0 and (self._all_quotes or bool(top_k) and self._listed_quotes >= top_k)
 
     def add_book(self, book):
         """Add a book to an Author.
@@ -80,104 +147,123 @@ class Author(AuthorMeta):
         book.author_id = self.author_id
         book.register_author(self)
         self._books.append(book)
+        self._book_index.add(book)
 
-    def _search_books(self):
-        # Scrape books from tha author book page from scrapereads.com
+    def _clear_books(self):
         self._books = []
-        npage = 1
+        self._book_index.clear()
+        self._listed_books = 0
+        self._all_books = False
+
+    def _add_listed_book(self, book):
+        # Add a book from the book page of the author
+        self.add_book(book)
+        self._listed_books += 1
+
+    def _has_books(self, top_k=None):
+        # Whether the books already scraped hold the ``top_k`` first ones (all of them if ``top_k`` is not set).
+        # An empty list is scraped again, as its page may have failed to load
+        return self._listed_books > 0 and (self._all_books or bool(top_k) and self._listed_books >= top_k)
+
+    def _get_book(self, book_id, book_name):
+        # Book of the author, from the identity map of the author if any
+        def create():
+            book = greads.Book(self.author_id, book_id, book_name=book_name, author_name=self.author_name)
+            book._identity = self._identity
+            return book
+        return get_shared(self._identity, 'book', book_id, create)
+
+    def _parse_books(self, records):
+        # Build the books listed on one page of the author book page
+        books = []
+        for record in records:
+            book = self._get_book(record['book_id'], record['book_name'])
+            # A book already built (e.g. from a quote) is updated with the listing
+            book.edition = record['edition']
+            book.year = record['year']
+            book.ratings = record['ratings']
+            book.rating = record.get('rating')
+            book.num_ratings = record.get('num_ratings')
+            if book.ratings and book.rating is None:
+                book.rating, book.num_ratings = decode_ratings(book.ratings)
+            books.append(book)
+        return books
+
+    def _search_books(self, top_k=None):
+        # Scrape books from tha author book page from scrapereads.com
+        self._clear_books()
         href = f'/author/list/{self.author_id}.{name_to_goodreads(self.author_name)}'
-        search = True
-
-        while search:
-            # Didn't found any quotes
-            search = False
-            # Navigate through the next page
-            href_page = href + self._next_page(npage=npage)
-            soup = self.connect(href=href_page)
-            npage += 1
-            for book_tr in scrape.scrape_author_books(soup):
-                # Books found
-                search = True
-                book_title = scrape.get_author_book_title(book_tr)
-                book_href = book_title.get('href')
-                book_id = book_href.split('/')[-1].split('-')[0].split('.')[0]
-                book_name = book_title.text.strip().title()
-                ratings = scrape.get_author_book_ratings(book_tr).contents[-1]
-                edition = scrape.get_author_book_edition(book_tr)
-                edition = edition.text.strip() if edition else None
-                year = scrape.get_author_book_date(book_tr)
-                book = greads.Book(self.author_id, book_id, book_name=book_name,
-                                   author_name=self.author_name, edition=edition, year=year, ratings=ratings)
-                self.add_book(book)
+        pages = self._search_pages(href, scrape.scrape_author_books_page, self._parse_books, top_k=top_k,
+                                   only=scrape.AUTHOR_BOOKS_STRAINER)
+        for books in pages:
+            for book in books:
+                self._add_listed_book(book)
                 yield book
+        # Fewer books than needed: there are no more
+        self._all_books = not top_k or self._listed_books < top_k
+
+    def _parse_quotes(self, records):
+        # Build the quotes listed on one page of the author quote page
+        quotes = []
+        for record in records:
+            quote = get_shared(self._identity, 'quote', record['quote_id'],
+                               lambda: greads.Quote(self.author_id,
+                                                    record['quote_id'],
+                                                    text=record['text'],
+                                                    author_name=self.author_name,
+                                                    tags=record['tags']))
+            quote.likes = record['likes']
+            # Register the quote to a book if it exists
+            book_id = record['book_id']
+            # The quote is linked to a book
+            if book_id:
+                # Look for an already saved book, if it does not exists create it and add it
+                # However, if there are no books register using the ``search_book()`` method will automatically
+                # look for ALL books, which is time consuming.
+                # Instead, it will look for book already saved in the cache, and add it if it does not exist.
+                book = self._book_index.find('book_id', book_id)
+                if book is not None:
+                    book.register_author(self)
+                else:
+                    book = self._get_book(book_id, record['book_name'])
+                    self.add_book(book)
+                book.add_quote(quote)
+            quotes.append(quote)
+        return quotes
 
-    def _search_quotes(self):
+    def _search_quotes(self, top_k=None):
         # Scrape quotes from the author qutoe page from scrapereads.com
-        self._quotes = []
-        npage = 1
+        self._clear_quotes()
         href = f'/author/quotes/{self.author_id}.{name_to_goodreads(self.author_name)}'
-        search = True
-
-        while search:
-            # Didn't found any quotes
-            search = False
-            # Navigate through the next page
-            href_page = href + self._next_page(npage=npage)
-            soup = self.connect(href=href_page)
-            npage += 1
-            for quote_div in scrape.scrape_quotes(soup):
-                # Quotes found
-                search = True
-                quote_text = process_quote_text(scrape.get_quote_text(quote_div))
-                quote_likes = eval(scrape.get_quote_likes(quote_div).text.replace('likes', '').strip())
-                quote_href = scrape.get_quote_likes(quote_div).get('href')
-                quote_id = quote_href.split('-')[0].split('.')[0]
-                quote_tags = []
-                for tag in scrape.scrape_quote_tags(quote_div):
-                    quote_tags.append(tag.text.strip())
-                quote = greads.Quote(self.author_id,
-                                     quote_id,
-                                     text=quote_text,
-                                     author_name=self.author_name,
-                                     tags=quote_tags,
-                                     likes=quote_likes)
-                # Register the quote to a book if it exists
-                book_title = scrape.get_quote_book(quote_div)
-                # The quote is linked to a book
-                if book_title:
-                    book_href = book_title.get('href')
-                    book_id = book_href.split('/')[-1].split('-')[0].split('.')[0]
-                    book_name = book_title.text.strip()
-                    # Look for an already saved book, if it does not exists create it and add it
-                    # However, if there are no books register using the ``search_book()`` method will automatically
-                    # look for ALL books, which is time consuming.
-                    # Instead, it will look for book already saved in the cache, and add it if it does not exist.
-                    book_exist = True if book_id in [book.book_id for book in self._books] else False
-                    if book_exist:
-                        book = self.search_book(book_id)
-                    else:
-                        book = greads.Book(self.author_id, book_id, book_name=book_name, author_name=self.author_name)
-                        self.add_book(book)
-                    book.add_quote(quote)
+        pages = self._search_pages(href, scrape.scrape_quotes_page, self._parse_quotes, top_k=top_k,
+                                   only=scrape.QUOTES_STRAINER)
+        for quotes in pages:
+            for quote in quotes:
                 # Add the quote and return it
-                self.add_quote(quote)
+                self._add_listed_quote(quote)
                 yield quote
+        # Fewer quotes than needed: there are no more
+        self._all_quotes = not top_k or self._listed_quotes < top_k
 
-    def quotes(self, cache=True):
+    def quotes(self, cache=True, top_k=None):
         """Yield all quotes from an author address.
         This function extract online data from `Good Reads` if nothing is already saved in the cache.
 
         Args:
             cache (bool): if ``True``, will look for cache items only (and won't scrape online).
+            top_k (int, optional): number of quotes needed, so that only the required pages are scraped.
 
         Returns:
             yield Quote
 
         """
-        if len(self._quotes) > 0 and cache:
-            yield from self._quotes
-        else:
-            yield from self._search_quotes()
+        if not (cache and self._has_quotes(top_k)):
+            with _get_lock(self):
+                # The quotes may have been scraped by another call in the meantime
+                if not (cache and self._has_quotes(top_k)):
+                    yield from self._search_quotes(top_k=top_k)
+                    return
+        yield from self._quotes
 
     # TODO: merge this function with Book.get_quotes()
     def get_quotes(self, lang=None, top_k=None, cache=True):
@@ -192,34 +278,39 @@ class Author(AuthorMeta):
             list(Quote)
 
         """
-        # Reset the quotes saved in the cache if its length is under the threshold
-        if top_k and len(self._quotes) < top_k:
-            self._quotes = []
         # Get the top-k quotes, ordered from the author's quote page (usually it's ordered by popularity)
         quotes = []
-        for i, quote in enumerate(self.quotes(cache=cache)):
-            if not lang or langdetect.detect(quote.text) == lang:
+        candidates = self.quotes(cache=cache, top_k=top_k)
+        if lang:
+            # Detect the languages in batches, while the quotes are scraped
+            candidates = iter_detected(candidates)
+        for i, quote in enumerate(candidates):
+            if not lang or quote.lang == lang:
                 quote.register_author(self)
                 quotes.append(quote)
                 if top_k and i + 1 >= top_k:
                     break
         return quotes
 
-    def books(self, cache=True):
+    def books(self, cache=True, top_k=None):
         """Get all books from an author address.
         This function extract online data from `Good Reads` if nothing is already saved in the cache.
 
         Args:
             cache (bool): if ``True``, will look for cache items only (and won't scrape online).
+            top_k (int, optional): number of books needed, so that only the required pages are scraped.
 
         Returns:
             yield Quote
 
         """
-        if len(self._books) > 0 and cache:
-            yield from self._books
-        else:
-            yield from self._search_books()
+        if not (cache and self._has_books(top_k)):
+            with _get_lock(self):
+                # The books may have been scraped by another call in the meantime
+                if not (cache and self._has_books(top_k)):
+                    yield from self._search_books(top_k=top_k)
+                    return
+        yield from self._books
 
     def get_books(self, top_k=None, cache=True):
         """Get all books from an author address.
@@ -232,21 +323,18 @@ class Author(AuthorMeta):
             list(Book)
 
         """
-        # Reset the books saved in the cache if its length is under the threshold
-        if top_k and len(self._books) < top_k:
-            self._books = []
         # Get the top-k books, ordered from the author's book page
         books = []
-        for i, book in enumerate(self.books(cache=cache)):
+        for i, book in enumerate(self.books(cache=cache, top_k=top_k)):
             book.register_author(self)
             books.append(book)
             if top_k and i + 1 >= top_k:
                 break
         return books
 
-    # TODO: use for loop with yield
     def search_book(self, book_id, attr='book_id', cache=True):
         """Search a book from the books saved in the author's cache.
+        Saved books are found from their id or name in constant time. Otherwise, books are scraped until found.
 
         Args:
             book_id (string): book id (or name) to look for.
@@ -257,14 +345,19 @@ class Author(AuthorMeta):
             Book
 
         """
+        if cache and self._books and attr in self._book_index.attrs:
+            book = self._book_index.find(attr, book_id)
+            if book is not None:
+                book.register_author(self)
+            return book
         for book in self.books(cache=cache):
             if str(book_id) == str(getattr(book, attr)):
                 book.register_author(self)
                 return book
 
-    # TODO: use for loop with yield
     def search_quote(self, quote_id, attr='quote_id', cache=True):
         """Search a quote from the books saved in the author's cache.
+        Saved quotes are found from their id or name in constant time. Otherwise, quotes are scraped until found.
 
         Args:
             quote_id (string): quote'id to look for.
@@ -275,6 +368,11 @@ class Author(AuthorMeta):
             Book
 
         """
+        if cache and self._quotes and attr in self._quote_index.attrs:
+            quote = self._quote_index.find(attr, quote_id)
+            if quote is not None:
+                quote.register_author(self)
+            return quote
         for quote in self.quotes(cache=cache):
             if str(quote_id) == str(getattr(quote, attr)):
                 quote.register_author(self)
@@ -291,16 +389,10 @@ class Author(AuthorMeta):
 
         """
         href = f'/author/similar/{self.author_id}.{name_to_goodreads(self.author_name)}'
-        soup = self.connect(href=href)
-
-        authors = []
-        authors_container = soup.findAll('a', attrs={'class': 'gr-h3 gr-h3--serif gr-h3--noMargin'})
-        for i, author in enumerate(authors_container[1:]):
-            url_author = author.attrs['href']
-            authors.append(Author.from_url(url_author))
-            if top_k and i + 1 >= top_k:
-                break
-        return authors
+        urls = connect_records(self.base + href, scrape.scrape_similar_authors, only=scrape.SIMILAR_AUTHORS_STRAINER)
+        if urls is None:
+            return []
+        return [Author.from_url(url, identity=self._identity) for url in urls[:top_k or None]]
 
     # TODO: finish and add nested JSON option
     def to_json(self, encode=None):
@@ -313,10 +405,12 @@ class Author(AuthorMeta):
             dict
 
         """
+        # The page of the author gives its info and its name: read it first, so it is not fetched twice
+        info = self.get_info()
         data = {
             'author': self.author_name,
-            **self.get_info()
+            **info
         }
         if encode:
-            return serialize_dict(data)
+            return serialize(data)
         return data
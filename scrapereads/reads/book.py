@@ -3,73 +3,99 @@ Defines a book from an Author.
 """
 
 import warnings
-import langdetect
 
 from scrapereads.utils import *
 from scrapereads import scrape
-from scrapereads.meta import BookMeta
+from scrapereads.identity import get_shared
+from scrapereads.lang import iter_detected
+from scrapereads.decode import decode_ratings
+from scrapereads.meta import BookMeta, ItemIndex, _get_lock
 import scrapereads.reads as greads
 
 
 class Book(BookMeta):
+    """Book from an author, with its ratings.
+
+    * :attr:`ratings`: ratings as shown on `Good Reads`, like ``'4.55 avg rating — 2,414 ratings'``.
+
+    * :attr:`rating`: average rating of the book.
+
+    * :attr:`num_ratings`: number of ratings of the book.
+
+    """
+
+    __slots__ = ('ratings', 'rating', 'num_ratings', '_quotes', '_quote_index', '_listed_quotes', '_all_quotes',
+                 '_identity', '_lock')
+
     def __init__(self, author_id, book_id, book_name=None, author_name=None, edition=None, year=None,
-                 ratings=None):
+                 ratings=None, rating=None, num_ratings=None):
         super().__init__(author_id, book_id, book_name=book_name, author_name=author_name, edition=edition,
                          year=year)
         self.ratings = ratings
+        if ratings and rating is None:
+            rating, num_ratings = decode_ratings(ratings)
+        self.rating = rating
+        self.num_ratings = num_ratings
         self._quotes = []
+        # Saved quotes, by id and name
+        self._quote_index = ItemIndex('quote_id', 'quote_name')
+        # Number of quotes added from the quote page of the book (the others come from the author quote page),
+        # and whether this page was scraped to the end
+        self._listed_quotes = 0
+        self._all_quotes = False
+        # Identity map of the client which built the book (see ``Author``)
+        self._identity = None
+        self._lock = None
+
+    def _parse_quotes(self, records):
+        # Build the quotes listed on one page of the book quote page
+        quotes = []
+        for record in records:
+            quote = get_shared(self._identity, 'quote', record['quote_id'],
+                               lambda: greads.Quote(self.author_id,
+                                                    record['quote_id'],
+                                                    text=record['text'],
+                                                    author_name=self.author_name,
+                                                    tags=record['tags']))
+            quote.likes = record['likes']
+            quotes.append(quote)
+        return quotes
 
-    def _search_quotes(self):
+    def _search_quotes(self, top_k=None):
         # Scrape online quotes from goodreads.com
-        self._quotes = []
+        self._clear_quotes()
         soup = self.connect()
-        href_a = scrape.get_book_quote_page(soup)
+        href_a = scrape.get_book_quote_page(soup) if soup is not None else None
         if href_a:
             href = href_a.get('href')
-            npage = 1
-            search = True
-
-            while search:
-                # Didn't found any quotes
-                search = False
-                # Navigate through the next page
-                href_page = href + self._next_page(npage=npage)
-                soup = self.connect(href=href_page)
-                npage += 1
-                for quote_div in scrape.scrape_quotes(soup):
-                    # Quotes found
-                    search = True
-                    quote_text = process_quote_text(scrape.get_quote_text(quote_div))
-                    quote_likes = eval(scrape.get_quote_likes(quote_div).text.replace('likes', '').strip())
-                    quote_href = scrape.get_quote_likes(quote_div).get('href')
-                    quote_id = quote_href.split('-')[0].split('.')[0]
-                    quote_tags = []
-                    for tag in scrape.scrape_quote_tags(quote_div):
-                        quote_tags.append(tag.text.strip())
-                    quote = greads.Quote(self.author_id,
-                                         quote_id,
-                                         text=quote_text,
-                                         author_name=self.author_name,
-                                         tags=quote_tags,
-                                         likes=quote_likes)
-                    self.add_quote(quote)
+            pages = self._search_pages(href, scrape.scrape_quotes_page, self._parse_quotes, top_k=top_k,
+                                       only=scrape.QUOTES_STRAINER)
+            for quotes in pages:
+                for quote in quotes:
+                    self._add_listed_quote(quote)
                     yield quote
+        # Fewer quotes than needed: there are no more
+        self._all_quotes = not top_k or self._listed_quotes < top_k
 
-    def quotes(self, cache=True):
+    def quotes(self, cache=True, top_k=None):
         """Yield all quotes from a book address.
         This function extract online data from `Good Reads` if nothing is already saved in the cache.
 
         Args:
             cache (bool): if ``True``, will look for cache items only (and won't scrape online).
+            top_k (int, optional): number of quotes needed, so that only the required pages are scraped.
 
         Returns:
             yield Quote
 
         """
-        if len(self._quotes) > 0 and cache:
-            yield from self._quotes
-        else:
-            yield from self._search_quotes()
+        if not (cache and self._has_quotes(top_k)):
+            with _get_lock(self):
+                # The quotes may have been scraped by another call in the meantime
+                if not (cache and self._has_quotes(top_k)):
+                    yield from self._search_quotes(top_k=top_k)
+                    return
+        yield from self._quotes
 
     def get_quotes(self, lang=None, top_k=None, cache=True):
         """Get all quotes from a book address.
@@ -83,13 +109,14 @@ class Book(BookMeta):
             list(Quote)
 
         """
-        # Reset the quotes saved in the cache if its length is under the threshold
-        if top_k and len(self._quotes) < top_k:
-            self._quotes = []
         # Get the top-k quotes, ordered from the book's quote page (usually it's ordered by popularity)
         quotes = []
-        for i, quote in enumerate(self.quotes(cache=cache)):
-            if not lang or langdetect.detect(quote.text) == lang:
+        candidates = self.quotes(cache=cache, top_k=top_k)
+        if lang:
+            # Detect the languages in batches, while the quotes are scraped
+            candidates = iter_detected(candidates)
+        for i, quote in enumerate(candidates):
+            if not lang or quote.lang == lang:
                 quote.register_book(self)
                 quotes.append(quote)
                 if top_k and i + 1 >= top_k:
@@ -107,7 +134,54 @@ class Book(BookMeta):
         quote.author_id = self.author_id
         quote.register_author(self.get_author())
         quote.register_book(self)
+        # A shared quote may be added again when the quotes of the author are scraped again
+        if self._quote_index.find('quote_id', quote.quote_id) is quote:
+            return
         self._quotes.append(quote)
+        self._quote_index.add(quote)
+
+    def _clear_quotes(self):
+        self._quotes = []
+        self._quote_index.clear()
+        self._listed_quotes = 0
+        self._all_quotes = False
+
+    def _add_listed_quote(self, quote):
+        # Add a quote from the quote page of the book, unless it is listed twice
+        listed = self._quote_index.find('quote_id', quote.quote_id) is quote
+        self.add_quote(quote)
+        self._listed_quotes += not listed
+
+    def _has_quotes(self, top_k=None):
+        # Whether the quotes already scraped hold the ``top_k`` first ones (all of them if ``top_k`` is not set).
+        # An empty list is scraped again, as its page may have failed to load
+        if self._listed_quotes > 0:
+            return self._all_quotes or bool(top_k) and self._listed_quotes >= top_k
+        # The quote page of the book was not scraped: the quotes added from the author's pages are used instead
+        return bool(self._quotes) and (not top_k or len(self._quotes) >= top_k)
+
+    def search_quote(self, quote_id, attr='quote_id', cache=True):
+        """Search a quote from the quotes saved in the book's cache.
+        Saved quotes are found from their id or name in constant time. Otherwise, quotes are scraped until found.
+
+        Args:
+            quote_id (string): quote'id to look for.
+            attr (string, optional): attribute to search the quote from. Options are ``'quote_id'`` and ``'quote_name'``
+            cache (bool): if ``True``, will look for cache items only (and won't scrape online).
+
+        Returns:
+            Quote
+
+        """
+        if cache and self._quotes and attr in self._quote_index.attrs:
+            quote = self._quote_index.find(attr, quote_id)
+            if quote is not None:
+                quote.register_book(self)
+            return quote
+        for quote in self.quotes(cache=cache):
+            if str(quote_id) == str(getattr(quote, attr)):
+                quote.register_book(self)
+                return quote
 
     # TODO: add nested JSON option
     def to_json(self, encode='ascii'):
@@ -124,10 +198,13 @@ class Book(BookMeta):
             'book': self.book_name,
             'edition': self.edition,
             'year': self.year,
+            'rating': self.rating,
+            'num_ratings': self.num_ratings,
             'quotes': [],
         }
+        # Quotes are encoded with the book, in one pass
         for quote in self.quotes():
-            data['quotes'].append(quote.to_json(encode=encode))
+            data['quotes'].append(quote.to_json(encode=None))
         if encode:
-            return serialize_dict(data)
+            return serialize(data)
         return data
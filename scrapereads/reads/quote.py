@@ -3,7 +3,6 @@ Defines a quote from an Author.
 """
 
 from abc import ABC, abstractmethod
-import langdetect
 
 from scrapereads.connect import connect
 from scrapereads.utils import *
@@ -15,6 +14,8 @@ class Quote(QuoteMeta):
 
     """
 
+    __slots__ = ()
+
     def __init__(self, author_id, quote_id, text='', quote_name=None, author_name=None, tags=None, likes=None):
         super().__init__(author_id, quote_id, text=text, quote_name=quote_name, author_name=author_name, tags=tags,
                          likes=likes)
@@ -41,5 +42,5 @@ class Quote(QuoteMeta):
             'quote': self.text,
         }
         if encode:
-            return serialize_dict(data)
+            return serialize(data)
         return data
\ No newline at end of file
@@ -0,0 +1,302 @@
+"""
+Retries and circuit breakers, so that transient failures of ``Good Reads`` servers (``429 Too Many Requests``,
+``503 Service Unavailable``, timeouts etc.) do not stop a whole crawl.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# Statuses worth trying again: rate limited, or the server is temporarily unavailable
+RETRY_STATUSES = frozenset([408, 425, 429, 500, 502, 503, 504])
+# Seconds between two checks of a half-open circuit, while its trial request is running
+PROBE_INTERVAL = 0.05
+
+
+def parse_retry_after(value):
+    """Parse a ``Retry-After`` header, given either in seconds or as an HTTP date.
+
+    Args:
+        value (string): value of the header.
+
+    Returns:
+        float: seconds to wait, or ``None`` if the header is missing or malformed.
+
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date is None:
+        return None
+    return max(0., date.timestamp() - time.time())
+
+
+class Backoff:
+    """Bounded retries, waiting exponentially longer between attempts.
+
+    * :attr:`retries`: number of attempts after the first one. ``0`` disables the retries.
+
+    * :attr:`backoff`: seconds to wait before the first retry. The wait doubles at each retry.
+
+    * :attr:`max_backoff`: maximum number of seconds to wait between two attempts.
+
+    * :attr:`jitter`: fraction of the wait drawn at random, so that workers failing together do not retry together.
+
+    Examples::
+        >>> backoff = Backoff(retries=3, backoff=0.5)
+        >>> [backoff.delay(attempt) for attempt in range(3)]
+            [0.41, 0.93, 1.62]
+
+    """
+
+    def __init__(self, retries=3, backoff=0.5, max_backoff=60, jitter=0.5, seed=None):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self, attempt, retry_after=None):
+        """Get the number of seconds to wait before trying again.
+
+        Args:
+            attempt (int): number of attempts that already failed, minus one.
+            retry_after (float, optional): seconds requested by the server (``Retry-After`` header).
+                It is honoured even if it is longer than :attr:`max_backoff`.
+
+        Returns:
+            float
+
+        """
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        with self._lock:
+            delay *= 1 - self.jitter * self._random.random()
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def __repr__(self):
+        rep = f'Backoff(retries={self.retries}, backoff={self.backoff}, max_backoff={self.max_backoff}, ' \
+              f'jitter={self.jitter})'
+        return rep
+
+
+class Circuit:
+    """Circuit of a single host.
+
+    While closed, the outcome of the last :attr:`window` requests is recorded.
+    When the fraction of failures reaches :attr:`threshold`, the circuit opens: every worker connecting to the host
+    waits for :attr:`cooldown` seconds. Then the circuit is half-open: a single trial request goes through, while the
+    other workers keep waiting, and its outcome closes the circuit (success) or opens it again (failure).
+    A trial request that never reports its outcome is replaced by another one after :attr:`cooldown` seconds.
+
+    """
+
+    def __init__(self, threshold=0.5, window=20, cooldown=30):
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self.state = 'closed'
+        self.trips = 0
+        self._outcomes = deque(maxlen=window)
+        self._open_until = 0
+        # Thread sending the trial request of the half-open circuit, and when it started
+        self._probe = None
+        self._probe_since = 0
+        self._lock = threading.Lock()
+
+    def _open(self, seconds):
+        self.state = 'open'
+        self.trips += 1
+        self._open_until = max(self._open_until, time.monotonic() + seconds)
+        self._outcomes.clear()
+        self._probe = None
+
+    def remaining(self, probe=True):
+        """Seconds before the host can be connected to again.
+        Once the cooldown is over, only the first caller can connect (the trial request), until it records its
+        outcome with ``record()`` from the same thread.
+
+        Args:
+            probe (bool): if ``False``, the caller does not take the trial request, it only waits while the circuit
+                is open or while another trial request is running (e.g. an event loop handing the request over to a
+                worker thread).
+
+        Returns:
+            float
+
+        """
+        with self._lock:
+            if self.state == 'closed':
+                return 0
+            now = time.monotonic()
+            if self.state == 'open':
+                remaining = self._open_until - now
+                if remaining > 0:
+                    return remaining
+                self.state = 'half-open'
+                self._probe = None
+            # Half-open: a single request tries the host
+            thread = threading.get_ident()
+            if self._probe is None or self._probe == thread or now - self._probe_since > self.cooldown:
+                if probe:
+                    self._probe = thread
+                    self._probe_since = now
+                    return 0
+                if self._probe is None:
+                    return 0
+            return PROBE_INTERVAL
+
+    def record(self, success):
+        """Record the outcome of a request.
+
+        Args:
+            success (bool): ``False`` if the request failed with a transient error.
+
+        """
+        with self._lock:
+            if self.state == 'half-open':
+                # Requests started before the circuit opened do not decide for the trial request
+                if self._probe != threading.get_ident():
+                    return None
+                self._probe = None
+                if success:
+                    self.state = 'closed'
+                else:
+                    self._open(self.cooldown)
+                return None
+            self._outcomes.append(success)
+            # Wait for a few outcomes, so that a single failure does not open the circuit
+            if len(self._outcomes) >= min(self.window, 5):
+                failures = self._outcomes.count(False)
+                if failures / len(self._outcomes) >= self.threshold:
+                    self._open(self.cooldown)
+
+    def pause(self, seconds):
+        """Open the circuit for some time, e.g. when the server asks to slow down with ``Retry-After``.
+
+        Args:
+            seconds (float): seconds to wait.
+
+        """
+        with self._lock:
+            self._open(seconds)
+
+    def __repr__(self):
+        rep = f'Circuit(state={self.state!r}, threshold={self.threshold}, window={self.window}, ' \
+              f'cooldown={self.cooldown})'
+        return rep
+
+
+class CircuitBreaker:
+    """Circuit breaker keeping one circuit per host.
+
+    * :attr:`threshold`: fraction of failed requests opening the circuit of a host. ``None`` disables the breaker.
+
+    * :attr:`window`: number of recent requests the failure rate is computed on.
+
+    * :attr:`cooldown`: seconds all workers wait once the circuit of a host is open.
+
+    Examples::
+        >>> breaker = CircuitBreaker(threshold=0.5, window=20, cooldown=30)
+        >>> breaker.wait('https://www.goodreads.com/author/show/3389')
+        >>> breaker.record('https://www.goodreads.com/author/show/3389', success=False)
+
+    """
+
+    def __init__(self, threshold=0.5, window=20, cooldown=30):
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def circuit(self, url):
+        """Get the circuit of the host of an url.
+
+        Args:
+            url (string): url path.
+
+        Returns:
+            Circuit
+
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._circuits:
+                self._circuits[host] = Circuit(self.threshold, window=self.window, cooldown=self.cooldown)
+            return self._circuits[host]
+
+    @property
+    def trips(self):
+        """Number of times a circuit opened."""
+        with self._lock:
+            return sum(circuit.trips for circuit in self._circuits.values())
+
+    def wait(self, url):
+        """Wait (blocking) until the circuit of the host of ``url`` is not open.
+
+        Args:
+            url (string): url path.
+
+        """
+        if self.threshold is None:
+            return None
+        circuit = self.circuit(url)
+        remaining = circuit.remaining()
+        while remaining > 0:
+            time.sleep(remaining)
+            remaining = circuit.remaining()
+
+    async def wait_async(self, url):
+        """Wait (without blocking the event loop) until the circuit of the host of ``url`` is not open.
+
+        Args:
+            url (string): url path.
+
+        """
+        if self.threshold is None:
+            return None
+        circuit = self.circuit(url)
+        # The trial request is taken by the worker thread sending it
+        remaining = circuit.remaining(probe=False)
+        while remaining > 0:
+            await asyncio.sleep(remaining)
+            remaining = circuit.remaining(probe=False)
+
+    def record(self, url, success):
+        """Record the outcome of a request to the host of ``url``.
+
+        Args:
+            url (string): url path.
+            success (bool): ``False`` if the request failed with a transient error.
+
+        """
+        if self.threshold is not None:
+            self.circuit(url).record(success)
+
+    def pause(self, url, seconds):
+        """Pause all the workers connecting to the host of ``url``.
+
+        Args:
+            url (string): url path.
+            seconds (float): seconds to wait.
+
+        """
+        if self.threshold is not None and seconds:
+            self.circuit(url).pause(seconds)
+
+    def __repr__(self):
+        rep = f'CircuitBreaker(threshold={self.threshold}, window={self.window}, cooldown={self.cooldown})'
+        return rep
@@ -4,6 +4,13 @@ Scrape quotes, books and authors from ``Good Reads`` website.
 
 import bs4
 from .utils import *
+from .decode import decode_likes, decode_ratings, decode_year
+
+# Parts of a page needed to extract the items of a list (see ``connect(url, only=...)``)
+QUOTES_STRAINER = bs4.SoupStrainer('div', attrs={'class': 'quotes'})
+AUTHOR_BOOKS_STRAINER = bs4.SoupStrainer('table', attrs={'class': 'tableList'})
+AUTHOR_NAME_STRAINER = bs4.SoupStrainer('h1', attrs={'class': 'authorName'})
+SIMILAR_AUTHORS_STRAINER = bs4.SoupStrainer('a', attrs={'class': 'gr-h3 gr-h3--serif gr-h3--noMargin'})
 
 
 def get_author_name(soup):
@@ -27,6 +34,21 @@ def get_author_name(soup):
     return author_h1.find('span').text
 
 
+def scrape_author_name(soup):
+    """Extract the author's name from its main page, possibly parsed with ``AUTHOR_NAME_STRAINER`` only.
+
+    Args:
+        soup (bs4.element.Tag): connection to the author page.
+
+    Returns:
+        string: name of the author, or ``None`` if the page does not show it.
+
+    """
+    author_h1 = soup.find('h1', attrs={'class': 'authorName'})
+    author_span = author_h1.find('span') if author_h1 is not None else None
+    return author_span.text if author_span is not None else None
+
+
 def get_author_desc(soup):
     """Get the author description / biography.
 
@@ -222,6 +244,81 @@ def get_quote_likes(quote_div):
     return quote_footer.find('a', attrs={'class': 'smallText'})
 
 
+def get_quote_record(quote_div):
+    """Extract all the data of a ``<div>`` quote element.
+    The element is walked only once, instead of searching it again for each field.
+
+    Args:
+        quote_div (bs4.element.Tag): ``<div>`` quote element from a quote page.
+
+    Returns:
+        dict: quote id, text, likes, tags and the id and name of the book it comes from (if any).
+
+    """
+    text_div = book_title = tags_div = footer_div = likes_a = None
+    # Depth-first walk, in document order, remembering if a node is inside the text or the footer of the quote
+    stack = [(child, False, False) for child in reversed(quote_div.contents)]
+    while stack:
+        node, in_text, in_footer = stack.pop()
+        name = node.name
+        if name is None:
+            continue
+        classes = node.get('class') or ()
+        if name == 'div':
+            if text_div is None and 'quoteText' in classes:
+                text_div = node
+                in_text = True
+            if footer_div is None and 'quoteFooter' in classes:
+                footer_div = node
+                in_footer = True
+            if tags_div is None and ' '.join(classes) == 'greyText smallText left':
+                tags_div = node
+        elif name == 'a':
+            if in_text and book_title is None and 'authorOrTitle' in classes:
+                book_title = node
+            if in_footer and likes_a is None and 'smallText' in classes:
+                likes_a = node
+        stack.extend((child, in_text, in_footer) for child in reversed(node.contents))
+
+    quote_text = ''
+    for text in text_div.children:
+        if text.name == 'br':
+            quote_text += '\n'
+        elif not text.name:
+            quote_text += text.strip()
+    quote_tags = []
+    if tags_div is not None:
+        quote_tags = [tag.text.strip() for tag in tags_div.children if tag.name == 'a']
+    book_id = book_name = None
+    if book_title is not None:
+        book_id = book_title.get('href').split('/')[-1].split('-')[0].split('.')[0]
+        book_name = book_title.text.strip()
+    return {
+        'quote_id': likes_a.get('href').split('-')[0].split('.')[0],
+        'text': clean_quote_text(quote_text),
+        'likes': decode_likes(likes_a.text),
+        'tags': quote_tags,
+        'book_id': book_id,
+        'book_name': book_name,
+    }
+
+
+def scrape_quotes_page(soup):
+    """Extract all the quotes of a quote page, with the number of pages of the list.
+
+    Args:
+        soup (bs4.element.Tag): connection to the quote page.
+
+    Returns:
+        dict: quote records (see ``get_quote_record()``) and number of pages.
+
+    """
+    return {
+        'items': [get_quote_record(quote_div) for quote_div in scrape_quotes(soup)],
+        'num_pages': get_page_count(soup),
+    }
+
+
 # TODO: deprecate this
 def get_quote_name_id(quote_div):
     """Get the name and id of a ``<div>`` quote element.
@@ -371,10 +468,69 @@ def get_author_book_date(book_tr):
 
     """
     book_details = book_tr.find('span', attrs={'class': 'greyText smallText uitext'})
-    book_publish = book_details.contents[-1].replace('—', '').replace('\n', '')
-    book_date = book_publish.replace('published', '').strip()
-    book_date = eval(book_date) if book_date != '' else None
-    return book_date
+    return decode_year(book_details.contents[-1])
+
+
+def get_author_book_record(book_tr):
+    """Extract all the data of a table ``<tr>`` element from an author page.
+
+    Args:
+        book_tr (bs4.element.Tag): ``<tr>`` book element.
+
+    Returns:
+        dict: book id, name, ratings (raw text, average rating and number of ratings), edition and year of
+            publication.
+
+    """
+    book_title = get_author_book_title(book_tr)
+    book_href = book_title.get('href')
+    book_id = book_href.split('/')[-1].split('-')[0].split('.')[0]
+    book_name = book_title.text.strip().title()
+    ratings = str(get_author_book_ratings(book_tr).contents[-1])
+    rating, num_ratings = decode_ratings(ratings)
+    edition = get_author_book_edition(book_tr)
+    edition = edition.text.strip() if edition else None
+    year = get_author_book_date(book_tr)
+    return {
+        'book_id': book_id,
+        'book_name': book_name,
+        'ratings': ratings,
+        'rating': rating,
+        'num_ratings': num_ratings,
+        'edition': edition,
+        'year': year,
+    }
+
+
+def scrape_author_books_page(soup):
+    """Extract all the books of an author books page, with the number of pages of the list.
+
+    Args:
+        soup (bs4.element.Tag): connection to an author books page.
+
+    Returns:
+        dict: book records (see ``get_author_book_record()``) and number of pages.
+
+    """
+    return {
+        'items': [get_author_book_record(book_tr) for book_tr in scrape_author_books(soup)],
+        'num_pages': get_page_count(soup),
+    }
+
+
+def scrape_similar_authors(soup):
+    """Extract the authors listed on the similar authors page of an author.
+
+    Args:
+        soup (bs4.element.Tag): connection to the similar authors page.
+
+    Returns:
+        list: urls of the similar authors, the most similar first.
+
+    """
+    authors_a = soup.findAll('a', attrs={'class': 'gr-h3 gr-h3--serif gr-h3--noMargin'})
+    # The first author is the one whose similar authors are listed
+    return [author_a.attrs['href'] for author_a in authors_a[1:]]
 
 
 def get_book_quote_page(soup):
@@ -386,7 +542,32 @@ def get_book_quote_page(soup):
     Returns:
 
     """
-    quote_div = soup.findAll('div', attrs={'class': ' clearFloats bigBox'})
+    quote_div = soup.findAll('div', attrs={'class': 'clearFloats bigBox'})
     if quote_div:
         return quote_div[-1].find('a')
     return None
+
+
+def get_page_count(soup):
+    """Get the number of pages of a paginated list (quotes, books), from its pagination widget.
+
+    Args:
+        soup (bs4.element.Tag): connection to the first page of the list.
+
+    Returns:
+        int: number of pages, or ``None`` if the page does not have a pagination widget.
+
+    Examples::
+        >>> from scrapereads import connect
+        >>> url = 'https://www.goodreads.com/author/quotes/3389.Stephen_King'
+        >>> soup = connect(url)
+        >>> get_page_count(soup)
+            100
+
+    """
+    next_page = soup.find(attrs={'class': 'next_page'})
+    if not next_page:
+        return None
+    # The widget lists the first, current and last page numbers
+    numbers = [int(item.text) for item in next_page.parent.findAll(['a', 'em']) if item.text.strip().isdigit()]
+    return max(numbers) if numbers else None
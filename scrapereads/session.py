@@ -0,0 +1,128 @@
+"""
+Keep-alive HTTP session used to connect to ``Good Reads`` servers.
+Connections are pooled per host, so paginated pages re-use the same sockets instead of opening a new one each time.
+Pages are downloaded compressed when the server supports it, and decoded while they are received.
+"""
+
+import functools
+import threading
+import urllib3
+from urllib3.util.request import ACCEPT_ENCODING
+
+CHUNK_SIZE = 64 * 1024
+
+
+class Session:
+    """Reusable HTTP session, with a bounded pool of keep-alive connections per host.
+
+    * :attr:`pool_size`: maximum number of connections kept alive for a single host.
+
+    * :attr:`num_pools`: maximum number of hosts to keep a pool for.
+
+    * :attr:`headers`: default headers sent with every request.
+
+    * :attr:`compress`: if ``True``, ask for compressed pages (``gzip``, ``deflate``, and ``br`` if ``brotli``
+      is installed).
+
+    * :attr:`stats`: number of bytes received over the wire (``compressed``) and once decoded (``uncompressed``).
+
+    Examples::
+        >>> with Session(pool_size=4) as session:
+        ...     response = session.request('https://www.goodreads.com/author/show/3389')
+        ...     response.status
+            200
+
+    """
+
+    def __init__(self, pool_size=10, num_pools=10, headers=None, compress=True):
+        self.pool_size = pool_size
+        self.num_pools = num_pools
+        self.compress = compress
+        self.headers = {'Accept-Encoding': ACCEPT_ENCODING if compress else 'identity', **(headers or {})}
+        self.stats = {'compressed': 0, 'uncompressed': 0}
+        self._lock = threading.Lock()
+        # ``block=True`` bounds the pool: threads wait for a free connection instead of opening extra ones
+        self._manager = urllib3.PoolManager(num_pools=num_pools, maxsize=pool_size, block=True,
+                                            headers=self.headers)
+
+    def _pools(self):
+        return [self._manager.pools[key] for key in self._manager.pools.keys()]
+
+    @property
+    def num_connections(self):
+        """Number of connections (i.e. TCP / TLS handshakes) opened since the session was created."""
+        return sum(pool.num_connections for pool in self._pools())
+
+    @property
+    def num_requests(self):
+        """Number of requests sent through the session."""
+        return sum(pool.num_requests for pool in self._pools())
+
+    def request(self, url, headers=None, method='GET', timeout=None, stream=False):
+        """Send a request through a pooled connection.
+
+        Args:
+            url (string): url path.
+            headers (dict, optional): headers to add to the default ones.
+            method (string, optional): HTTP method to use.
+            timeout (float, optional): seconds to wait for the connection, and then between two received packets.
+                If ``None``, wait forever.
+            stream (bool, optional): if ``True``, the body is not read, so that it can be decoded chunk by chunk
+                with ``iter_content()``.
+
+        Returns:
+            urllib3.response.HTTPResponse
+
+        """
+        # Redirections are followed (like ``urllib.request.urlopen``), but failures are not retried here
+        retries = urllib3.Retry(total=None, connect=0, read=0, status=0, redirect=10)
+        return self._manager.request(method, url, headers={**self.headers, **(headers or {})}, retries=retries,
+                                     timeout=urllib3.Timeout(connect=timeout, read=timeout), preload_content=not stream)
+
+    def iter_content(self, response, chunk_size=CHUNK_SIZE):
+        """Read and decode the body of a streamed response, chunk by chunk.
+        The connection is released to the pool once the body is read.
+
+        Args:
+            response (urllib3.response.HTTPResponse): response of ``request(url, stream=True)``.
+            chunk_size (int, optional): maximum number of bytes to read at once.
+
+        Returns:
+            yield bytes
+
+        """
+        decoded = 0
+        done = False
+        try:
+            if hasattr(response, 'read1'):
+                # Yield the bytes as soon as they are received, without waiting for ``chunk_size`` bytes
+                chunks = iter(functools.partial(response.read1, chunk_size, decode_content=True), b'')
+            else:
+                # urllib3 < 2 has no ``read1()``: chunks are yielded once ``chunk_size`` bytes are received
+                chunks = response.stream(chunk_size, decode_content=True)
+            for chunk in chunks:
+                decoded += len(chunk)
+                yield chunk
+            done = True
+        finally:
+            # A partly read connection cannot be re-used
+            if not done:
+                response.close()
+            response.release_conn()
+            with self._lock:
+                self.stats['compressed'] += response.tell()
+                self.stats['uncompressed'] += decoded
+
+    def close(self):
+        """Close all pooled connections."""
+        self._manager.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        rep = f'Session(pool_size={self.pool_size}, num_pools={self.num_pools})'
+        return rep
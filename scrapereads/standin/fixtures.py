@@ -0,0 +1,359 @@
+"""
+Realistic fixture pages, mimicking the markup of ``Good Reads`` author, book, quote and similar-author pages.
+All pages are generated from a seed, so the same library always serves the same content.
+"""
+
+import math
+import random
+import html
+
+from scrapereads.utils import name_to_goodreads
+
+QUOTES_PER_PAGE = 30
+BOOKS_PER_PAGE = 30
+
+AUTHORS = [
+    (3389, 'Stephen King'),
+    (1077326, 'J.K. Rowling'),
+    (4379, 'Sylvia Plath'),
+    (1265, 'Jane Austen'),
+    (957894, 'Albert Camus'),
+    (4178, 'Emily Brontë'),
+    (947, 'William Shakespeare'),
+    (1244, 'Mark Twain'),
+    (5144, 'James Joyce'),
+    (2622245, 'Gabriel García Márquez'),
+]
+
+WORDS = ['the', 'a', 'book', 'life', 'love', 'is', 'and', 'of', 'to', 'you', 'we', 'never', 'always', 'dream',
+         'night', 'world', 'heart', 'read', 'write', 'time', 'words', 'magic', 'déjà', 'vu', 'naïve', 'café',
+         'self', 'truth', 'light', 'dark', 'I', 'it', 'was', 'in', 'on', 'what', 'more', 'less', 'forever']
+
+TAGS = ['books', 'magic', 'reading', 'writing', 'life', 'love', 'humor', 'god', 'religion', 'inspirational',
+        'philosophy', 'poetry', 'death', 'hope', 'fiction', 'truth', 'wisdom', 'écriture']
+
+GENRES = ['Horror', 'Fiction', 'Fantasy', 'Poetry', 'Classics', 'Literary Fiction', 'Mystery']
+
+
+class Library:
+    """Deterministic collection of authors, books and quotes served by the stand-in server.
+
+    * :attr:`authors`: dictionary of author ids to author names.
+
+    * :attr:`num_quotes`: number of quotes per author.
+
+    * :attr:`num_books`: number of books per author.
+
+    """
+
+    def __init__(self, authors=None, num_quotes=300, num_books=60, num_book_quotes=45, seed=42):
+        self.authors = dict(authors or AUTHORS)
+        self.num_quotes = num_quotes
+        self.num_books = num_books
+        self.num_book_quotes = num_book_quotes
+        self.seed = seed
+        self._cache = {}
+
+    def _random(self, *key):
+        return random.Random(repr((self.seed,) + key))
+
+    def _sentence(self, rng, min_words=4, max_words=24):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+        return ' '.join(words).capitalize() + rng.choice(['.', '!', '?', '...'])
+
+    def author_name(self, author_id):
+        if author_id in self.authors:
+            return self.authors[author_id]
+        return f'Author {author_id}'
+
+    def books(self, author_id):
+        """Books written by an author, as a list of ``(book_id, title, year, editions, rating, num_ratings)``."""
+        key = ('books', author_id)
+        if key not in self._cache:
+            rng = self._random(*key)
+            books = []
+            for i in range(self.num_books):
+                book_id = author_id * 1000 + i + 1
+                title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 5))).title()
+                year = rng.randint(1800, 2020) if rng.random() > 0.2 else None
+                editions = rng.randint(1, 500)
+                rating = round(rng.uniform(2.5, 4.9), 2)
+                num_ratings = rng.randint(1, 3_000_000)
+                books.append((book_id, title, year, editions, rating, num_ratings))
+            self._cache[key] = books
+        return self._cache[key]
+
+    def book(self, book_id):
+        author_id = book_id // 1000
+        for book in self.books(author_id):
+            if book[0] == book_id:
+                return author_id, book
+        return author_id, None
+
+    def quotes(self, author_id, book_id=None):
+        """Quotes of an author (or of a single book), as a list of ``(quote_id, text, likes, tags, book)``."""
+        key = ('quotes', author_id, book_id)
+        if key not in self._cache:
+            rng = self._random(*key)
+            books = self.books(author_id)
+            quotes = []
+            num_quotes = self.num_book_quotes if book_id else self.num_quotes
+            for i in range(num_quotes):
+                quote_id = (book_id or author_id) * 10000 + i + 1
+                lines = [self._sentence(rng) for _ in range(rng.choice([1, 1, 1, 2, 3]))]
+                text = '\n'.join(lines)
+                likes = max(1, int(100000 / (i + 1)) + rng.randint(0, 50))
+                tags = rng.sample(TAGS, rng.randint(0, 4))
+                if book_id:
+                    book = self.book(book_id)[1]
+                else:
+                    book = rng.choice(books) if books and rng.random() > 0.5 else None
+                quotes.append((quote_id, text, likes, tags, book))
+            self._cache[key] = quotes
+        return self._cache[key]
+
+    def similar_authors(self, author_id, count=20):
+        ids = [other for other in self.authors if other != author_id]
+        rng = self._random('similar', author_id)
+        rng.shuffle(ids)
+        # Unknown authors are generated on the fly, so that similar-author crawls can go deep
+        ids += [author_id * 7 + i for i in range(1, count - len(ids) + 1)]
+        return ids[:count]
+
+
+def author_slug(name):
+    return name_to_goodreads(name.replace('_', ' ').title())
+
+
+def book_slug(title):
+    return name_to_goodreads(title)
+
+
+def pagination(href, npage, num_pages):
+    """Pagination widget, shown at the top of paginated list pages."""
+    if num_pages <= 1:
+        return ''
+    items = []
+    if npage > 1:
+        items.append(f'<a class="previous_page" rel="prev" href="{href}?page={npage - 1}">« previous</a>')
+    else:
+        items.append('<span class="previous_page disabled">« previous</span>')
+    shown = sorted({1, 2, num_pages - 1, num_pages} | set(range(max(1, npage - 3), min(num_pages, npage + 3) + 1)))
+    last = 0
+    for page in shown:
+        if page < 1 or page > num_pages:
+            continue
+        if page > last + 1:
+            items.append('<span class="gap">&hellip;</span>')
+        if page == npage:
+            items.append(f'<em class="current">{page}</em>')
+        else:
+            items.append(f'<a href="{href}?page={page}">{page}</a>')
+        last = page
+    if npage < num_pages:
+        items.append(f'<a class="next_page" rel="next" href="{href}?page={npage + 1}">next »</a>')
+    else:
+        items.append('<span class="next_page disabled">next »</span>')
+    return '<div style="float: right">\n<div>\n' + '\n'.join(items) + '\n</div>\n</div>\n'
+
+
+def _chrome():
+    """Markup surrounding the content of every page (scripts, menus, sidebar, footer), which makes up most of
+    a real ``Good Reads`` page."""
+    rng = random.Random('chrome')
+    scripts = ''.join(f'<script type="text/javascript">\n//<![CDATA[\nvar module{i} = {{"id": {i}, "flags": '
+                      f'[{", ".join(str(rng.randint(0, 9999)) for _ in range(60))}]}};\n//]]>\n</script>\n'
+                      for i in range(12))
+    metas = ''.join(f'<meta name="meta{i}" content="{rng.choice(WORDS)} {rng.choice(WORDS)}"/>\n' for i in range(20))
+    genres = ''.join(f'<li class="menuLink"><a class="siteHeader__subNavLink" href="/genres/{word}">'
+                     f'{word.title()}</a></li>\n' for word in WORDS + GENRES)
+    header = ('<div class="siteHeader"><header><nav class="siteHeader__primaryNavInline"><ul role="menu">'
+              '<li><a href="/">Home</a></li><li><a href="/review/list">My Books</a></li>'
+              '<li><a href="/recommendations">Browse</a>'
+              f'<div class="siteHeader__subNav"><ul class="siteHeader__subNavList">{genres}</ul></div></li>'
+              '<li><a href="/group">Community</a></li><li><a href="/quotes">Quotes</a></li></ul></nav>'
+              '<form class="searchBox" action="/search" method="get"><input type="text" name="q"/></form>'
+              '</header></div>\n')
+    tags = ''.join(f'<li class="greyText"><a class="gr-hyperlink" href="/quotes/tag/{tag}">{tag}</a> '
+                   f'<span class="smallText">{rng.randint(100, 99999):,}</span></li>\n' for tag in TAGS * 4)
+    sidebar = ('<div class="rightContainer"><div class="bigBox">'
+               '<div class="h2Container gradientHeaderContainer"><h2 class="brownBackground">Popular quotes tags'
+               f'</h2></div><div class="bigBoxBody"><ul class="listTagsTwoColumn">{tags}</ul></div></div>'
+               '<div id="adSidebar" class="gr-adSidebar"><iframe src="/ads/sidebar"></iframe></div></div>\n')
+    links = ''.join(f'<a class="gr-hyperlink" href="/about/{word}">{word.title()}</a>\n' for word in WORDS)
+    footer = f'<div class="siteFooter"><footer><p>&copy; 2020 Goodreads, Inc.</p>{links}</footer></div>\n'
+    return metas + scripts, header, sidebar + footer
+
+
+CHROME = _chrome()
+
+
+def layout(title, body):
+    metas, header, footer = CHROME
+    head = ('<!DOCTYPE html>\n<html class="desktop">\n<head>\n'
+            f'<title>{html.escape(title)}</title>\n'
+            '<meta content="text/html; charset=UTF-8" http-equiv="Content-Type"/>\n'
+            f'{metas}'
+            '<link rel="stylesheet" media="all" href="/assets/goodreads.css"/>\n'
+            '</head>\n<body>\n'
+            f'{header}<div class="content">\n<div class="mainContentContainer">\n<div class="mainContent">\n')
+    tail = f'</div>\n</div>\n{footer}</div>\n</body>\n</html>\n'
+    return head + body + tail
+
+
+def author_page(library, author_id):
+    name = library.author_name(author_id)
+    rng = library._random('author', author_id)
+    genres = rng.sample(GENRES, 3)
+    influences = rng.sample([other for other in library.authors.values() if other != name], 3)
+    genres_a = ', '.join(f'<a href="/genres/{genre.lower()}">{genre}</a>' for genre in genres)
+    influences_a = ', '.join(f'<a href="/author/show/{i}">{influence}</a>' for i, influence in enumerate(influences))
+    description = ' '.join(library._sentence(rng, 8, 30) for _ in range(6))
+    body = ('<div class="mainContentFloat">\n'
+            '<div class="leftContainer authorLeftContainer"><img alt="" src="/photo/author.jpg"/></div>\n'
+            '<div class="rightContainer">\n'
+            f'<div class="authorName__container"><h1 class="authorName"><span itemprop="name">{html.escape(name)}'
+            '</span></h1></div>\n'
+            '<br class="clear"/>\n'
+            '<div class="dataTitle">Born</div>\n'
+            'in Portland, Maine, The United States\n'
+            '<div class="clear"></div>\n'
+            '<div class="dataTitle">Website</div>\n'
+            f'<div class="dataItem"><a href="http://example.com/{author_id}">http://example.com/{author_id}</a></div>\n'
+            '<div class="dataTitle">Genre</div>\n'
+            f'<div class="dataItem">{genres_a}</div>\n'
+            '<div class="dataTitle">Influences</div>\n'
+            f'<div class="dataItem"><span id="freeTextContainer{author_id}">{influences[0]}</span>'
+            f'<span id="freeText{author_id}" style="display:none">{influences_a}</span></div>\n'
+            '<div class="dataTitle">Member Since</div>\n'
+            '<div class="dataItem">February 2010</div>\n'
+            f'<div class="aboutAuthorInfo"><span id="freeTextContainerauthor{author_id}">{description[:80]}</span>'
+            f'<span id="freeTextauthor{author_id}" style="display:none">{description}<br/>'
+            f'<i>{html.escape(name)}</i> lives in Maine.</span></div>\n'
+            '</div>\n</div>\n')
+    return layout(f'{name} (Author of many books)', body)
+
+
+def quote_div(library, author_id, quote):
+    quote_id, text, likes, tags, book = quote
+    name = library.author_name(author_id)
+    lines = '\n<br/>'.join(html.escape(line) for line in text.split('\n'))
+    book_a = ''
+    if book:
+        book_a = (f'\n<span id="quote_book_link_{book[0]}">\n'
+                  f'<a class="authorOrTitle" href="/work/quotes/{book[0]}-{book_slug(book[1]).lower()}">'
+                  f'{html.escape(book[1])}</a>\n</span>')
+    tags_div = ''
+    if tags:
+        tags_a = ', '.join(f'<a href="/quotes/tag/{tag}">{tag}</a>' for tag in tags)
+        tags_div = f'<div class="greyText smallText left">\ntags:\n{tags_a}\n</div>\n'
+    slug = '-'.join(text.lower().split()[:5]).replace('.', '').replace('!', '').replace('?', '')
+    return ('<div class="quote mediumText ">\n'
+            '<div class="quoteDetails ">\n'
+            f'<a class="leftAlignedImage" href="/author/show/{author_id}"><img alt="{html.escape(name)}" '
+            'src="/photo/author.jpg"/></a>\n'
+            '<div class="quoteText">\n'
+            f'      “{lines}”\n'
+            '  <br/>  ―\n'
+            f'  <span class="authorOrTitle">\n    {html.escape(name)},\n  </span>{book_a}\n'
+            '</div>\n'
+            '<div class="quoteFooter">\n'
+            f'{tags_div}'
+            f'<div class="right">\n<a class="smallText" title="View this quote" '
+            f'href="/quotes/{quote_id}-{slug}">{likes} likes</a>\n</div>\n'
+            '</div>\n</div>\n</div>\n')
+
+
+def quotes_page(library, author_id, quotes, href, title, npage):
+    num_pages = max(1, math.ceil(len(quotes) / QUOTES_PER_PAGE))
+    start = (npage - 1) * QUOTES_PER_PAGE
+    page_quotes = quotes[start:start + QUOTES_PER_PAGE]
+    divs = ''.join(quote_div(library, author_id, quote) for quote in page_quotes)
+    body = (f'<h1>{html.escape(title)}</h1>\n'
+            f'{pagination(href, npage, num_pages) if page_quotes else ""}'
+            f'<div class="quotes">\n{divs}</div>\n'
+            f'{pagination(href, npage, num_pages) if page_quotes else ""}')
+    return layout(title, body)
+
+
+def author_quotes_page(library, author_id, npage=1):
+    name = library.author_name(author_id)
+    href = f'/author/quotes/{author_id}.{author_slug(name)}'
+    return quotes_page(library, author_id, library.quotes(author_id), href, f'{name} Quotes', npage)
+
+
+def book_tr(library, author_id, book):
+    book_id, title, year, editions, rating, num_ratings = book
+    name = library.author_name(author_id)
+    published = f'\n—\npublished\n{year}\n' if year else '\n'
+    return ('<tr itemscope itemtype="http://schema.org/Book">\n'
+            f'<td width="5%" valign="top"><a title="{html.escape(title)}" href="/book/show/{book_id}.{book_slug(title)}">'
+            '<img class="bookCover" src="/photo/book.jpg"/></a></td>\n'
+            '<td width="100%" valign="top">\n'
+            f'<a class="bookTitle" itemprop="url" href="/book/show/{book_id}.{book_slug(title)}">'
+            f'<span itemprop="name" role="heading" aria-level="4">{html.escape(title)}</span></a>\n<br/>\n'
+            '<span class="by">by</span>\n'
+            '<span itemprop="author" itemscope="" itemtype="http://schema.org/Person">\n'
+            f'<div class="authorName__container"><a class="authorName" itemprop="url" '
+            f'href="https://www.goodreads.com/author/show/{author_id}.{author_slug(name)}">'
+            f'<span itemprop="name">{html.escape(name)}</span></a></div>\n</span>\n<br/>\n'
+            '<div>\n<span class="greyText smallText uitext">\n'
+            '<span class="minirating"><span class="stars staticStars notranslate" title="it was amazing">'
+            '<span class="staticStar p10" size="12x12"></span></span>'
+            f' {rating:.2f} avg rating — {num_ratings:,} ratings</span>\n'
+            f'—\n<a class="greyText" rel="nofollow" href="/work/editions/{book_id}-{book_slug(title).lower()}">'
+            f'{editions} editions</a>{published}</span>\n</div>\n'
+            '</td>\n</tr>\n')
+
+
+def author_books_page(library, author_id, npage=1):
+    name = library.author_name(author_id)
+    href = f'/author/list/{author_id}.{author_slug(name)}'
+    books = library.books(author_id)
+    num_pages = max(1, math.ceil(len(books) / BOOKS_PER_PAGE))
+    start = (npage - 1) * BOOKS_PER_PAGE
+    page_books = books[start:start + BOOKS_PER_PAGE]
+    rows = ''.join(book_tr(library, author_id, book) for book in page_books)
+    widget = pagination(href, npage, num_pages) if page_books else ''
+    body = (f'<h1>Books by {html.escape(name)}</h1>\n{widget}'
+            f'<table class="tableList">\n{rows}</table>\n{widget}')
+    return layout(f'Books by {name}', body)
+
+
+def book_page(library, book_id):
+    author_id, book = library.book(book_id)
+    if not book:
+        return None
+    name = library.author_name(author_id)
+    title = book[1]
+    body = (f'<h1 id="bookTitle">{html.escape(title)}</h1>\n'
+            f'<div id="bookAuthors"><a class="authorName" href="/author/show/{author_id}.{author_slug(name)}">'
+            f'{html.escape(name)}</a></div>\n'
+            '<div class=" clearFloats bigBox"><div class="h2Container gradientHeaderContainer">'
+            '<h2 class="brownBackground">Lists with this book</h2></div></div>\n'
+            '<div class=" clearFloats bigBox"><div class="h2Container gradientHeaderContainer">'
+            f'<h2 class="brownBackground"><a href="/work/quotes/{book_id}-{book_slug(title).lower()}">'
+            f'Quotes from {html.escape(title)}</a></h2></div></div>\n')
+    return layout(f'{title} by {name}', body)
+
+
+def book_quotes_page(library, book_id, npage=1):
+    author_id, book = library.book(book_id)
+    if not book:
+        return None
+    href = f'/work/quotes/{book_id}-{book_slug(book[1]).lower()}'
+    quotes = library.quotes(author_id, book_id=book_id)
+    return quotes_page(library, author_id, quotes, href, f'{book[1]} Quotes', npage)
+
+
+def similar_authors_page(library, author_id):
+    name = library.author_name(author_id)
+    items = []
+    for other in [author_id] + library.similar_authors(author_id):
+        other_name = library.author_name(other)
+        items.append('<div class="u-paddingBottomMedium">'
+                     f'<a class="gr-h3 gr-h3--serif gr-h3--noMargin" itemprop="url" '
+                     f'href="https://www.goodreads.com/author/show/{other}.{author_slug(other_name)}">'
+                     f'<span itemprop="name">{html.escape(other_name)}</span></a></div>\n')
+    body = f'<h1>Authors similar to {html.escape(name)}</h1>\n' + ''.join(items)
+    return layout(f'Authors similar to {name}', body)
@@ -0,0 +1,184 @@
+"""
+Local HTTP server standing in for ``Good Reads``, used to measure the scraper without hitting goodreads.com.
+"""
+
+import gzip
+import hashlib
+import random
+import re
+import threading
+import time
+import zlib
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from . import fixtures
+
+LAST_MODIFIED = formatdate(1577836800, usegmt=True)
+
+ROUTES = [
+    (re.compile(r'^/author/show/(\d+)(?:\.[^/]*)?$'), 'author'),
+    (re.compile(r'^/author/list/(\d+)(?:\.[^/]*)?$'), 'author_books'),
+    (re.compile(r'^/author/quotes/(\d+)(?:\.[^/]*)?$'), 'author_quotes'),
+    (re.compile(r'^/author/similar/(\d+)(?:\.[^/]*)?$'), 'similar_authors'),
+    (re.compile(r'^/book/show/(\d+)(?:[.-][^/]*)?$'), 'book'),
+    (re.compile(r'^/work/quotes/(\d+)(?:-[^/]*)?$'), 'book_quotes'),
+]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.count('connections')
+
+    def render(self, path, query):
+        library = self.server.library
+        npage = int(query.get('page', ['1'])[0])
+        for pattern, kind in ROUTES:
+            match = pattern.match(path)
+            if match:
+                key = int(match.group(1))
+                if kind == 'author':
+                    return fixtures.author_page(library, key)
+                elif kind == 'author_books':
+                    return fixtures.author_books_page(library, key, npage=npage)
+                elif kind == 'author_quotes':
+                    return fixtures.author_quotes_page(library, key, npage=npage)
+                elif kind == 'similar_authors':
+                    return fixtures.similar_authors_page(library, key)
+                elif kind == 'book':
+                    return fixtures.book_page(library, key)
+                elif kind == 'book_quotes':
+                    return fixtures.book_quotes_page(library, key, npage=npage)
+        return None
+
+    def send_body(self, status, body, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        # Send the body in chunks, so that clients can start parsing before the page is fully downloaded
+        chunk_size = self.server.chunk_size or len(body) or 1
+        for start in range(0, len(body), chunk_size):
+            if start and self.server.chunk_delay:
+                time.sleep(self.server.chunk_delay)
+            self.wfile.write(body[start:start + chunk_size])
+        self.server.count('bytes_sent', len(body))
+
+    def do_GET(self):
+        server = self.server
+        server.count('requests')
+        if server.latency:
+            time.sleep(server.latency * (1 + server.jitter * (2 * server.random() - 1)))
+        # Error injection: transient failures a client is expected to retry
+        if server.error_rate and server.random() < server.error_rate:
+            server.count('errors')
+            status = server.error_status
+            return self.send_body(status, b'Service Unavailable',
+                                  {'Retry-After': str(server.retry_after), 'Content-Type': 'text/plain'})
+
+        parts = urlsplit(self.path)
+        page = self.render(parts.path, parse_qs(parts.query))
+        if page is None:
+            server.count('not_found')
+            return self.send_body(404, b'Not Found', {'Content-Type': 'text/plain'})
+
+        body = page.encode('utf-8')
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        headers = {'Content-Type': 'text/html; charset=utf-8', 'ETag': etag, 'Last-Modified': LAST_MODIFIED,
+                   'Cache-Control': 'max-age=0, private, must-revalidate'}
+        if self.headers.get('If-None-Match') == etag or self.headers.get('If-Modified-Since') == LAST_MODIFIED:
+            server.count('not_modified')
+            self.send_response(304)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            return None
+
+        encodings = [encoding.split(';')[0].strip() for encoding in self.headers.get('Accept-Encoding', '').split(',')]
+        if server.compress and 'gzip' in encodings:
+            body = gzip.compress(body, compresslevel=6)
+            headers['Content-Encoding'] = 'gzip'
+        elif server.compress and 'deflate' in encodings:
+            body = zlib.compress(body, 6)
+            headers['Content-Encoding'] = 'deflate'
+        return self.send_body(200, body, headers)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local ``Good Reads`` stand-in, serving fixture pages for authors, books, quotes and similar authors.
+
+    * :attr:`library`: fixtures served by the server.
+
+    * :attr:`latency`: seconds to wait before answering a request.
+
+    * :attr:`error_rate`: fraction of requests answered with :attr:`error_status` (e.g. ``503``).
+
+    * :attr:`stats`: number of connections, requests, errors, 304 and bytes sent.
+
+    Examples::
+        >>> with StandInServer(latency=0.01) as server:
+        ...     set_base(server.url)
+        ...     GoodReads.search_quotes(3389, top_k=50)
+
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, library=None, latency=0, jitter=0, error_rate=0, error_status=503,
+                 retry_after=0, compress=True, chunk_size=None, chunk_delay=0, seed=0):
+        super().__init__((host, port), StandInHandler)
+        self.library = library or fixtures.Library()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.compress = compress
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.stats = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def random(self):
+        with self._lock:
+            return self._random.random()
+
+    def count(self, key, value=1):
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + value
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {}
+
+    def start(self):
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
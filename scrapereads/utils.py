@@ -2,9 +2,12 @@
 Functional functions to process names and data.
 """
 
+import functools
 import re
 import string
 
+import unidecode
+
 
 CHARS = [
     ('-', ''),
@@ -20,6 +23,9 @@ CHARS = [
     ('.', ''),
 ]
 
+# Single-character replacements, applied at once (none of them produces a character replaced after it)
+CHARS_TABLE = str.maketrans(dict(CHARS))
+
 HTML = [
     ('<br/>', ''),
     ('<br>', ''),
@@ -32,6 +38,11 @@ HTML = [
     ('’', "'"),
 ]
 
+# Tags of ``HTML``, removed in one pass
+HTML_TAGS = [old for old, new in HTML if old.startswith('<')]
+HTML_TAGS_REGEX = re.compile('|'.join(map(re.escape, HTML_TAGS)))
+HTML_QUOTES = [(old, new) for old, new in HTML if not old.startswith('<')]
+
 
 ROMAN_MAP = [
     (1000, 'M'),
@@ -60,10 +71,7 @@ def name_to_goodreads(name):
         string
 
     """
-    name = to_ascii(name.title())
-    for char in CHARS:
-        name = name.replace(*char)
-    return name
+    return to_ascii(name.title()).translate(CHARS_TABLE)
 
 
 def num2roman(num):
@@ -93,6 +101,15 @@ ROMAN += [(f"\n{num2roman(k)} ", "\n") for k in range(2, 30)] + \
          [(f"\n{num2roman(k).lower()} ", "\n") for k in range(2, 30)]
 
 
+# Any word that could match ``ROMAN``: most quotes have none, and are left as is without going through ``ROMAN``
+ROMAN_REGEX = re.compile(r'[ \n](?:[IVX]{2,}|[ivx]{2,}|[VXvx])[ \n]')
+# Words between spaces or new lines, which ``ROMAN`` entries match (neighbour words may share a separator)
+ROMAN_WORD_REGEX = re.compile(r'[ \n]([IVX]+|[ivx]+)(?=[ \n])')
+# Positions in ``ROMAN`` of the entries removing a number
+ROMAN_INDEX = {number: [i for i, (old, _) in enumerate(ROMAN) if old.strip() == number]
+               for number in {old.strip() for old, _ in ROMAN}}
+
+
 def clean_num(quote):
     """Remove romans numbers from a quote.
 
@@ -103,11 +120,31 @@ def clean_num(quote):
         string
 
     """
-    for char in ROMAN:
-        quote = quote.replace(*char)
+    if ROMAN_REGEX.search(quote) is None:
+        return quote
+    # ``ROMAN`` entries are applied in order, as removing a number can join the next ones into a new number
+    # (``' V II I '`` becomes ``' VI '``). Only the entries of the numbers in the quote are applied,
+    # and these numbers are looked up again each time the quote changes.
+    entries = _roman_entries(quote, 0)
+    while entries:
+        index = entries.pop()
+        replaced = quote.replace(*ROMAN[index])
+        if replaced != quote:
+            quote = replaced
+            entries = _roman_entries(quote, index + 1)
     return quote
 
 
+def _roman_entries(quote, start):
+    # Positions of the ``ROMAN`` entries that can match the quote from ``start``, the first one last
+    entries = [i for number in set(ROMAN_WORD_REGEX.findall(quote)) for i in ROMAN_INDEX.get(number, ()) if i >= start]
+    entries.sort(reverse=True)
+    return entries
+
+
+NON_ASCII_REGEX = re.compile(r'[^\x00-\x7F]+')
+
+
 def to_ascii(text):
     """Convert a text to ASCII format.
 
@@ -118,7 +155,7 @@ def to_ascii(text):
         string
 
     """
-    return re.sub(r'[^\x00-\x7F]+', ' ', text)
+    return NON_ASCII_REGEX.sub(' ', text)
 
 
 def process_quote_text(quote_text):
@@ -132,10 +169,80 @@ def process_quote_text(quote_text):
 
     """
     quote_text = quote_text.replace('―', '').replace('\n\n', '\n')
-    quote_text = quote_text[:-1] if quote_text[-1] == '\n' else quote_text
-    for char in HTML:
-        quote_text = quote_text.replace(*char)
-    return quote_text
+    quote_text = quote_text[:-1] if quote_text.endswith('\n') else quote_text
+    return _replace_quotes(_remove_html(quote_text))
+
+
+def _replace_quotes(text):
+    # ``str.replace()`` is faster than ``str.translate()`` on non-ASCII texts
+    if text.isascii():
+        return text
+    for old, new in HTML_QUOTES:
+        text = text.replace(old, new)
+    return text
+
+
+def _remove_html(text):
+    # Remove all ``HTML_TAGS`` in one pass
+    if '<' not in text:
+        return text
+    stripped = HTML_TAGS_REGEX.sub('', text)
+    if HTML_TAGS_REGEX.search(stripped) is not None:
+        # Removing a tag joined another one (e.g. ``<<br>i>``): remove them one after the other, as they are ordered
+        stripped = text
+        for tag in HTML_TAGS:
+            stripped = stripped.replace(tag, '')
+    return stripped
+
+
+# Joins quote texts in ``clean_quote_texts()``: no step removes it, nor matches across it
+QUOTE_SEPARATOR = '\x00'
+TRAILING_LINE_REGEX = re.compile('\n(?=\x00|\\Z)')
+
+
+def clean_quote_text(quote_text):
+    """Clean up the raw text of a ``<div>`` quote element, as stored in quote records.
+    The text is processed twice, which collapses runs of up to four line breaks into one.
+
+    Args:
+        quote_text (string): raw quote text (see ``scrape.get_quote_record()``).
+
+    Returns:
+        string
+
+    """
+    quote_text = process_quote_text(quote_text)
+    # Second pass: quotes and dashes are already replaced, only line breaks and joined tags are left
+    quote_text = quote_text.replace('\n\n', '\n')
+    quote_text = quote_text[:-1] if quote_text.endswith('\n') else quote_text
+    return _remove_html(quote_text)
+
+
+def clean_quote_texts(quote_texts):
+    """Clean up a batch of raw quote texts (see ``clean_quote_text()``).
+    The texts are joined, so that each step runs once on the whole batch instead of once per quote.
+
+    Args:
+        quote_texts (list): raw quote texts.
+
+    Returns:
+        list: cleaned texts, in the same order.
+
+    """
+    quote_texts = list(quote_texts)
+    batch = QUOTE_SEPARATOR.join(quote_texts)
+    if batch.count(QUOTE_SEPARATOR) != len(quote_texts) - 1:
+        # A text contains the separator
+        return [clean_quote_text(quote_text) for quote_text in quote_texts]
+    batch = batch.replace('―', '').replace('\n\n', '\n')
+    batch = TRAILING_LINE_REGEX.sub('', batch)
+    batch = HTML_TAGS_REGEX.sub('', batch)
+    if HTML_TAGS_REGEX.search(batch) is not None:
+        # Removing a tag joined another one
+        return [clean_quote_text(quote_text) for quote_text in quote_texts]
+    batch = _replace_quotes(batch).replace('\n\n', '\n')
+    batch = TRAILING_LINE_REGEX.sub('', batch)
+    return batch.split(QUOTE_SEPARATOR)
 
 
 def remove_punctuation(string_punct):
@@ -167,53 +274,67 @@ def parse_author_href(href):
     return author_name, key
 
 
-import unidecode
+# Number of distinct non-ASCII strings whose transliteration is kept
+TRANSLITERATION_CACHE_SIZE = 2 ** 16
 
 
-def serialize_list(list_raw):
-    """Serialize a list in ASCII format, so it can be saved as a JSON.
+@functools.lru_cache(maxsize=TRANSLITERATION_CACHE_SIZE)
+def _transliterate(text):
+    return unidecode.unidecode(text)
+
+
+def serialize_value(value):
+    """Serialize a value in ASCII format, so it can be saved as a JSON.
+    ASCII strings are returned as is, and the transliteration of the other ones is cached,
+    as the same tags, names and titles come back in every record.
 
     Args:
-        list_raw (list):
+        value (object): value to serialize (converted to a string).
 
     Returns:
-        list
+        string
 
     """
-    list_serialized = []
-    for value in list_raw:
-        if isinstance(value, list):
-            list_serialized.append(serialize_list(value))
-        elif isinstance(value, dict):
-            list_serialized.append(serialize_dict(value))
-        else:
-            list_serialized.append(unidecode.unidecode(str(value)))
-    return list_serialized
+    text = value if type(value) is str else str(value)
+    return text if text.isascii() else _transliterate(text)
 
 
-def serialize_dict(dict_raw):
-    """Serialize a dictionary in ASCII format so it can be saved as a JSON.
+def serialize(data):
+    """Serialize nested lists and dictionaries in ASCII format, so they can be saved as a JSON.
+    Keys and values are converted to strings. The data is walked with a stack, without recursion.
 
     Args:
-        dict_raw (dict):
+        data (list or dict): data to serialize.
 
     Returns:
-        dict
+        list or dict
 
     """
-    dict_serialized = {}
-    for (key, value) in dict_raw.items():
-        if isinstance(value, list):
-            dict_serialized[unidecode.unidecode(str(key))] = serialize_list(value)
-        elif isinstance(value, dict):
-            dict_serialized[unidecode.unidecode(str(key))] = serialize_dict(value)
-        else:
-            dict_serialized[unidecode.unidecode(str(key))] = unidecode.unidecode(str(value))
-    return dict_serialized
+    if not isinstance(data, (list, dict)):
+        return serialize_value(data)
+    root = [] if isinstance(data, list) else {}
+    stack = [(data, root)]
+    while stack:
+        raw, serialized = stack.pop()
+        items = raw.items() if isinstance(raw, dict) else enumerate(raw)
+        for key, value in items:
+            if isinstance(value, (list, dict)):
+                # Filled later, at its place
+                child = [] if isinstance(value, list) else {}
+                stack.append((value, child))
+                value = child
+            else:
+                value = serialize_value(value)
+            if isinstance(serialized, dict):
+                serialized[serialize_value(key)] = value
+            else:
+                serialized.append(value)
+    return root
 
 
 def serialize_list(list_raw):
     """Serialize a list in ASCII format, so it can be saved as a JSON.
+    Kept for compatibility, same as ``serialize()``.
 
     Args:
         list_raw (list):
@@ -222,19 +343,12 @@ def serialize_list(list_raw):
         list
 
     """
-    list_serialized = []
-    for value in list_raw:
-        if isinstance(value, list):
-            list_serialized.append(serialize_list(value))
-        elif isinstance(value, dict):
-            list_serialized.append(serialize_dict(value))
-        else:
-            list_serialized.append(unidecode.unidecode(str(value)))
-    return list_serialized
+    return serialize(list_raw)
 
 
 def serialize_dict(dict_raw):
     """Serialize a dictionary in ASCII format so it can be saved as a JSON.
+    Kept for compatibility, same as ``serialize()``.
 
     Args:
         dict_raw (dict):
@@ -243,12 +357,4 @@ def serialize_dict(dict_raw):
         dict
 
     """
-    dict_serialized = {}
-    for (key, value) in dict_raw.items():
-        if isinstance(value, list):
-            dict_serialized[unidecode.unidecode(str(key))] = serialize_list(value)
-        elif isinstance(value, dict):
-            dict_serialized[unidecode.unidecode(str(key))] = serialize_dict(value)
-        else:
-            dict_serialized[unidecode.unidecode(str(key))] = unidecode.unidecode(str(value))
-    return dict_serialized
+    return serialize(dict_raw)
@@ -0,0 +1,391 @@
+"""
+Scrape quote and book lists with compiled XPath selectors on a raw ``lxml`` tree.
+These extractors mirror the ones of ``scrapereads.scrape``, and return identical records (see ``parsers``),
+but do not build a BeautifulSoup tree.
+"""
+
+import codecs
+
+import bs4
+from lxml import etree, html
+
+from .utils import *
+from .decode import decode_likes, decode_ratings, decode_year
+
+
+def _class(name):
+    # Same matching as ``find(attrs={'class': name})``: a single class, or the whole (normalized) class attribute
+    if ' ' in name:
+        return f"normalize-space(@class)='{name}'"
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+QUOTES_DIVS = etree.XPath(f"//div[{_class('quotes')}]")
+FIRST_QUOTE_DIV = etree.XPath(f"(.//div[{_class('quote')}])[1]")
+QUOTE_TEXT_DIV = etree.XPath(f"(.//div[{_class('quoteText')}])[1]")
+QUOTE_BOOK_A = etree.XPath(f"(.//a[{_class('authorOrTitle')}])[1]")
+QUOTE_TAGS_DIV = etree.XPath(f"(.//div[{_class('greyText smallText left')}])[1]")
+QUOTE_FOOTER_DIV = etree.XPath(f"(.//div[{_class('quoteFooter')}])[1]")
+QUOTE_LIKES_A = etree.XPath(f"(.//a[{_class('smallText')}])[1]")
+FIRST_TR = etree.XPath("(//tr)[1]")
+BOOK_TITLE_A = etree.XPath(f"(.//a[{_class('bookTitle')}])[1]")
+BOOK_RATINGS_SPAN = etree.XPath(f"(.//span[{_class('minirating')}])[1]")
+BOOK_DETAILS_SPAN = etree.XPath(f"(.//span[{_class('greyText smallText uitext')}])[1]")
+BOOK_EDITION_A = etree.XPath(f"(.//a[{_class('greyText')}])[1]")
+NEXT_PAGE = etree.XPath(f"(//*[{_class('next_page')}])[1]")
+PAGE_NUMBERS = etree.XPath(".//a | .//em")
+
+
+class UnsupportedMarkup(ValueError):
+    """Raised when a page cannot be extracted exactly like ``scrapereads.scrape`` would."""
+
+
+def _first(selector, element):
+    found = selector(element)
+    return found[0] if found else None
+
+
+def _has_class(element, name):
+    return name in (element.get('class') or '').split()
+
+
+def _last_node(element):
+    """Last child node of an element, like ``Tag.contents[-1]`` (only text nodes are supported)."""
+    if len(element):
+        last = element[-1]
+        if last.tail is None:
+            raise UnsupportedMarkup(f'<{element.tag}> ends with a <{last.tag}> element')
+        return last.tail
+    if element.text is None:
+        raise UnsupportedMarkup(f'<{element.tag}> is empty')
+    return element.text
+
+
+def parse(body):
+    """Parse a page with ``lxml``.
+
+    Args:
+        body (bytes): content of the page.
+
+    Returns:
+        lxml.html.HtmlElement
+
+    """
+    # Decode the page like BeautifulSoup does (declared encoding, then guesses), as libxml2 defaults to latin-1
+    markup = bs4.UnicodeDammit(body, is_html=True).unicode_markup
+    return html.document_fromstring(markup)
+
+
+def scrape_quotes(tree):
+    """Retrieve all ``<div>`` quote elements from a quote page (see ``scrape.scrape_quotes()``).
+
+    Args:
+        tree (lxml.html.HtmlElement): quote page.
+
+    Returns:
+        yield lxml.html.HtmlElement
+
+    """
+    for container_div in QUOTES_DIVS(tree):
+        quote_div = _first(FIRST_QUOTE_DIV, container_div)
+        if quote_div is None:
+            continue
+        for element in [quote_div, *quote_div.itersiblings()]:
+            if element.tag == 'div' and _has_class(element, 'quote'):
+                yield element
+
+
+def get_quote_text(quote_div):
+    """Get the text from a ``<div>`` quote element (see ``scrape.get_quote_text()``).
+
+    Args:
+        quote_div (lxml.html.HtmlElement): ``<div>`` quote element.
+
+    Returns:
+        string
+
+    """
+    return process_quote_text(_raw_quote_text(_first(QUOTE_TEXT_DIV, quote_div)))
+
+
+def _raw_quote_text(text_div):
+    quote_text = (text_div.text or '').strip()
+    for child in text_div:
+        if child.tag == 'br':
+            quote_text += '\n'
+        elif child.tag is etree.Comment:
+            quote_text += (child.text or '').strip()
+        quote_text += (child.tail or '').strip()
+    return quote_text
+
+
+def get_quote_record(quote_div):
+    """Extract all the data of a ``<div>`` quote element (see ``scrape.get_quote_record()``).
+
+    Args:
+        quote_div (lxml.html.HtmlElement): ``<div>`` quote element.
+
+    Returns:
+        dict
+
+    """
+    text_div = _first(QUOTE_TEXT_DIV, quote_div)
+    quote_text = clean_quote_text(_raw_quote_text(text_div))
+    quote_likes_a = _first(QUOTE_LIKES_A, _first(QUOTE_FOOTER_DIV, quote_div))
+    quote_likes = decode_likes(quote_likes_a.text_content())
+    quote_id = quote_likes_a.get('href').split('-')[0].split('.')[0]
+    quote_tags = []
+    tags_div = _first(QUOTE_TAGS_DIV, quote_div)
+    if tags_div is not None:
+        quote_tags = [tag.text_content().strip() for tag in tags_div if tag.tag == 'a']
+    book_id = book_name = None
+    book_title = _first(QUOTE_BOOK_A, text_div)
+    if book_title is not None:
+        book_href = book_title.get('href')
+        book_id = book_href.split('/')[-1].split('-')[0].split('.')[0]
+        book_name = book_title.text_content().strip()
+    return {
+        'quote_id': quote_id,
+        'text': quote_text,
+        'likes': quote_likes,
+        'tags': quote_tags,
+        'book_id': book_id,
+        'book_name': book_name,
+    }
+
+
+def get_page_count(tree):
+    """Get the number of pages of a paginated list (see ``scrape.get_page_count()``).
+
+    Args:
+        tree (lxml.html.HtmlElement): first page of the list.
+
+    Returns:
+        int
+
+    """
+    next_page = _first(NEXT_PAGE, tree)
+    if next_page is None:
+        return None
+    texts = [item.text_content() for item in PAGE_NUMBERS(next_page.getparent())]
+    numbers = [int(text) for text in texts if text.strip().isdigit()]
+    return max(numbers) if numbers else None
+
+
+def scrape_quotes_page(tree):
+    """Extract all the quotes of a quote page (see ``scrape.scrape_quotes_page()``).
+
+    Args:
+        tree (lxml.html.HtmlElement): quote page.
+
+    Returns:
+        dict
+
+    """
+    return {
+        'items': [get_quote_record(quote_div) for quote_div in scrape_quotes(tree)],
+        'num_pages': get_page_count(tree),
+    }
+
+
+def scrape_author_books(tree):
+    """Retrieve books from an author's page (see ``scrape.scrape_author_books()``).
+
+    Args:
+        tree (lxml.html.HtmlElement): author books page.
+
+    Returns:
+        yield lxml.html.HtmlElement: ``<tr>`` element.
+
+    """
+    table_tr = _first(FIRST_TR, tree)
+    if table_tr is None:
+        return None
+    for element in [table_tr, *table_tr.itersiblings()]:
+        if element.tag == 'tr':
+            yield element
+
+
+def get_author_book_record(book_tr):
+    """Extract all the data of a table ``<tr>`` element (see ``scrape.get_author_book_record()``).
+
+    Args:
+        book_tr (lxml.html.HtmlElement): ``<tr>`` book element.
+
+    Returns:
+        dict
+
+    """
+    book_title = _first(BOOK_TITLE_A, book_tr)
+    book_href = book_title.get('href')
+    book_id = book_href.split('/')[-1].split('-')[0].split('.')[0]
+    book_name = book_title.text_content().strip().title()
+    ratings = _last_node(_first(BOOK_RATINGS_SPAN, book_tr))
+    book_details = _first(BOOK_DETAILS_SPAN, book_tr)
+    edition = _first(BOOK_EDITION_A, book_details)
+    edition = edition.text_content().strip() if edition is not None else None
+    year = decode_year(_last_node(book_details))
+    rating, num_ratings = decode_ratings(ratings)
+    return {
+        'book_id': book_id,
+        'book_name': book_name,
+        'ratings': ratings,
+        'rating': rating,
+        'num_ratings': num_ratings,
+        'edition': edition,
+        'year': year,
+    }
+
+
+def scrape_author_books_page(tree):
+    """Extract all the books of an author books page (see ``scrape.scrape_author_books_page()``).
+
+    Args:
+        tree (lxml.html.HtmlElement): author books page.
+
+    Returns:
+        dict
+
+    """
+    return {
+        'items': [get_author_book_record(book_tr) for book_tr in scrape_author_books(tree)],
+        'num_pages': get_page_count(tree),
+    }
+
+
+def _is_quote_div(element):
+    return element.tag == 'div' and _has_class(element, 'quote')
+
+
+def _quote_container(element):
+    # Quotes are listed in ``div.quotes`` containers
+    for ancestor in element.iterancestors('div'):
+        if _has_class(ancestor, 'quotes'):
+            return ancestor
+    return None
+
+
+def _is_book_tr(element):
+    return element.tag == 'tr'
+
+
+def _book_container(element):
+    # Books are the rows next to the first row of the page
+    return 'page'
+
+
+class ItemStream:
+    """Incremental parser of a list page, extracting the items (quotes or books) as soon as they are downloaded.
+
+    Chunks of the page are fed to an ``lxml`` pull parser. Each item is extracted when its closing tag is parsed,
+    into the same record as the extractors above (the items of a list are siblings, as in ``scrape_quotes()``
+    and ``scrape_author_books()``).
+
+    * :attr:`items`: records extracted so far.
+
+    * :attr:`num_pages`: number of pages of the list, known once the page is closed.
+
+    * :attr:`received`: number of bytes fed.
+
+    """
+
+    def __init__(self, tag, is_item, get_container, get_record):
+        self.tag = tag
+        self.is_item = is_item
+        self.get_container = get_container
+        self.get_record = get_record
+        self.items = []
+        self.num_pages = None
+        self.received = 0
+        self._skip = 0
+        self._start()
+
+    def _start(self):
+        self._parser = etree.HTMLPullParser(events=('end',), tag=self.tag)
+        # Build ``lxml.html`` elements, as ``parse()`` does
+        self._parser.set_element_class_lookup(html.HtmlElementClassLookup())
+        self._decoder = None
+        # Parent of the items, for each container
+        self._parents = {}
+
+    @property
+    def page(self):
+        """Records of the page, like the extractor of the page."""
+        return {'items': self.items, 'num_pages': self.num_pages}
+
+    def reset(self):
+        """Start the page again (e.g. when the download is tried again), without extracting the same items twice."""
+        self._skip = len(self.items)
+        self.received = 0
+        self._start()
+
+    def feed(self, chunk):
+        """Parse a chunk of the page.
+
+        Args:
+            chunk (bytes): next bytes of the page.
+
+        Returns:
+            list: records of the items completed by this chunk.
+
+        """
+        if self._decoder is None:
+            # Decode like BeautifulSoup: the declared encoding, else UTF-8
+            encoding = bs4.dammit.EncodingDetector.find_declared_encoding(chunk, is_html=True) or 'utf-8'
+            self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self.received += len(chunk)
+        self._parser.feed(self._decoder.decode(chunk))
+        return self._read()
+
+    def _read(self):
+        records = []
+        for _, element in self._parser.read_events():
+            if not self.is_item(element):
+                continue
+            container = self.get_container(element)
+            if container is None:
+                continue
+            parent = self._parents.setdefault(container, element.getparent())
+            if element.getparent() is not parent:
+                continue
+            if self._skip:
+                self._skip -= 1
+            else:
+                records.append(self.get_record(element))
+            # The item is not needed anymore: free its subtree
+            element.clear(keep_tail=True)
+        self.items.extend(records)
+        return records
+
+    def close(self):
+        """Finish the page, and read the number of pages from its pagination widget.
+
+        Returns:
+            list: records of the items completed at the end of the page.
+
+        """
+        if self._decoder is not None:
+            self._parser.feed(self._decoder.decode(b'', final=True))
+        records = self._read()
+        self.num_pages = get_page_count(self._parser.close())
+        return records
+
+
+def stream_quotes_page():
+    """Incremental version of ``scrape_quotes_page()``.
+
+    Returns:
+        ItemStream
+
+    """
+    return ItemStream('div', _is_quote_div, _quote_container, get_quote_record)
+
+
+def stream_author_books_page():
+    """Incremental version of ``scrape_author_books_page()``.
+
+    Returns:
+        ItemStream
+
+    """
+    return ItemStream('tr', _is_book_tr, _book_container, get_author_book_record)
@@ -0,0 +1,27 @@
+"""
+Fixtures shared by the tests: a local ``Good Reads`` stand-in server, and a client pointed to it.
+"""
+
+import warnings
+
+import pytest
+
+from scrapereads import GoodReads, connect
+from scrapereads.standin.server import StandInServer
+
+
+@pytest.fixture
+def server():
+    with StandInServer() as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    GoodReads(verbose=False)
+    GoodReads.set_base(server.url)
+    with warnings.catch_warnings():
+        # Pages failing on purpose warn that ``None`` was returned
+        warnings.simplefilter('ignore', RuntimeWarning)
+        yield GoodReads
+    connect.close_session()
@@ -0,0 +1,25 @@
+"""
+Check that the page of an author is fetched once to encode it, and that displaying an author, or its books and
+quotes, does not connect to its page.
+"""
+
+import pytest
+
+from scrapereads.reads import Author, Book, Quote
+
+
+def test_to_json_fetches_once(client, server):
+    server.reset_stats()
+    data = client.get_author(3389)
+    assert data['author'] == 'Stephen King'
+    assert server.stats['requests'] == 1
+
+
+@pytest.mark.parametrize('obj', [Author(3389), Book(3389, 1, book_name='some book'), Quote(3389, 2, text='quote')],
+                         ids=['author', 'book', 'quote'])
+def test_repr_does_not_connect(obj, client, server):
+    server.reset_stats()
+    assert '3389' in repr(obj)
+    assert server.stats.get('requests', 0) == 0
+    obj.author_name = 'Stephen King'
+    assert '3389' not in repr(obj) and 'Stephen King' in repr(obj)
@@ -0,0 +1,26 @@
+"""
+Check that the quotes of a book found on its author's pages are used as in the cache,
+and that the quote page of the book is only scraped when more quotes are needed.
+"""
+
+
+def test_author_quotes_are_cached(client, server):
+    author = client.search_author(3389)
+    author.get_quotes(top_k=0)
+    books = [book for book in author._books if book._quotes]
+    assert books
+    requests = server.stats['requests']
+    for book in books:
+        assert book.to_json(encode=None)['quotes'] == [quote.to_json(encode=None) for quote in book._quotes]
+        assert book.get_quotes(top_k=len(book._quotes)) == book._quotes
+    assert server.stats['requests'] == requests
+
+    book = books[0]
+    attached = list(book._quotes)
+    quotes = book.get_quotes(top_k=len(attached) + 1)
+    assert server.stats['requests'] > requests
+    assert len(quotes) == len(attached) + 1
+    # The quotes listed by the book page are now used as in the cache
+    requests = server.stats['requests']
+    assert book.get_quotes(top_k=len(attached) + 1) == quotes
+    assert server.stats['requests'] == requests
@@ -0,0 +1,92 @@
+"""
+Check the bulk calls (``get_authors()``, ``get_quotes_bulk()``, ``get_books_bulk()``) against the stand-in server:
+the order of their results, the errors reported per id, and concurrent calls on the same authors.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scrapereads import GoodReads, connect
+
+AUTHOR_IDS = [3389, 1, 2, 3, 4, 5, 6, 7]
+
+
+def test_run_bulk_order():
+    def task(key):
+        time.sleep(0.2 if key == 0 else 0.01)
+        return key * 2
+
+    connect.set_bulk_workers(4)
+    try:
+        ordered = list(connect.run_bulk(task, range(6)))
+        assert [result.key for result in ordered] == list(range(6))
+        assert [result.value for result in ordered] == [2 * key for key in range(6)]
+        unordered = list(connect.run_bulk(task, range(6), ordered=False))
+        # The slow key is yielded last, instead of holding back the others
+        assert unordered[-1].key == 0
+        assert sorted(unordered) == ordered
+    finally:
+        connect.set_bulk_workers(8)
+
+
+def test_run_bulk_errors():
+    def task(key):
+        if key % 3 == 0:
+            raise ValueError(key)
+        return key
+
+    results = list(connect.run_bulk(task, range(7)))
+    assert [result.key for result in results] == list(range(7))
+    for result in results:
+        if result.key % 3 == 0:
+            assert result.value is None and isinstance(result.error, ValueError)
+        else:
+            assert result.value == result.key and result.error is None
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_quotes_bulk(client, ordered):
+    expected = {author_id: client.get_quotes(author_id, top_k=30) for author_id in AUTHOR_IDS}
+    results = list(client.get_quotes_bulk(AUTHOR_IDS + [3389, 1], top_k=30, ordered=ordered))
+    # Repeated ids are processed once
+    assert sorted(result.key for result in results) == sorted(AUTHOR_IDS)
+    if ordered:
+        assert [result.key for result in results] == AUTHOR_IDS
+    assert all(result.error is None for result in results)
+    assert {result.key: result.value for result in results} == expected
+
+
+def test_bulk_errors_per_id(client):
+    # Ids which are not numbers are not served by the stand-in: only their result fails
+    author_ids = [3389, 'unknown', 1, 'missing', 2]
+    results = list(client.get_authors(author_ids))
+    assert [result.key for result in results] == author_ids
+    for result in results:
+        if isinstance(result.key, str):
+            assert result.value is None and isinstance(result.error, ConnectionError)
+        else:
+            assert result.error is None and result.value == client.get_author(result.key)
+    books = {result.key: result for result in client.get_books_bulk(author_ids, top_k=5, ordered=False)}
+    assert books['unknown'].error is not None and books['missing'].error is not None
+    assert [book['book'] for book in books[3389].value] == [book['book'] for book in client.get_books(3389, top_k=5)]
+
+
+def test_concurrent_bulk_calls(client):
+    # Concurrent bulk calls of a client with an identity map share the same authors
+    goodreads = GoodReads(verbose=False, identity=True)
+    expected = {author_id: client.get_quotes(author_id, top_k=0) for author_id in AUTHOR_IDS}
+    barrier = threading.Barrier(4)
+
+    def bulk(_):
+        barrier.wait()
+        return {result.key: result.value for result in goodreads.get_quotes_bulk(AUTHOR_IDS, top_k=0)}
+
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(bulk, range(4)))
+    assert results == [expected] * 4
+    for author_id in AUTHOR_IDS:
+        author = goodreads.search_author(author_id)
+        assert author._listed_quotes == len(author._quotes) == len(expected[author_id])
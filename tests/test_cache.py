@@ -0,0 +1,93 @@
+"""
+Check the on-disk page cache: expiry, eviction of the least recently used pages, records saved by extractor,
+and revalidation of expired pages with the stand-in server (``ETag`` / ``Last-Modified``).
+"""
+
+import os
+import time
+
+from scrapereads import connect, scrape
+from scrapereads.cache import DiskCache
+
+URL = 'https://www.goodreads.com/author/show/'
+
+
+def test_set_get(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.set(URL + '1', b'<html>1</html>', etag='"1"')
+    assert cache.get(URL + '1') == b'<html>1</html>'
+    assert cache.get(URL + '2') is None
+    assert URL + '1' in cache and URL + '2' not in cache
+    assert len(cache) == 1
+    cache.close()
+    # Pages are kept on disk
+    cache = DiskCache(str(tmp_path))
+    assert cache.lookup(URL + '1') == (b'<html>1</html>', '"1"', None, True)
+    assert cache.stats['hits'] == 1
+
+
+def test_ttl(tmp_path):
+    cache = DiskCache(str(tmp_path), ttl=0.1)
+    cache.set(URL + '1', b'<html>1</html>', etag='"1"', last_modified='Wed, 01 Jan 2020 00:00:00 GMT')
+    assert cache.get(URL + '1') == b'<html>1</html>'
+    time.sleep(0.15)
+    assert cache.get(URL + '1') is None
+    assert URL + '1' not in cache
+    # Expired pages are kept with their validators
+    entry = cache.lookup(URL + '1')
+    assert not entry.fresh
+    assert (entry.body, entry.etag, entry.last_modified) == (b'<html>1</html>', '"1"', 'Wed, 01 Jan 2020 00:00:00 GMT')
+    cache.revalidate(URL + '1')
+    assert cache.get(URL + '1') == b'<html>1</html>'
+
+
+def test_lru_eviction(tmp_path):
+    # Random bodies do not compress, so each page takes about 1 kB
+    bodies = {name: os.urandom(1000) for name in 'abcd'}
+    cache = DiskCache(str(tmp_path), max_size=3500)
+    for name in 'abc':
+        cache.set(URL + name, bodies[name])
+        time.sleep(0.01)
+    # ``a`` is used again, ``b`` is now the least recently used page
+    assert cache.get(URL + 'a') == bodies['a']
+    time.sleep(0.01)
+    cache.set(URL + 'd', bodies['d'])
+    assert [name for name in 'abcd' if URL + name in cache] == ['a', 'c', 'd']
+    assert cache.size <= 3500
+
+
+def test_records_by_extractor(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    assert cache.set_records(URL + '1', 'quotes', {'items': []}) is None
+    cache.set(URL + '1', b'<html>1</html>')
+    cache.set_records(URL + '1', 'quotes', {'items': [1, 2]})
+    assert cache.get_records(URL + '1', 'quotes') == {'items': [1, 2]}
+    assert cache.get_records(URL + '1', 'books') is None
+    # Records of a page saved again are dropped
+    cache.set(URL + '1', b'<html>2</html>')
+    assert cache.get_records(URL + '1', 'quotes') is None
+
+
+def test_fetch_from_cache(client, server, tmp_path):
+    client.set_cache(str(tmp_path), ttl=3600)
+    url = f'{server.url}/author/quotes/3389'
+    records = connect.connect_records(url, scrape.scrape_quotes_page)
+    assert connect.connect_records(url, scrape.scrape_quotes_page) == records
+    assert server.stats['requests'] == 1
+    assert connect.CACHE.stats['records'] == 1
+
+
+def test_revalidate(client, server, tmp_path):
+    # Pages expire at once, and are revalidated with the server each time
+    client.set_cache(str(tmp_path), ttl=0)
+    url = f'{server.url}/author/quotes/3389'
+    body = connect.fetch(url)
+    for _ in range(2):
+        assert connect.fetch(url) == body
+    assert server.stats['requests'] == 3
+    assert server.stats['not_modified'] == 2
+    assert connect.CACHE.stats['not_modified'] == 2
+    # The records are not extracted again from a page that did not change
+    records = connect.connect_records(url, scrape.scrape_quotes_page)
+    assert connect.connect_records(url, scrape.scrape_quotes_page) == records
+    assert connect.CACHE.stats['records'] == 1
@@ -0,0 +1,69 @@
+"""
+Check the pages fetched ahead of time against the stand-in server: the order of the pages, the fetches cancelled
+once a list ends, and the pages skipped when they fail to load.
+"""
+
+import itertools
+
+from scrapereads import connect, scrape
+from scrapereads.reads import Author
+
+AUTHOR_ID = 3389
+HREF = f'/author/quotes/{AUTHOR_ID}.Stephen_King'
+
+
+def quote_ids(records):
+    return [record['quote_id'] for record in records]
+
+
+def scrape_quotes_unpaged(soup):
+    # A list page without pagination widget: the next pages are fetched until one is empty
+    records = scrape.scrape_quotes_page(soup)
+    records['num_pages'] = None
+    return records
+
+
+def test_pages_in_order(client, server):
+    urls = [f'{server.url}{HREF}?page={npage}' for npage in range(1, 11)]
+    expected = [connect.connect_records(url, scrape.scrape_quotes_page) for url in urls]
+    pages = list(connect.connect_pages(urls, extract=scrape.scrape_quotes_page, prefetch=4))
+    assert pages == expected
+    assert len(set(quote_id for page in pages for quote_id in quote_ids(page['items']))) == 300
+
+
+def test_close_cancels_prefetch(client, server):
+    # A single thread, so that the pages fetched ahead of time are still queued when the generator is closed
+    client.set_pool_size(1)
+    urls = (f'{server.url}{HREF}?page={npage}' for npage in itertools.count(1))
+    pages = connect.connect_pages(urls, extract=scrape.scrape_quotes_page, prefetch=4)
+    for _ in range(2):
+        next(pages)
+    pages.close()
+    connect.close_session()
+    assert server.stats['requests'] <= 3
+
+
+def test_empty_page_stops(client, server):
+    client.set_pool_size(1)
+    author = Author(AUTHOR_ID, author_name='Stephen King')
+    pages = list(author._search_pages(HREF, scrape_quotes_unpaged, lambda records: records))
+    assert len([item for page in pages for item in page]) == 300
+    connect.close_session()
+    # 10 pages, the empty one, and at most the page fetched while the empty one was read
+    assert server.stats['requests'] <= 12
+
+
+def test_failed_page_is_skipped(client, server, monkeypatch):
+    connect_records = connect.connect_records
+
+    def fail_page_3(url, *args, **kwargs):
+        return None if url.endswith('?page=3') else connect_records(url, *args, **kwargs)
+
+    author = Author(AUTHOR_ID, author_name='Stephen King')
+    expected = [quote_ids(page['items']) for page in connect.connect_pages(
+        [f'{server.url}{HREF}?page={npage}' for npage in range(1, 11)], extract=scrape.scrape_quotes_page)]
+    monkeypatch.setattr(connect, 'connect_records', fail_page_3)
+    pages = list(author._search_pages(HREF, scrape.scrape_quotes_page, quote_ids))
+    # The first page is yielded item by item
+    assert [quote_id for page in pages[:30] for quote_id in page] == expected[0]
+    assert pages[30:] == expected[1:2] + expected[3:]
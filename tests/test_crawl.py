@@ -0,0 +1,84 @@
+"""
+Check the Bloom filter of the crawler (no false negatives, few false positives, saved and loaded), and that a crawl
+interrupted with a checkpoint and resumed visits the same authors as a crawl run at once.
+"""
+
+import json
+
+import pytest
+
+from scrapereads import GoodReads
+from scrapereads.crawl import BloomFilter, Crawler
+from scrapereads.standin import fixtures
+
+SEEDS = list(fixtures.Library().authors)[:2]
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(capacity=5000, error_rate=1e-3)
+    keys = [f'{i}.Author_{i}' for i in range(5000)]
+    assert all(bloom.add(key) for key in keys[:10])
+    for key in keys[10:]:
+        bloom.add(key)
+    # A key added is always found, and is not added twice
+    assert all(key in bloom for key in keys)
+    assert not bloom.add(keys[0])
+    # A key not added is found with a probability close to the error rate, at capacity
+    false_positives = sum(f'other {i}' in bloom for i in range(20000))
+    assert false_positives < 20000 * 1e-3 * 3
+    loaded = BloomFilter.from_json(json.loads(json.dumps(bloom.to_json())))
+    assert (loaded.num_bits, loaded.num_hashes, len(loaded)) == (bloom.num_bits, bloom.num_hashes, len(bloom))
+    assert all(key in loaded for key in keys)
+
+
+def crawl(max_authors, workers, checkpoint=None, stop=None, **kwargs):
+    crawler = Crawler(SEEDS, max_authors=max_authors, workers=workers, checkpoint=checkpoint, checkpoint_every=10,
+                      **kwargs)
+    visits = []
+    pages = crawler.crawl()
+    for visit in pages:
+        visits.append((visit.author.author_id, visit.depth, [author.author_id for author in visit.similar]))
+        if stop and len(visits) >= stop:
+            pages.close()
+            break
+    return crawler, visits
+
+
+def test_crawl(client):
+    crawler, visits = crawl(60, workers=8)
+    assert len(visits) == 60 == crawler.stats['visited']
+    ids = [str(author_id) for author_id, _, _ in visits]
+    assert len(set(ids)) == len(ids)
+    assert [str(author_id) for author_id, _, _ in visits[:2]] == [str(seed) for seed in SEEDS]
+    # Breadth-first, whatever the number of authors visited at once
+    assert [depth for _, depth, _ in visits] == sorted(depth for _, depth, _ in visits)
+    assert crawl(60, workers=1)[1] == visits
+    _, shallow = crawl(None, workers=8, max_depth=1)
+    assert max(depth for _, depth, _ in shallow) == 1
+
+
+@pytest.mark.parametrize('stop', [1, 25, 59])
+def test_checkpoint_resume(client, server, tmp_path, stop):
+    _, expected = crawl(60, workers=8)
+    checkpoint = str(tmp_path / 'crawl.json')
+    server.reset_stats()
+    crawler, first = crawl(60, workers=8, checkpoint=checkpoint, stop=stop)
+    # The authors requested but not visited are saved in the frontier
+    assert not crawler._inflight
+    with open(checkpoint) as f:
+        saved = json.load(f)
+    assert saved['stats']['visited'] == stop and len(saved['frontier']) == len(crawler)
+    resumed, rest = crawl(60, workers=8, checkpoint=checkpoint)
+    assert first + rest == expected
+    assert resumed.stats['visited'] == 60
+    # Only the pages in flight when the crawl was interrupted are fetched again
+    assert server.stats['requests'] <= 60 + 8
+
+
+def test_crawl_shares_authors(client):
+    goodreads = GoodReads(verbose=False, identity=True)
+    visits = list(goodreads.crawl_authors(SEEDS, max_authors=10, workers=4))
+    for visit in visits:
+        assert goodreads.search_author(visit.author.author_id) is visit.author
+        for author in visit.similar:
+            assert goodreads.search_author(author.author_id) is author
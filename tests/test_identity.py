@@ -0,0 +1,72 @@
+"""
+Check that each client has its own identity map, and that concurrent calls scraping the same shared author
+(from threads or coroutines) neither scrape it twice nor mix up its quotes and books.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from scrapereads import GoodReads
+from scrapereads.aio import AsyncGoodReads
+
+
+def test_maps_are_per_client(client):
+    first = GoodReads(verbose=False, identity=True)
+    author = first.search_author(3389)
+    assert first.search_author('3389') is author
+    # A new client does not forget the objects of the others
+    second = GoodReads(verbose=False, identity=True)
+    assert second.search_author(3389) is not author
+    assert first.search_author(3389) is author
+    # Without a map, each call builds a new author
+    assert client.search_author(3389) is not client.search_author(3389)
+    assert GoodReads(verbose=False).search_author(3389) is not author
+    assert first.get_identity_stats()['hits'] == 2
+
+
+def test_shared_objects(client):
+    goodreads = GoodReads(verbose=False, identity=True)
+    quotes = goodreads.search_quotes(3389, top_k=30)
+    books = goodreads.search_books(3389, top_k=0)
+    # The books linked from the quotes are the books of the listing
+    linked = {quote.get_book().book_id: quote.get_book() for quote in quotes if quote.get_book() is not None}
+    assert linked
+    for book in books:
+        assert linked.get(book.book_id, book) is book
+    # Similar authors come from the same map
+    similar = goodreads.search_author(3389).get_similar_authors()
+    assert similar and all(goodreads.search_author(author.author_id) is author for author in similar)
+
+
+def test_concurrent_threads(client, server):
+    goodreads = GoodReads(verbose=False, identity=True)
+    expected = GoodReads.get_quotes(3389, top_k=0)
+    server.reset_stats()
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: goodreads.get_quotes(3389, top_k=0), range(16)))
+    assert results == [expected] * 16
+    author = goodreads.search_author(3389)
+    assert author._listed_quotes == len(author._quotes) == len(expected)
+    # The quote pages were scraped once
+    requests = server.stats['requests']
+    goodreads.get_quotes(3389, top_k=0)
+    assert server.stats['requests'] == requests
+
+
+def test_concurrent_coroutines(client, server):
+    goodreads = AsyncGoodReads(verbose=False, identity=True)
+    # Same calls, in the same order: the books keep the quotes found on the author's pages
+    reference = GoodReads(verbose=False, identity=True)
+    expected = reference.get_quotes(3389, top_k=0)
+    expected_books = reference.get_books(3389, top_k=10)
+
+    async def main():
+        quotes = await asyncio.gather(*[goodreads.get_quotes(3389, top_k=0) for _ in range(8)])
+        books = await asyncio.gather(*[goodreads.get_books(3389, top_k=10) for _ in range(8)])
+        return quotes, books
+
+    quotes, books = asyncio.run(main())
+    assert quotes == [expected] * 8
+    assert books == [expected_books] * 8
+    author = goodreads.identity.get('author', 3389)
+    assert author._listed_quotes == len(author._quotes) == len(expected)
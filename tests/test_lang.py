@@ -0,0 +1,26 @@
+"""
+Check that the seed of the detection does not depend on, nor change, the global seed of ``langdetect``.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from langdetect import DetectorFactory
+
+from scrapereads import lang
+
+TEXTS = ['Ceci est une phrase en français.', 'This is an English sentence.', 'Das ist ein deutscher Satz.',
+         'ok ok', 'si no', 'la la la', '']
+
+
+def test_seed_is_local():
+    DetectorFactory.seed = 7
+    try:
+        expected = lang._detect_batch(TEXTS, seed=0)
+        assert expected[:3] == ['fr', 'en', 'de'] and expected[-1] is None
+        with ThreadPoolExecutor(8) as executor:
+            batches = list(executor.map(lang._detect_batch, [TEXTS] * 32, [0, 1] * 16))
+        assert batches[::2] == [expected] * 16
+        assert batches[1::2] == [lang._detect_batch(TEXTS, seed=1)] * 16
+        assert DetectorFactory.seed == 7
+    finally:
+        DetectorFactory.seed = None
@@ -0,0 +1,93 @@
+"""
+Check that all parser backends extract the same records as BeautifulSoup from the fixture pages,
+and from markup found on real pages but not generated by the fixtures.
+"""
+
+import pytest
+
+from scrapereads import scrape
+from scrapereads.parsers import PARSERS, get_parser
+from scrapereads.standin import fixtures
+
+# Markup found on real pages but not generated by the fixtures
+EDGE_QUOTES = '''<html><head><meta charset="utf-8"/></head><body>
+<div class="quotes">
+<p>Not a quote</p>
+<div class="quote mediumText ">
+<div class="quoteDetails ">
+<div class="quoteText">
+      &ldquo;Caf&eacute; <i>au</i> lait &amp; <b>more</b>
+<br/>  second&nbsp;line <!-- a comment --> end&rdquo;
+  <br/>  ―
+  <span class="authorOrTitle">Jane Doe,</span>
+  <span id="quote_book_link_12"><a class="authorOrTitle" href="/work/quotes/12-some-book">Some Book</a></span>
+</div>
+<div class="quoteFooter">
+<div class="greyText smallText left">tags: <a href="/quotes/tag/a">a</a>, <a href="/quotes/tag/b"> é b </a></div>
+<div class="right"><a class="smallText" href="/quotes/123-cafe-au-lait">1234 likes</a></div>
+</div></div></div>
+<div class="quote">
+<div class="quoteText">“Short.”<br/>―<span class="authorOrTitle">Jane Doe</span></div>
+<div class="quoteFooter"><div class="right"><a class="smallText" href="/quotes/124.short">1 likes</a></div></div>
+</div>
+</div>
+<div><span class="previous_page disabled">« previous</span><em class="current">1</em>
+<a href="?page=2">2</a><span class="gap">…</span><a href="?page=17">17</a><a class="next_page" href="?page=2">next</a></div>
+</body></html>'''
+
+EDGE_BOOKS = '''<html><head><meta charset="utf-8"/></head><body>
+<table class="tableList">
+<tr><td><a class="bookTitle" href="/book/show/1.Book-One"><span>book one</span></a>
+<span class="greyText smallText uitext"><span class="minirating">3.50 avg rating — 12 ratings</span>
+— <a class="greyText" href="/work/editions/1">2 editions</a>
+— published
+1999
+</span></td></tr>
+<tr><td><a class="bookTitle" href="/book/show/2-book-two">Book Two</a>
+<span class="greyText smallText uitext"><span class="minirating"><span class="stars"></span> 4.00 avg rating — 1 rating</span>
+</span></td></tr>
+</table>
+</body></html>'''
+
+
+
+def fixture_pages(library):
+    """List pages of the fixture library, as ``(name, body, extract)``."""
+    pages = []
+    for author_id in library.authors:
+        for npage in range(1, library.num_quotes // fixtures.QUOTES_PER_PAGE + 2):
+            body = fixtures.author_quotes_page(library, author_id, npage=npage)
+            pages.append((f'quotes {author_id} p{npage}', body, scrape.scrape_quotes_page))
+        for npage in range(1, library.num_books // fixtures.BOOKS_PER_PAGE + 2):
+            body = fixtures.author_books_page(library, author_id, npage=npage)
+            pages.append((f'books {author_id} p{npage}', body, scrape.scrape_author_books_page))
+        book_id = library.books(author_id)[0][0]
+        for npage in range(1, 3):
+            body = fixtures.book_quotes_page(library, book_id, npage=npage)
+            pages.append((f'book quotes {book_id} p{npage}', body, scrape.scrape_quotes_page))
+    return [(name, body.encode('utf-8'), extract) for name, body, extract in pages]
+
+
+PAGES = fixture_pages(fixtures.Library(authors=fixtures.AUTHORS[:3])) + [
+    ('edge quotes', EDGE_QUOTES.encode('utf-8'), scrape.scrape_quotes_page),
+    ('edge books', EDGE_BOOKS.encode('utf-8'), scrape.scrape_author_books_page),
+]
+
+
+@pytest.mark.parametrize('name', [name for name in PARSERS if name != 'bs4'])
+@pytest.mark.parametrize('page', PAGES, ids=[name for name, _, _ in PAGES])
+def test_parser_parity(name, page):
+    _, body, extract = page
+    expected = get_parser('bs4').extract(extract, body)
+    assert get_parser(name).extract(extract, body) == expected
+
+
+def test_edge_pages():
+    quotes = get_parser('bs4').extract(scrape.scrape_quotes_page, PAGES[-2][1])
+    assert [quote['quote_id'] for quote in quotes['items']] == ['/quotes/123', '/quotes/124']
+    assert [quote['likes'] for quote in quotes['items']] == [1234, 1]
+    assert quotes['items'][0]['tags'] == ['a', 'é b']
+    assert quotes['num_pages'] == 17
+    books = get_parser('bs4').extract(scrape.scrape_author_books_page, PAGES[-1][1])
+    assert [(book['book_id'], book['rating'], book['num_ratings'], book['year']) for book in books['items']] == [
+        ('1', 3.5, 12, 1999), ('2', 4.0, 1, None)]
@@ -0,0 +1,104 @@
+"""
+Check the token-bucket rate limiter: connections are spaced per host, from threads and coroutines.
+"""
+
+import asyncio
+import threading
+import time
+
+from scrapereads import connect
+from scrapereads.ratelimit import RateLimiter, TokenBucket
+
+
+def test_bucket_spacing():
+    bucket = TokenBucket(rate=20, burst=1)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    # The first token is available at once, the next ones every 50ms
+    assert 0.19 <= time.monotonic() - start < 0.5
+
+
+def test_bucket_burst():
+    bucket = TokenBucket(rate=10, burst=5)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.05
+    assert bucket.reserve() > 0
+
+
+def test_bucket_threads():
+    bucket = TokenBucket(rate=50, burst=1)
+    times = []
+    lock = threading.Lock()
+
+    def acquire():
+        bucket.acquire()
+        with lock:
+            times.append(time.monotonic())
+
+    threads = [threading.Thread(target=acquire) for _ in range(10)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Concurrent callers are served one after the other, at the rate of the bucket
+    assert 0.17 <= max(times) - start < 0.5
+
+
+def test_bucket_async():
+    bucket = TokenBucket(rate=20, burst=1)
+
+    async def main():
+        start = time.monotonic()
+        ticks = []
+
+        async def tick():
+            # Other coroutines run while waiting for a token
+            while len(ticks) < 100:
+                ticks.append(None)
+                await asyncio.sleep(0)
+
+        task = asyncio.ensure_future(tick())
+        await asyncio.gather(*[bucket.acquire_async() for _ in range(5)])
+        elapsed = time.monotonic() - start
+        task.cancel()
+        return elapsed, len(ticks)
+
+    elapsed, ticks = asyncio.run(main())
+    assert 0.19 <= elapsed < 0.5
+    assert ticks > 0
+
+
+def test_limiter_per_host():
+    limiter = RateLimiter(rate=10, burst=1)
+    start = time.monotonic()
+    for host in ['a.com', 'b.com', 'c.com']:
+        limiter.acquire(f'https://{host}/author/show/1')
+    # One bucket per host: the first connection to each host does not wait
+    assert time.monotonic() - start < 0.05
+    assert limiter.bucket('https://a.com/x') is limiter.bucket('https://a.com/y')
+    assert limiter.bucket('https://a.com/x') is not limiter.bucket('https://b.com/x')
+
+
+def test_limiter_off():
+    limiter = RateLimiter(rate=None)
+    start = time.monotonic()
+    for _ in range(100):
+        limiter.acquire('https://a.com/')
+    assert time.monotonic() - start < 0.05
+
+
+def test_fetch_spacing(client, server):
+    client.set_rate_limit(20, burst=1)
+    start = time.monotonic()
+    for npage in range(1, 6):
+        assert connect.fetch(f'{server.url}/author/quotes/3389?page={npage}') is not None
+    assert time.monotonic() - start >= 0.19
+    # Another host (the same server, under another name) has its own bucket
+    other = server.url.replace('127.0.0.1', 'localhost')
+    start = time.monotonic()
+    assert connect.fetch(f'{other}/author/quotes/3389') is not None
+    assert time.monotonic() - start < 0.05
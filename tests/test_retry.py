@@ -0,0 +1,136 @@
+"""
+Check the retries and the circuit breaker: a circuit opens once too many pages failed, lets a single trial request
+through once half-open, and closes or opens again with its outcome. Pages retried count once.
+"""
+
+import threading
+import time
+
+from scrapereads import GoodReads, connect
+from scrapereads.retry import PROBE_INTERVAL, Backoff, Circuit, CircuitBreaker, parse_retry_after
+from scrapereads.standin.server import StandInServer
+
+
+def in_thread(function, *args):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(function(*args)))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def open_circuit(cooldown=0.1):
+    circuit = Circuit(threshold=0.5, window=4, cooldown=cooldown)
+    for _ in range(4):
+        circuit.record(success=False)
+    return circuit
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('120') == 120
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after('Wed, 01 Jan 2020 00:00:00 GMT') == 0
+
+
+def test_backoff():
+    backoff = Backoff(retries=3, backoff=0.5, max_backoff=1, jitter=0.5, seed=0)
+    delays = [backoff.delay(attempt) for attempt in range(4)]
+    assert 0.25 <= delays[0] <= 0.5
+    assert all(0.5 <= delay <= 1 for delay in delays[1:])
+    assert backoff.delay(0, retry_after=10) == 10
+
+
+def test_circuit_opens():
+    circuit = Circuit(threshold=0.5, window=4, cooldown=0.1)
+    for success in [True, False, True]:
+        circuit.record(success)
+    # Too few outcomes to decide
+    assert circuit.state == 'closed'
+    circuit.record(success=False)
+    assert circuit.state == 'open'
+    assert 0 < circuit.remaining() <= 0.1
+    assert circuit.trips == 1
+
+
+def test_half_open_single_probe():
+    circuit = open_circuit()
+    time.sleep(0.1)
+    # The first caller sends the trial request, the others wait for its outcome
+    assert circuit.remaining() == 0
+    assert circuit.state == 'half-open'
+    assert in_thread(circuit.remaining) == PROBE_INTERVAL
+    assert in_thread(circuit.remaining, False) == PROBE_INTERVAL
+    assert circuit.remaining() == 0
+    # Outcomes of requests sent before the circuit opened are ignored
+    in_thread(circuit.record, True)
+    assert circuit.state == 'half-open'
+    circuit.record(success=True)
+    assert circuit.state == 'closed'
+    assert in_thread(circuit.remaining) == 0
+
+
+def test_half_open_failed_probe():
+    circuit = open_circuit()
+    time.sleep(0.1)
+    assert circuit.remaining() == 0
+    circuit.record(success=False)
+    assert circuit.state == 'open'
+    assert circuit.trips == 2
+    assert circuit.remaining() > 0
+    # Once the circuit is open, nobody takes the trial request until the cooldown is over
+    assert in_thread(circuit.remaining, False) > 0
+
+
+def test_stale_probe_is_replaced():
+    circuit = open_circuit()
+    time.sleep(0.1)
+    assert circuit.remaining() == 0
+    assert in_thread(circuit.remaining) == PROBE_INTERVAL
+    # The trial request never reported its outcome
+    time.sleep(0.11)
+    assert in_thread(circuit.remaining) == 0
+
+
+def test_breaker_per_host():
+    breaker = CircuitBreaker(threshold=0.5, window=4, cooldown=10)
+    for _ in range(4):
+        breaker.record('https://a.com/1', success=False)
+    assert breaker.circuit('https://a.com/2').state == 'open'
+    assert breaker.circuit('https://b.com/1').state == 'closed'
+    assert breaker.trips == 1
+    start = time.monotonic()
+    breaker.wait('https://b.com/1')
+    assert time.monotonic() - start < 0.05
+    # Turned off
+    breaker = CircuitBreaker(threshold=None)
+    for _ in range(10):
+        breaker.record('https://a.com/1', success=False)
+    breaker.wait('https://a.com/1')
+
+
+def test_retries_count_once(client):
+    with StandInServer(error_rate=1) as server:
+        GoodReads(verbose=False, retries=2, backoff=0.01, breaker_threshold=0.5, breaker_cooldown=0.5)
+        GoodReads.set_base(server.url)
+        assert connect.fetch(f'{server.url}/author/show/3389') is None
+        assert server.stats['requests'] == 3
+        circuit = connect.BREAKER.circuit(server.url)
+        # 3 attempts, a single failure
+        assert list(circuit._outcomes) == [False]
+        assert circuit.state == 'closed'
+
+
+def test_failing_pages_open_the_circuit(client):
+    with StandInServer(error_rate=1) as server:
+        GoodReads(verbose=False, retries=0, breaker_threshold=0.5, breaker_cooldown=0.3)
+        GoodReads.set_base(server.url)
+        for author_id in range(5):
+            assert connect.fetch(f'{server.url}/author/show/{author_id}') is None
+        assert connect.BREAKER.trips == 1
+        # The next page waits for the cooldown, and is the trial request
+        server.error_rate = 0
+        start = time.monotonic()
+        assert connect.fetch(f'{server.url}/author/show/3389') is not None
+        assert time.monotonic() - start >= 0.25
+        assert connect.BREAKER.circuit(server.url).state == 'closed'
@@ -0,0 +1,84 @@
+"""
+Check the pooled keep-alive session against the stand-in server: connections are re-used and bounded per host,
+and compressed pages are decoded while they are streamed.
+"""
+
+import threading
+
+import pytest
+import urllib3
+
+from scrapereads.session import Session
+from scrapereads.standin import fixtures
+from scrapereads.standin.server import StandInServer
+
+AUTHOR_ID = 3389
+
+
+def read(session, url):
+    response = session.request(url, stream=True)
+    return response.status, list(session.iter_content(response, chunk_size=4096))
+
+
+def test_connections_are_reused(server):
+    with Session(pool_size=4) as session:
+        for _ in range(10):
+            status, _ = read(session, f'{server.url}/author/show/{AUTHOR_ID}')
+            assert status == 200
+        assert session.num_connections == 1
+        assert session.num_requests == 10
+    assert server.stats['connections'] == 1
+
+
+def test_pool_blocks():
+    with StandInServer(latency=0.05) as server, Session(pool_size=2) as session:
+        threads = [threading.Thread(target=read, args=(session, f'{server.url}/author/show/{AUTHOR_ID}'))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Threads waited for a free connection instead of opening extra ones
+        assert session.num_connections == 2
+        assert server.stats['requests'] == 8
+
+
+@pytest.mark.parametrize('compress', [True, False])
+@pytest.mark.parametrize('server_compress', [True, False])
+def test_decode(compress, server_compress):
+    expected = fixtures.author_page(fixtures.Library(), AUTHOR_ID).encode('utf-8')
+    with StandInServer(compress=server_compress, chunk_size=2048) as server, Session(compress=compress) as session:
+        status, chunks = read(session, f'{server.url}/author/show/{AUTHOR_ID}')
+        assert status == 200
+        assert b''.join(chunks) == expected
+        assert len(chunks) > 1
+        assert session.stats['uncompressed'] == len(expected)
+        if compress and server_compress:
+            assert session.stats['compressed'] < len(expected)
+        else:
+            assert session.stats['compressed'] == len(expected)
+
+
+def test_decode_without_read1(monkeypatch):
+    # urllib3 1.x responses have no ``read1()``
+    monkeypatch.delattr(urllib3.response.HTTPResponse, 'read1', raising=False)
+    monkeypatch.delattr(urllib3.response.BaseHTTPResponse, 'read1', raising=False)
+    expected = fixtures.author_page(fixtures.Library(), AUTHOR_ID).encode('utf-8')
+    with StandInServer(chunk_size=2048) as server, Session() as session:
+        status, chunks = read(session, f'{server.url}/author/show/{AUTHOR_ID}')
+        assert status == 200
+        assert b''.join(chunks) == expected
+        # The connection was released, and is re-used
+        read(session, f'{server.url}/author/show/{AUTHOR_ID}')
+        assert session.num_connections == 1
+
+
+def test_partly_read_connection_is_dropped():
+    with StandInServer(compress=False, chunk_size=1024, chunk_delay=0.01) as server, Session() as session:
+        response = session.request(f'{server.url}/author/show/{AUTHOR_ID}', stream=True)
+        chunks = session.iter_content(response, chunk_size=1024)
+        next(chunks)
+        chunks.close()
+        status, _ = read(session, f'{server.url}/author/show/{AUTHOR_ID}')
+        assert status == 200
+        assert server.stats['connections'] == 2
@@ -0,0 +1,79 @@
+"""
+Check that the streamed pages (``GoodReads.set_stream()``) give the same records as the full parse,
+when the pages are fed in chunks of any size and when they are received from a slow stand-in server.
+"""
+
+import pytest
+
+from scrapereads import GoodReads, scrape
+from scrapereads.parsers import get_parser, get_stream
+from scrapereads.standin import fixtures
+from scrapereads.standin.server import StandInServer
+
+LIBRARY = fixtures.Library(authors=fixtures.AUTHORS[:2])
+
+PAGES = [(f'quotes {author_id} p{npage}', fixtures.author_quotes_page(LIBRARY, author_id, npage=npage),
+          scrape.scrape_quotes_page)
+         for author_id in LIBRARY.authors for npage in (1, 2)] + \
+        [(f'books {author_id} p{npage}', fixtures.author_books_page(LIBRARY, author_id, npage=npage),
+          scrape.scrape_author_books_page)
+         for author_id in LIBRARY.authors for npage in (1, 2)]
+
+pytestmark = pytest.mark.skipif(get_stream(scrape.scrape_quotes_page) is None, reason='lxml is not installed')
+
+
+def feed(stream, body, chunk_size):
+    records = []
+    for start in range(0, len(body), chunk_size):
+        records.extend(stream.feed(body[start:start + chunk_size]))
+    records.extend(stream.close())
+    return records
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 512, 1 << 20])
+@pytest.mark.parametrize('page', PAGES, ids=[name for name, _, _ in PAGES])
+def test_item_stream_parity(page, chunk_size):
+    _, body, extract = page
+    body = body.encode('utf-8')
+    expected = get_parser('bs4').extract(extract, body)
+    stream = get_stream(extract)()
+    assert feed(stream, body, chunk_size) == expected['items']
+    assert stream.page == expected
+    assert stream.received == len(body)
+
+
+def test_item_stream_reset():
+    _, body, extract = PAGES[0]
+    body = body.encode('utf-8')
+    expected = get_parser('bs4').extract(extract, body)
+    stream = get_stream(extract)()
+    stream.feed(body[:len(body) // 2])
+    # The download is tried again: the items already extracted are not extracted twice
+    stream.reset()
+    feed(stream, body, 1024)
+    assert stream.page == expected
+
+
+@pytest.fixture
+def slow_client():
+    with StandInServer(library=fixtures.Library(), compress=False, chunk_size=1024, chunk_delay=0.001) as server:
+        GoodReads(verbose=False)
+        GoodReads.set_base(server.url)
+        yield GoodReads
+        GoodReads.set_stream(False)
+
+
+@pytest.mark.filterwarnings('ignore::RuntimeWarning')
+@pytest.mark.parametrize('kind', ['quotes', 'books'])
+def test_stream_parity(slow_client, kind):
+    results = {}
+    for stream in [False, True]:
+        slow_client.set_stream(stream)
+        results[stream] = []
+        for author_id in LIBRARY.authors:
+            author = slow_client.search_author(author_id)
+            search = author.quotes if kind == 'quotes' else author.books
+            results[stream].append([item.to_json() if kind == 'quotes' else (item.book_id, item.book_name, item.year)
+                                    for item in search(cache=False, top_k=30)])
+    assert results[True] == results[False]
+    assert all(len(items) == 30 for items in results[True])
@@ -0,0 +1,98 @@
+"""
+Check that the text normalization of ``scrapereads.utils`` returns the same strings as the former implementation
+(one ``str.replace`` pass per entry of ``CHARS``, ``HTML`` and ``ROMAN``).
+The corpus holds the quotes of the fixture library, edge cases, and random strings made of the replaced characters.
+"""
+
+import random
+
+import pytest
+
+from scrapereads import utils
+from scrapereads.standin import fixtures
+
+EDGE_TEXTS = [
+    'a', '\n', '―', '\n\n\n\n\n', '“Hello”\n―\n', 'a\n―\nb',
+    '<<br>i>', '<b<i>r>', '<<i>/b>x', '<i><b>x</b></i>',
+    'chapter II is\nIII \niv v', ' II  III ', 'x II\nIII y', 'Louis XIV and Henri IV ', '\nvi vii\n', ' X ',
+    'It’s “quoted”<br/>―\n', 'Jean-Luc Picard', "O'Brien & Co.?!", 'Gabriel García Márquez', 'a/b.c,d`e',
+]
+
+FUZZ_ALPHABET = ['\n', '―', '<', '>', '/', 'b', 'i', 'r', '”', '“', '’', ' ', 'I', 'V', 'X', 'v', 'x', 'a',
+                 '<br>', '<i>', '</b>', ' II ', '\n\n']
+
+
+def name_to_goodreads(name):
+    name = utils.to_ascii(name.title())
+    for char in utils.CHARS:
+        name = name.replace(*char)
+    return name
+
+
+def clean_num(quote):
+    for char in utils.ROMAN:
+        quote = quote.replace(*char)
+    return quote
+
+
+def process_quote_text(quote_text):
+    quote_text = quote_text.replace('―', '').replace('\n\n', '\n')
+    quote_text = quote_text[:-1] if quote_text[-1] == '\n' else quote_text
+    for char in utils.HTML:
+        quote_text = quote_text.replace(*char)
+    return quote_text
+
+
+def clean_quote_text(quote_text):
+    return process_quote_text(process_quote_text(quote_text))
+
+
+def corpus(fuzz, seed=0):
+    """Texts of the fixture quotes, edge cases, and ``fuzz`` random strings."""
+    library = fixtures.Library()
+    texts = [quote[1] for author_id in library.authors for quote in library.quotes(author_id)]
+    # Raw texts, as scraped from a quote page
+    texts += [f'      “{text}”\n  \n  ―\n  ' for text in texts]
+    texts += [name for _, name in fixtures.AUTHORS] + EDGE_TEXTS
+    rng = random.Random(seed)
+    texts += [''.join(rng.choices(FUZZ_ALPHABET, k=rng.randint(1, 12))) for _ in range(fuzz)]
+    return texts
+
+
+def former_outputs(function, texts):
+    """Texts and their output with the former implementation, which failed on texts emptied by the cleanup."""
+    valid, expected = [], []
+    for text in texts:
+        try:
+            expected.append(function(text))
+        except IndexError:
+            continue
+        valid.append(text)
+    return valid, expected
+
+
+@pytest.fixture(scope='module')
+def texts():
+    return corpus(20000)
+
+
+@pytest.mark.parametrize('old, new', [(name_to_goodreads, utils.name_to_goodreads), (clean_num, utils.clean_num),
+                                      (process_quote_text, utils.process_quote_text),
+                                      (clean_quote_text, utils.clean_quote_text)])
+def test_former_implementation(texts, old, new):
+    for text, value in zip(*former_outputs(old, texts)):
+        assert new(text) == value, f'{new.__name__}({text!r})'
+
+
+def test_clean_quote_texts(texts):
+    valid, expected = former_outputs(clean_quote_text, texts)
+    assert utils.clean_quote_texts(valid) == expected
+    # Texts holding the separator of the batch are cleaned one by one
+    batch = texts[:100] + ['a\x00b']
+    assert utils.clean_quote_texts(batch) == [utils.clean_quote_text(text) for text in batch]
+
+
+def test_clean_num_joined_numbers():
+    # Removing a number joins its neighbours, which can form a new number
+    assert utils.clean_num('x V II I y') == 'xy'
+    assert utils.clean_num('chapter II is\nIII \niv v') == clean_num('chapter II is\nIII \niv v')
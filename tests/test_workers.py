@@ -0,0 +1,24 @@
+"""
+Check that pages parsed in worker processes give the same records, and that a new client with the same settings
+keeps the pool of processes (and the other shared objects) instead of starting them again.
+"""
+
+from scrapereads import GoodReads, connect
+
+
+def test_workers(client, server, tmp_path):
+    expected = client.get_quotes(3389, top_k=0)
+    GoodReads(verbose=False, workers=2, identity=False, rate=1000, cache=str(tmp_path))
+    GoodReads.set_base(server.url)
+    try:
+        assert GoodReads.get_quotes(3389, top_k=0) == expected
+        pool, cache, limiter, parser = connect.get_worker_pool(), connect.CACHE, connect.LIMITER, connect.PARSER
+        GoodReads(verbose=False, workers=2, identity=False, rate=1000, cache=str(tmp_path))
+        assert connect.get_worker_pool() is pool
+        assert (connect.CACHE, connect.LIMITER, connect.PARSER) == (cache, limiter, parser)
+        GoodReads(verbose=False, workers=1, identity=False, rate=1000, cache=str(tmp_path), cache_ttl=60)
+        assert connect.get_worker_pool() is not pool
+        assert connect.CACHE is not cache
+    finally:
+        connect.set_workers(0)
+        connect.set_cache(None)